@@ -2,30 +2,100 @@
 Communicator Agent: orchestrates between Personal Agent and Local Agent.
 - Receives what the other person said (local language)
 - ONE Gemini call via Personal Agent returns translation + suggested response (English, local, phonetic).
+- Common phrases found in the offline phrasebook are answered without any model call.
 """
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
 from backend.models.schemas import UserContext, SuggestedResponse
 from backend.agents.personal_agent import PersonalAgent
+from backend.services.phrasebook import get_phrasebook
+from backend.services.prompt_prefix import SessionPrompt
 
 
 class CommunicatorAgent:
-    def __init__(self, user_context: UserContext):
+    def __init__(self, user_context: UserContext, session_prompt: Optional[SessionPrompt] = None):
         self.user_context = user_context
+        # Compiled per-session prefix; when set, each turn only sends the delta
+        self.session_prompt = session_prompt
         self.personal_agent = PersonalAgent()
 
+    def _from_phrasebook(self, other_person_said_local: str) -> Optional[tuple[str, SuggestedResponse]]:
+        """Pre-built answer for a confidently matched common phrase (None = ask the model)."""
+        phrasebook = get_phrasebook()
+        match = phrasebook.lookup(other_person_said_local, self.user_context) if phrasebook is not None else None
+        if match is None:
+            return None
+        return match.english_translation, SuggestedResponse(
+            english=match.suggested_english,
+            local=match.suggested_local,
+            phonetic=match.suggested_phonetic,
+        )
+
     def process_other_person_speech(
         self,
         other_person_said_local: str,
         conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
     ) -> tuple[str, SuggestedResponse]:
         """
         Returns (english_translation_of_what_they_said, suggested_response_with_phonetic).
-        Uses a single Gemini call inside suggest_response.
+        Uses a single Gemini call inside suggest_response, or none for a phrasebook match.
         """
+        answer = self._from_phrasebook(other_person_said_local)
+        if answer is not None:
+            return answer
         english_translation, suggested = self.personal_agent.get_suggested_response(
             user_context=self.user_context,
             other_person_said_local=other_person_said_local,
             conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=self.session_prompt,
         )
         return english_translation, suggested
+
+    async def process_other_person_speech_async(
+        self,
+        other_person_said_local: str,
+        conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
+    ) -> tuple[str, SuggestedResponse]:
+        """Async variant of process_other_person_speech for the async FastAPI handlers."""
+        answer = self._from_phrasebook(other_person_said_local)
+        if answer is not None:
+            return answer
+        english_translation, suggested = await self.personal_agent.get_suggested_response_async(
+            user_context=self.user_context,
+            other_person_said_local=other_person_said_local,
+            conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=self.session_prompt,
+        )
+        return english_translation, suggested
+
+    async def stream_other_person_speech(
+        self,
+        other_person_said_local: str,
+        conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
+    ) -> AsyncIterator[tuple[Any, ...]]:
+        """
+        Streaming variant: yields ("field", key, value) as each JSON field arrives,
+        then ("done", english_translation, suggested_response).
+        """
+        answer = self._from_phrasebook(other_person_said_local)
+        if answer is not None:
+            english_translation, suggested = answer
+            yield ("field", "english_translation", english_translation)
+            yield ("field", "suggested_english", suggested.english)
+            yield ("field", "suggested_local", suggested.local)
+            yield ("field", "suggested_phonetic", suggested.phonetic)
+            yield ("done", english_translation, suggested)
+            return
+        async for event in self.personal_agent.stream_suggested_response(
+            user_context=self.user_context,
+            other_person_said_local=other_person_said_local,
+            conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=self.session_prompt,
+        ):
+            yield event
@@ -1,20 +1,39 @@
 """Local Agent: handles translation and phonetic for the target locale."""
+from typing import Optional
+
+from backend.config import get_settings
 from backend.services.gemini_client import (
     translate_to_english,
+    translate_to_english_async,
     translate_to_local,
+    translate_to_local_async,
     get_phonetic_spelling,
+    get_phonetic_spelling_async,
 )
+from backend.services.transliterate import Transliterator, get_transliterator
 
 
 class LocalAgent:
     """
     Encapsulates local language knowledge: translation (both directions)
     and phonetic spelling for the target region (e.g. Paris French).
+    Phonetics come from the local transliteration tables when the language has them;
+    Gemini is only asked when the tables are off or PHONETIC_LLM_FALLBACK is set.
     """
 
     def __init__(self, local_language: str = "French"):
         self.local_language = local_language
 
+    def _transliterator(self) -> Optional[Transliterator]:
+        if not get_settings().phonetic_local_enabled:
+            return None
+        return get_transliterator(self.local_language)
+
+    @staticmethod
+    def _llm_phonetics() -> bool:
+        settings = get_settings()
+        return not settings.phonetic_local_enabled or settings.phonetic_llm_fallback
+
     def to_english(self, local_text: str) -> str:
         return translate_to_english(local_text, self.local_language)
 
@@ -22,4 +41,30 @@ class LocalAgent:
         return translate_to_local(english_text, self.local_language)
 
     def phonetic(self, local_text: str) -> str:
-        return get_phonetic_spelling(local_text, self.local_language)
+        engine = self._transliterator()
+        if engine is not None:
+            return engine.phrase(local_text)
+        if self._llm_phonetics():
+            return get_phonetic_spelling(local_text, self.local_language)
+        return local_text
+
+    def phonetic_batch(self, local_texts: list[str]) -> list[str]:
+        """Phonetics for many phrases in one local pass (one model call per phrase only as the fallback)."""
+        engine = self._transliterator()
+        if engine is not None:
+            return engine.batch(local_texts)
+        return [self.phonetic(text) for text in local_texts]
+
+    async def to_english_async(self, local_text: str) -> str:
+        return await translate_to_english_async(local_text, self.local_language)
+
+    async def to_local_async(self, english_text: str) -> str:
+        return await translate_to_local_async(english_text, self.local_language)
+
+    async def phonetic_async(self, local_text: str) -> str:
+        engine = self._transliterator()
+        if engine is not None:
+            return engine.phrase(local_text)
+        if self._llm_phonetics():
+            return await get_phonetic_spelling_async(local_text, self.local_language)
+        return local_text
@@ -1,8 +1,13 @@
 """Personal/User System Agent: tailors suggested responses using user context."""
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
 from backend.models.schemas import UserContext, SuggestedResponse
-from backend.services.gemini_client import suggest_response as gemini_suggest
+from backend.services.gemini_client import (
+    suggest_response as gemini_suggest,
+    suggest_response_async as gemini_suggest_async,
+    suggest_response_stream_async as gemini_suggest_stream,
+)
+from backend.services.prompt_prefix import SessionPrompt
 
 
 class PersonalAgent:
@@ -16,10 +21,48 @@ class PersonalAgent:
         user_context: UserContext,
         other_person_said_local: str,
         conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
+        session_prompt: Optional[SessionPrompt] = None,
     ) -> tuple[str, SuggestedResponse]:
         """Returns (english_translation, suggested_response) from ONE Gemini call."""
         return gemini_suggest(
             user_context=user_context,
             other_person_said_local=other_person_said_local,
             conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=session_prompt,
+        )
+
+    @staticmethod
+    async def get_suggested_response_async(
+        user_context: UserContext,
+        other_person_said_local: str,
+        conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
+        session_prompt: Optional[SessionPrompt] = None,
+    ) -> tuple[str, SuggestedResponse]:
+        """Async variant of get_suggested_response (non-blocking Gemini call)."""
+        return await gemini_suggest_async(
+            user_context=user_context,
+            other_person_said_local=other_person_said_local,
+            conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=session_prompt,
+        )
+
+    @staticmethod
+    def stream_suggested_response(
+        user_context: UserContext,
+        other_person_said_local: str,
+        conversation_history_english: Optional[list[str]] = None,
+        conversation_summary: Optional[str] = None,
+        session_prompt: Optional[SessionPrompt] = None,
+    ) -> AsyncIterator[tuple[Any, ...]]:
+        """Streams ("field", key, value) events, then ("done", english_translation, suggested)."""
+        return gemini_suggest_stream(
+            user_context=user_context,
+            other_person_said_local=other_person_said_local,
+            conversation_history_english=conversation_history_english,
+            conversation_summary=conversation_summary,
+            session_prompt=session_prompt,
         )
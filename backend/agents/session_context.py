@@ -0,0 +1,87 @@
+"""
+Per-session compiled context for the REST conversation flow.
+Validating UserContext, building the CommunicatorAgent and rendering the static prompt
+prefix happen once per session instead of on every /api/conversation/process call.
+Entries are LRU-bounded and dropped when the session store evicts the session.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from backend.agents.communicator import CommunicatorAgent
+from backend.models.schemas import UserContext
+from backend.services.gemini_client import build_session_prompt, release_session_prompt
+from backend.services.prompt_prefix import SessionPrompt
+
+
+class SessionContext:
+    """What a session needs per turn, validated and rendered once."""
+
+    def __init__(self, user_context: UserContext):
+        self.user_context = user_context
+        self.session_prompt: SessionPrompt = build_session_prompt(user_context)
+        self.communicator = CommunicatorAgent(user_context, session_prompt=self.session_prompt)
+
+
+class SessionContextCache:
+    """session_id -> SessionContext, least recently used dropped beyond max_entries."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, SessionContext] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, session_id: str, data: dict[str, Any]) -> SessionContext:
+        """Compiled context for a session, built from its stored data on first use."""
+        with self._lock:
+            context = self._entries.get(session_id)
+            if context is not None:
+                self._entries.move_to_end(session_id)
+                self.hits += 1
+                return context
+            self.misses += 1
+        context = SessionContext(UserContext(**data["user_context"]))
+        evicted: list[SessionContext] = []
+        with self._lock:
+            context = self._entries.setdefault(session_id, context)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for old in evicted:
+            release_session_prompt(old.session_prompt)
+        return context
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop a session's compiled context (session evicted or deleted)."""
+        with self._lock:
+            context = self._entries.pop(session_id, None)
+            if context is None:
+                return
+            self.invalidations += 1
+        release_session_prompt(context.session_prompt)
+
+    def clear(self) -> None:
+        with self._lock:
+            contexts = list(self._entries.values())
+            self._entries.clear()
+        for context in contexts:
+            release_session_prompt(context.session_prompt)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            contexts = list(self._entries.values())
+        cached = sum(1 for c in contexts if c.session_prompt.stats()["cached_models"])
+        total = self.hits + self.misses
+        return {
+            "contexts": len(contexts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "invalidations": self.invalidations,
+            "explicit_caches": cached,
+            "explicit_cache_hits": sum(c.session_prompt.cache_hits for c in contexts),
+        }
+
@@ -0,0 +1 @@
+"""Offline benchmarks. Run from repo root, e.g. python -m backend.benchmarks.end_phrase"""
@@ -0,0 +1,65 @@
+"""
+Benchmark: μ-law downlink encoding throughput (24 kHz int16 PCM, Gemini Live output).
+Encodes chunks of typical Live sizes and reports MB/s, per-chunk cost, how many real-time
+streams one core could keep up with, bandwidth saved and round-trip SNR.
+Run from repo root: python -m backend.benchmarks.audio_codec [--seconds 60] [--chunk-ms 40] [--json]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.services.audio_codec import DOWNLINK_SAMPLE_RATE, mulaw_decode, mulaw_encode
+
+
+def synthetic_speech(seconds: float, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * DOWNLINK_SAMPLE_RATE)) / DOWNLINK_SAMPLE_RATE
+    voiced = sum(np.sin(2 * np.pi * 180 * k * t) / k for k in range(1, 8))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    signal = voiced * envelope * 6000 + rng.normal(0, 200, len(t))
+    return np.clip(signal, -32768, 32767).astype("<i2")
+
+
+def run(seconds: float, chunk_ms: int) -> dict:
+    pcm = synthetic_speech(seconds)
+    chunk_samples = DOWNLINK_SAMPLE_RATE * chunk_ms // 1000
+    chunks = [pcm[i:i + chunk_samples].tobytes() for i in range(0, len(pcm), chunk_samples)]
+    total_bytes = sum(len(c) for c in chunks)
+
+    start = time.perf_counter()
+    encoded = [mulaw_encode(c) for c in chunks]
+    elapsed = time.perf_counter() - start
+
+    decoded = np.frombuffer(mulaw_decode(b"".join(encoded)), dtype="<i2").astype(np.float64)
+    original = pcm.astype(np.float64)
+    snr = 10 * np.log10(np.sum(original ** 2) / np.sum((original - decoded) ** 2))
+    return {
+        "audio_seconds": seconds,
+        "chunk_ms": chunk_ms,
+        "chunks": len(chunks),
+        "encode_mb_per_s": round(total_bytes / elapsed / 1e6, 1),
+        "us_per_chunk": round(elapsed / len(chunks) * 1e6, 2),
+        "realtime_streams_per_core": int(seconds / elapsed),
+        "bytes_saved_ratio": round(1 - sum(len(e) for e in encoded) / total_bytes, 3),
+        "roundtrip_snr_db": round(float(snr), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-ms", type=int, default=40)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.seconds, args.chunk_ms)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:26} {value}")
+
+
+if __name__ == "__main__":
+    main()
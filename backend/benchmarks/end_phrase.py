@@ -0,0 +1,112 @@
+"""
+Benchmark: fraction of /api/conversation/confirm inputs the local goodbye detector
+resolves without a Gemini call, its accuracy on those, and per-call cost.
+Run from repo root: python -m backend.benchmarks.end_phrase [--threshold 0.8] [--json]
+"""
+import argparse
+import json
+import time
+
+from backend.services.end_phrase import classify_end_phrase
+
+# (user_said, target_language, is_goodbye) — typical confirms: the user repeating a suggested reply
+CORPUS: tuple[tuple[str, str, bool], ...] = (
+    ("Bonjour, un café s'il vous plaît", "French", False),
+    ("Je voudrais un croissant", "French", False),
+    ("C'est combien ?", "French", False),
+    ("Où est la gare, s'il vous plaît ?", "French", False),
+    ("Oui, avec plaisir !", "French", False),
+    ("Je viens de Londres, je suis ici en vacances", "French", False),
+    ("Pouvez-vous répéter plus lentement ?", "French", False),
+    ("L'addition, s'il vous plaît", "French", False),
+    ("Merci beaucoup, c'était délicieux", "French", False),
+    ("Merci", "French", False),
+    ("Salut !", "French", False),
+    ("Au revoir, bonne journée !", "French", True),
+    ("Merci, à bientôt !", "French", True),
+    ("Bonne soirée", "French", True),
+    ("À plus tard", "French", True),
+    ("Goodbye", "French", True),
+    # Folded goodbyes inside ordinary sentences must not end the conversation
+    ("Il n'y a plus de pain", "French", False),
+    ("Il y a plus de monde ici", "French", False),
+    ("Je suis là à demain matin", "French", False),
+    ("Nice to see you", "French", False),
+    ("Au revoir monsieur", "French", True),
+    ("Merci beaucoup au revoir", "French", True),
+    ("Ok bye", "French", True),
+    # A goodbye word that does not close the utterance is left to Gemini
+    ("Je veux acheter un bye", "French", False),
+    ("Salam, bghit wahed atay", "Moroccan Darija (Arabic)", False),
+    ("Bch7al hada?", "Moroccan Darija (Arabic)", False),
+    ("Fin kayna l'mdina?", "Moroccan Darija (Arabic)", False),
+    ("Wakha, zwin bzaf", "Moroccan Darija (Arabic)", False),
+    ("Ana mn London", "Moroccan Darija (Arabic)", False),
+    ("بغيت واحد أتاي", "Moroccan Darija (Arabic)", False),
+    ("شحال هادا؟", "Moroccan Darija (Arabic)", False),
+    ("Shukran", "Moroccan Darija (Arabic)", False),
+    ("Shukran bzaf, bslama", "Moroccan Darija (Arabic)", True),
+    ("M3a salama", "Moroccan Darija (Arabic)", True),
+    ("بالسلامة", "Moroccan Darija (Arabic)", True),
+    ("مع السلامة خويا", "Moroccan Darija (Arabic)", True),
+    ("Здравейте, един чай, моля", "Bulgarian", False),
+    ("Колко струва?", "Bulgarian", False),
+    ("Къде е гарата?", "Bulgarian", False),
+    ("Да, много е хубаво", "Bulgarian", False),
+    ("Zdraveyte, edno kafe, molya", "Bulgarian", False),
+    ("Благодаря", "Bulgarian", False),
+    ("Благодаря, довиждане!", "Bulgarian", True),
+    ("Всичко хубаво", "Bulgarian", True),
+    ("Chao!", "Bulgarian", True),
+    ("Dovizhdane", "Bulgarian", True),
+)
+
+
+def run(threshold: float, repeat: int) -> dict:
+    local = correct = 0
+    ambiguous: list[str] = []
+    for text, language, expected in CORPUS:
+        verdict = classify_end_phrase(text, language)
+        if verdict.is_end is not None and verdict.confidence >= threshold:
+            local += 1
+            correct += int(verdict.is_end == expected)
+        else:
+            ambiguous.append(text)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text, language, _expected in CORPUS:
+            classify_end_phrase(text, language)
+    elapsed = time.perf_counter() - start
+    calls = repeat * len(CORPUS)
+
+    return {
+        "threshold": threshold,
+        "inputs": len(CORPUS),
+        "resolved_locally": local,
+        "resolved_locally_fraction": round(local / len(CORPUS), 4),
+        "local_accuracy": round(correct / local, 4) if local else None,
+        "llm_fallbacks": ambiguous,
+        "us_per_call": round(elapsed / calls * 1e6, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.threshold, args.repeat)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    print(f"inputs:            {result['inputs']}")
+    print(f"resolved locally:  {result['resolved_locally']} ({result['resolved_locally_fraction']:.1%})")
+    print(f"local accuracy:    {result['local_accuracy']}")
+    print(f"cost per call:     {result['us_per_call']} us")
+    print(f"LLM fallbacks:     {', '.join(result['llm_fallbacks']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
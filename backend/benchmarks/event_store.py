@@ -0,0 +1,101 @@
+"""
+Benchmark: memory per billable event, list of dicts vs ColumnarEventStore.
+Run from repo root: python -m backend.benchmarks.event_store [--events 200000] [--json]
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from backend.services.event_store import ColumnarEventStore
+
+
+def synthetic_events(n: int, seed: int = 7) -> list[dict]:
+    """Same shapes ValueTracker records: step_z (Live) and rest_interaction (REST)."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(n):
+        ts = (start + timedelta(microseconds=i * 1_234_567)).isoformat()
+        complexity = rng.randint(1, 10)
+        if rng.random() < 0.5:
+            events.append({
+                "event_type": "step_z",
+                "complexity_score": complexity,
+                "conversation_turn_index": rng.randint(0, 20),
+                "slang_intensity_score": rng.randint(0, 3),
+                "idiom_detected": rng.random() < 0.3,
+                "estimated_cost_eur": round(0.02 * complexity + 0.01 * rng.randint(1, 20), 2),
+                "timestamp": ts,
+                "destination": rng.choice(("paris", "london", "morocco", "bulgaria", None)),
+                "occasion": rng.choice(("Holiday", "Business", "Social", None)),
+            })
+        else:
+            value = round(complexity * 0.05, 2)
+            events.append({
+                "event_type": "rest_interaction",
+                "complexity_score": complexity,
+                "interaction_type": rng.choice(("greeting", "emergency", "transaction", "professional", "social")),
+                "estimated_value_eur": value,
+                "estimated_cost_eur": value,
+                "timestamp": ts,
+            })
+    return events
+
+
+def _measure(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+
+def run(n: int) -> dict:
+    # Build the dicts inside the measurement so their strings/floats are counted too
+    events, list_bytes = _measure(lambda: synthetic_events(n))
+    store_events = synthetic_events(n)
+    store, store_bytes = _measure(lambda: _fill(ColumnarEventStore(retention=n), store_events))
+    del store_events
+
+    expected_recent = list(reversed(events[-100:]))
+    start = time.perf_counter()
+    recent = store.recent(100)
+    recent_ms = (time.perf_counter() - start) * 1000
+    return {
+        "events": n,
+        "dict_list_bytes_per_event": round(list_bytes / n, 1),
+        "columnar_bytes_per_event": round(store_bytes / n, 1),
+        "reduction_x": round(list_bytes / store_bytes, 1) if store_bytes else None,
+        "recent_100_ms": round(recent_ms, 3),
+        "recent_matches_dicts": recent == expected_recent,
+    }
+
+
+def _fill(store: ColumnarEventStore, events: list[dict]) -> ColumnarEventStore:
+    for e in events:
+        store.append(e)
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.events)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:28} {value}")
+
+
+if __name__ == "__main__":
+    main()
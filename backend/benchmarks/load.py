@@ -0,0 +1,363 @@
+"""
+Load test: the whole FastAPI app in-process against the local Gemini stand-in (GEMINI_FAKE).
+Each virtual user onboards, runs --turns rounds of /api/conversation/process +
+/api/conversation/confirm, then streams synthetic speech PCM over /ws/translate and
+times the tool payloads that come back. --users run with at most --concurrency at once.
+Reports p50/p95/p99 latency and errors per endpoint, throughput, and peak RSS /
+Python heap; --out writes the result as JSON and --compare prints p95 deltas against
+an earlier file, so runs can be compared between commits. Exits non-zero when an endpoint
+only failed (or no WebSocket turn came back at all), so a broken path is not reported as zeros.
+Run from repo root: python -m backend.benchmarks.load [--users 50] [--concurrency 10] [--turns 3]
+    [--ws-seconds 10] [--latency-ms 400] [--error-rate 0] [--out load.json] [--compare old.json] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+SAMPLE_RATE = 16000
+CHUNK_BYTES = 8192  # 4096-sample ScriptProcessor chunks, like the frontend
+
+ONBOARDING = {
+    "location": "paris",
+    "personality": "Charismatic",
+    "occasion": "Holiday",
+    "pronunciation_difficulty": "Medium",
+    "slang_level": "Moderate",
+    "profession": "Architect",
+    "hobbies": "Cycling, jazz",
+}
+UTTERANCES = (
+    "Bonjour, qu'est-ce que je vous sers ?",
+    "Vous voulez un croissant avec ça ?",
+    "Ça fait quatre euros cinquante.",
+    "Sur place ou à emporter ?",
+    "Bonne journée !",
+)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float, ok: bool = True) -> None:
+        self.latencies.setdefault(name, [])
+        self.errors.setdefault(name, 0)
+        if ok:
+            self.latencies[name].append(seconds)
+        else:
+            self.errors[name] += 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        out = {}
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            out[name] = {
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "per_second": round(len(values) / elapsed, 2) if elapsed else None,
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(values, 0.99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+            }
+        return out
+
+
+class AsgiWebSocket:
+    """Minimal in-process WebSocket client speaking ASGI to the app."""
+
+    def __init__(self, app: Any, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket rejected: {message}")
+
+    async def send_text(self, text: str) -> None:
+        await self._to_app.put({"type": "websocket.receive", "text": text})
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._to_app.put({"type": "websocket.receive", "bytes": data})
+
+    async def receive(self, timeout: float) -> Optional[dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self._from_app.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, 5.0)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+
+async def _lifespan(app: Any) -> tuple[asyncio.Queue, asyncio.Task, asyncio.Queue]:
+    to_app: asyncio.Queue = asyncio.Queue()
+    from_app: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, to_app.get, from_app.put))
+    await to_app.put({"type": "lifespan.startup"})
+    message = await from_app.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"App startup failed: {message}")
+    return to_app, task, from_app
+
+
+async def _timed(recorder: Recorder, name: str, client: Any, path: str, body: dict) -> Optional[dict]:
+    start = time.perf_counter()
+    try:
+        response = await client.post(path, json=body)
+        ok = response.status_code == 200
+    except Exception:
+        ok, response = False, None
+    recorder.add(name, time.perf_counter() - start, ok)
+    return response.json() if ok else None
+
+
+async def _stream_audio(app: Any, recorder: Recorder, session_id: str, pcm: bytes, utterance_ends: list[int],
+                        speed: float) -> None:
+    ws = AsgiWebSocket(app, "/ws/translate")
+    start = time.perf_counter()
+    try:
+        await ws.connect()
+    except Exception:
+        recorder.add("ws_connect", time.perf_counter() - start, False)
+        return
+    recorder.add("ws_connect", time.perf_counter() - start)
+    await ws.send_text(json.dumps({"session_id": session_id, "downlink_codec": "mulaw", "destination": "Paris",
+                                   "target_language": "French", "occasion": "Holiday", "slang_level": "Moderate",
+                                   "personality": "Charismatic", "profession": "Architect",
+                                   "hobbies": "Cycling, jazz"}))
+    sent_ends: list[float] = []  # when each utterance's last byte went out
+    next_end = 0
+    done = asyncio.Event()
+
+    async def receiver() -> None:
+        while not done.is_set():
+            message = await ws.receive(0.2)
+            if message is None:
+                continue
+            if message["type"] == "websocket.close":
+                return
+            text = message.get("text")
+            if not text:
+                continue
+            payload = json.loads(text)
+            if "type" in payload:
+                continue
+            if "error" in payload:
+                recorder.add("ws_turn", 0.0, False)
+            elif sent_ends:
+                recorder.add("ws_turn", time.perf_counter() - sent_ends[-1])
+
+    reader = asyncio.create_task(receiver())
+    chunk_seconds = CHUNK_BYTES / 2 / SAMPLE_RATE
+    for offset in range(0, len(pcm), CHUNK_BYTES):
+        await ws.send_bytes(pcm[offset:offset + CHUNK_BYTES])
+        while next_end < len(utterance_ends) and utterance_ends[next_end] * 2 <= offset + CHUNK_BYTES:
+            sent_ends.append(time.perf_counter())
+            next_end += 1
+        await asyncio.sleep(chunk_seconds / speed)
+    await asyncio.sleep(1.0)  # let the last turn come back
+    await ws.send_text(json.dumps({"type": "end"}))
+    done.set()
+    await reader
+    await ws.close()
+
+
+async def _user(app: Any, client: Any, recorder: Recorder, index: int, turns: int, pcm: bytes,
+                utterance_ends: list[int], speed: float) -> None:
+    session = await _timed(recorder, "onboarding", client, "/api/onboarding", ONBOARDING)
+    if session is None:
+        return
+    session_id = session["session_id"]
+    for turn in range(turns):
+        said = UTTERANCES[(index + turn) % len(UTTERANCES)]
+        result = await _timed(recorder, "process", client, "/api/conversation/process",
+                              {"session_id": session_id, "other_person_said_local": said})
+        if result is None:
+            continue
+        await _timed(recorder, "confirm", client, "/api/conversation/confirm", {
+            "session_id": session_id,
+            "user_said": result["suggested_response"]["local"],
+            "suggested_local": result["suggested_response"]["local"],
+        })
+    if pcm:
+        await _stream_audio(app, recorder, session_id, pcm, utterance_ends, speed)
+
+
+def failed_endpoints(endpoints: dict[str, Any], expect_ws: bool) -> list[str]:
+    """Endpoints with errors and no successful call; ws_turn also fails if audio was sent and nothing came back."""
+    failed = [name for name, s in endpoints.items() if s["errors"] and not s["count"]]
+    if expect_ws and "ws_turn" not in endpoints:
+        failed.append("ws_turn")
+    return failed
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def run_load(users: int, concurrency: int, turns: int, ws_seconds: float, speed: float) -> dict[str, Any]:
+    import httpx
+
+    from backend.benchmarks.vad import synthetic_pcm
+    from backend.main import app
+    from backend.services.fake_gemini import get_fake_client
+
+    pcm, utterances = synthetic_pcm(ws_seconds) if ws_seconds > 0 else (b"", [])
+    utterance_ends = [end for _, end in utterances]
+    recorder = Recorder()
+    to_app, lifespan_task, from_app = await _lifespan(app)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tracemalloc.start()
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+
+        async def limited(i: int) -> None:
+            async with semaphore:
+                await _user(app, client, recorder, i, turns, pcm, utterance_ends, speed)
+
+        await asyncio.gather(*(limited(i) for i in range(users)))
+    elapsed = time.perf_counter() - start
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await to_app.put({"type": "lifespan.shutdown"})
+    await from_app.get()
+    await lifespan_task
+    requests = sum(len(v) for k, v in recorder.latencies.items() if k in ("onboarding", "process", "confirm"))
+    endpoints = recorder.summary(elapsed)
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "rest_requests_per_second": round(requests / elapsed, 2) if elapsed else None,
+        "endpoints": endpoints,
+        "failed_endpoints": failed_endpoints(endpoints, bool(pcm)),
+        "memory": {"rss_before_mb": rss_before, "rss_peak_mb": _rss_mb(), "python_heap_peak_mb": round(heap_peak / 2**20, 1)},
+        "fake_gemini": get_fake_client().behaviour.stats(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current: dict[str, Any], previous: dict[str, Any]) -> dict[str, Any]:
+    """p95 change per endpoint vs an earlier result (positive = slower)."""
+    deltas = {}
+    for name, stats in current["endpoints"].items():
+        old = previous.get("endpoints", {}).get(name)
+        if old and old.get("p95_ms"):
+            deltas[name] = {
+                "p95_ms": stats["p95_ms"],
+                "previous_p95_ms": old["p95_ms"],
+                "change_pct": round((stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100, 1),
+            }
+    return {"against_commit": previous.get("commit"), "endpoints": deltas}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--ws-seconds", type=float, default=10.0, help="synthetic speech per user (0 = skip WebSocket)")
+    parser.add_argument("--ws-speed", type=float, default=4.0, help="send audio this many times faster than real time")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="fake Gemini median latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.4)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--out", help="write the JSON result to this file")
+    parser.add_argument("--compare", help="earlier --out file to diff p95 against")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    # Configure the stand-in before the app (and its settings) are imported
+    os.environ.update({
+        "GEMINI_FAKE": "true",
+        "GEMINI_FAKE_LATENCY_MS": str(args.latency_ms),
+        "GEMINI_FAKE_LATENCY_SIGMA": str(args.latency_sigma),
+        "GEMINI_FAKE_ERROR_RATE": str(args.error_rate),
+        "GEMINI_FAKE_SEED": "7",
+        # The virtual users send session_id like the frontend, so exercise the warm path too
+        "LIVE_PREWARM_ENABLED": "true",
+    })
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    result = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "json")},
+        **asyncio.run(run_load(args.users, args.concurrency, args.turns, args.ws_seconds, args.ws_speed)),
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        _print(result)
+    if result["failed_endpoints"]:
+        print(f"FAILED: every call errored for {', '.join(result['failed_endpoints'])}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _print(result: dict[str, Any]) -> None:
+    print(f"{'endpoint':12} {'count':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, s in result["endpoints"].items():
+        print(f"{name:12} {s['count']:>6} {s['errors']:>6} {s['per_second']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+    print(f"elapsed {result['elapsed_seconds']} s, REST {result['rest_requests_per_second']} req/s, memory {result['memory']}")
+    for name, d in result.get("comparison", {}).get("endpoints", {}).items():
+        print(f"  {name:12} p95 {d['previous_p95_ms']} -> {d['p95_ms']} ms ({d['change_pct']:+}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: cost of the /api/metrics instrumentation on the request hot path.
+Times a stage timer (enabled vs disabled registry), a histogram observe, a WebSocket
+counter update and MetricsMiddleware around a trivial ASGI app, then estimates the
+per-turn overhead of /api/conversation/process (its stage timers, the suggestion's
+prompt/parse stages, one model-call observation and the middleware) against a
+typical model latency. Also reports how long a scrape (render) takes.
+Run from repo root: python -m backend.benchmarks.metrics [--iterations 200000] [--model-ms 400] [--json]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from backend.services.metrics import (
+    MODEL_CALL_SECONDS,
+    MetricsMiddleware,
+    MetricsRegistry,
+    WsCounters,
+    current_endpoint,
+)
+
+# /api/conversation/process: 6 stages in main.py + prompt_render and parse in gemini_client
+STAGES_PER_TURN = 8
+
+
+def _ns_per_op(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    fn(iterations)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def _stage_loop(registry: MetricsRegistry):
+    def run(n: int) -> None:
+        for _ in range(n):
+            with registry.stage("suggest"):
+                pass
+    return run
+
+
+def _empty_loop(n: int) -> None:
+    for _ in range(n):
+        pass
+
+
+async def _asgi_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, n: int) -> float:
+    scope = {"type": "http", "method": "POST", "path": "/api/conversation/process"}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def run(iterations: int, model_ms: float) -> dict:
+    enabled = MetricsRegistry(enabled=True)
+    disabled = MetricsRegistry(enabled=False)
+    current_endpoint.set("/api/conversation/process")
+
+    loop_ns = _ns_per_op(_empty_loop, iterations)
+    stage_ns = _ns_per_op(_stage_loop(enabled), iterations) - loop_ns
+    stage_off_ns = _ns_per_op(_stage_loop(disabled), iterations) - loop_ns
+
+    histogram = enabled.histogram(MODEL_CALL_SECONDS, model="gemini-2.5-flash", outcome="ok")
+
+    def observe(n: int) -> None:
+        for i in range(n):
+            histogram.observe(i * 1e-6)
+
+    observe_ns = _ns_per_op(observe, iterations) - loop_ns
+
+    def labelled_observe(n: int) -> None:
+        for _ in range(n):
+            enabled.observe(MODEL_CALL_SECONDS, 0.4, model="gemini-2.5-flash", outcome="ok")
+
+    labelled_ns = _ns_per_op(labelled_observe, iterations) - loop_ns
+    counters = WsCounters(enabled)
+
+    def ws_record(n: int) -> None:
+        for _ in range(n):
+            counters.record("in", "binary", 8192)
+
+    ws_ns = _ns_per_op(ws_record, iterations) - loop_ns
+
+    requests = max(1000, iterations // 20)
+    bare_ns = asyncio.run(_drive(_asgi_app, requests))
+    wrapped_ns = asyncio.run(_drive(MetricsMiddleware(_asgi_app, metrics=enabled), requests))
+    middleware_ns = wrapped_ns - bare_ns
+
+    turn_us = (STAGES_PER_TURN * stage_ns + labelled_ns + middleware_ns) / 1000
+    start = time.perf_counter()
+    text = enabled.render()
+    render_ms = (time.perf_counter() - start) * 1000
+    return {
+        "iterations": iterations,
+        "stage_timer_ns": round(stage_ns, 1),
+        "stage_timer_disabled_ns": round(stage_off_ns, 1),
+        "histogram_observe_ns": round(observe_ns, 1),
+        "labelled_observe_ns": round(labelled_ns, 1),
+        "ws_counter_record_ns": round(ws_ns, 1),
+        "middleware_ns_per_request": round(middleware_ns, 1),
+        "process_turn_overhead_us": round(turn_us, 2),
+        "overhead_vs_model_call_pct": round(turn_us / (model_ms * 1000) * 100, 4),
+        "render_ms": round(render_ms, 3),
+        "render_bytes": len(text),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--model-ms", type=float, default=400.0, help="typical model call latency to compare against")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.iterations, args.model_ms)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:30} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: per-fragment pass-through vs PcmFrameBuffer frame coalescing on /ws/translate.
+Client fragments go through an asyncio queue to a consumer that "sends" each item
+(a base64 JSON message and one event-loop round trip, like send_realtime_input).
+Three client shapes: AudioWorklet 128-sample blocks, MediaRecorder-like mixed sizes,
+and the current 4096-sample ScriptProcessor chunks. Reports sends and event-loop CPU
+per second of audio.
+Run from repo root: python -m backend.benchmarks.pcm_buffer [--seconds 300] [--frame-ms 40] [--json]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from typing import Optional
+
+from backend.services.pcm_buffer import PcmFrameBuffer
+
+SAMPLE_RATE = 16000
+
+# fragment sizes in bytes (16-bit samples)
+SHAPES = {
+    "worklet": (256,),
+    "mixed": (256, 480, 1000, 1366, 2730),
+    "script_processor": (8192,),
+}
+
+
+def fragments(seconds: float, sizes: tuple[int, ...], seed: int = 7) -> list[bytes]:
+    rng = random.Random(seed)
+    total = int(seconds * SAMPLE_RATE) * 2
+    out = []
+    pos = 0
+    while pos < total:
+        n = min(total - pos, rng.choice(sizes))
+        out.append(bytes(n))
+        pos += n
+    return out
+
+
+async def _pipeline(chunks: list[bytes], framer: Optional[PcmFrameBuffer] = None) -> tuple[float, int]:
+    queue: asyncio.Queue = asyncio.Queue()
+    sent = 0
+
+    async def consumer() -> None:
+        nonlocal sent
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            # Stand-in for send_realtime_input: base64 JSON message + one loop round trip
+            json.dumps({"realtime_input": {"media_chunks": [{"data": base64.b64encode(item).decode()}]}})
+            await asyncio.sleep(0)
+            sent += 1
+
+    task = asyncio.create_task(consumer())
+    start = time.perf_counter()
+    for chunk in chunks:
+        if framer is None:
+            await queue.put(chunk)
+        else:
+            framer.write(chunk)
+            frames = framer.take()
+            if frames:
+                await queue.put(frames)
+        await asyncio.sleep(0)  # next websocket.receive()
+    if framer is not None and len(framer):
+        await queue.put(framer.flush())
+    await queue.put(None)
+    await task
+    return time.perf_counter() - start, sent
+
+
+def run(seconds: float, frame_ms: int) -> dict:
+    result = {"audio_seconds": seconds, "frame_ms": frame_ms}
+    for shape, sizes in SHAPES.items():
+        chunks = fragments(seconds, sizes)
+        raw_s, raw_sends = asyncio.run(_pipeline(chunks))
+        framer = PcmFrameBuffer(SAMPLE_RATE * frame_ms // 1000 * 2, capacity_frames=max(16, 1000 // frame_ms))
+        framed_s, framed_sends = asyncio.run(_pipeline(chunks, framer))
+        result[shape] = {
+            "passthrough_sends": raw_sends,
+            "framed_sends": framed_sends,
+            "send_reduction_x": round(raw_sends / framed_sends, 1) if framed_sends else None,
+            "passthrough_us_per_audio_s": round(raw_s / seconds * 1e6, 1),
+            "framed_us_per_audio_s": round(framed_s / seconds * 1e6, 1),
+        }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=300.0)
+    parser.add_argument("--frame-ms", type=int, default=40)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.seconds, args.frame_ms)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        if not isinstance(value, dict):
+            print(f"{key:28} {value}")
+            continue
+        print(key)
+        for k, v in value.items():
+            print(f"  {k:26} {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: offline phrasebook lookups in front of the suggestion model.
+Writes an index with every seed phrase for all 120 (region, slang, personality) groups
+(placeholder answers of realistic length; no Gemini calls), then times loading it and
+looking up exact phrases (re-cased / re-punctuated, so folding is exercised), one-typo
+variants (fuzzy path) and ordinary sentences that must miss, against a model call.
+Run from repo root: python -m backend.benchmarks.phrasebook [--iterations 2000] [--model-ms 400] [--json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from backend.models.schemas import PERSONALITY_OPTIONS, SLANG_OPTIONS
+from backend.services.end_phrase import language_key
+from backend.services.phrasebook import (
+    REGION_LANGUAGES,
+    SEED_PHRASES,
+    Phrasebook,
+    folded_phrases,
+    group_key,
+    write_index,
+)
+
+MISSES = {
+    "fr": (
+        "Je crois que le musée ferme plus tôt le dimanche, il faudrait vérifier sur le site",
+        "Mon cousin travaille dans une boulangerie près de la gare du Nord",
+    ),
+    "ar": ("Lyoum kayn bzaf dyal nas f souk, khassek tji bkri ghedda",),
+    "bg": ("Утре ще вали цял ден, по-добре вземете чадър със себе си",),
+}
+
+
+def _index(path: str) -> int:
+    languages = {lang: [k for k, _ in folded_phrases(p)] for lang, p in SEED_PHRASES.items()}
+    groups = {}
+    for region, local_language in REGION_LANGUAGES.items():
+        lang = language_key(local_language)
+        for slang in SLANG_OPTIONS:
+            for personality in PERSONALITY_OPTIONS:
+                answers = [
+                    (f"(en) {k}", f"{personality} {slang} reply to {k}", f"{k} ({region})", f"{k}-phonetic")
+                    for k in languages[lang]
+                ]
+                groups[group_key(region, slang, personality)] = (lang, answers)
+    return write_index(path, languages, groups, {"built_at": "benchmark"})
+
+
+def _typo(phrase: str) -> str:
+    i = len(phrase) // 2
+    return phrase[:i] + phrase[i + 1:]
+
+
+def _time(book: Phrasebook, queries: list[tuple[str, str, str]], iterations: int) -> tuple[float, int]:
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for utterance, local_language, region in queries:
+            hits += book.find(utterance, local_language, region, "Friendly", "Cool") is not None
+    elapsed = time.perf_counter() - start
+    n = iterations * len(queries)
+    return elapsed / n * 1e6, hits // iterations
+
+
+def run(iterations: int, model_ms: float, min_similarity: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "phrasebook.idx")
+        size = _index(path)
+        start = time.perf_counter()
+        book = Phrasebook(path, min_similarity=min_similarity)
+        load_ms = (time.perf_counter() - start) * 1000
+        exact, fuzzy, misses = [], [], []
+        for region, local_language in REGION_LANGUAGES.items():
+            lang = language_key(local_language)
+            for phrase in SEED_PHRASES[lang]:
+                exact.append((phrase.upper() + " !", local_language, region))
+                if len(phrase) >= 10:
+                    fuzzy.append((_typo(phrase), local_language, region))
+            misses.extend((s, local_language, region) for s in MISSES[lang])
+        rounds = max(1, iterations // 100)
+        exact_us, exact_hits = _time(book, exact, rounds)
+        fuzzy_us, fuzzy_hits = _time(book, fuzzy, rounds)
+        miss_us, false_hits = _time(book, misses, rounds)
+        book.close()
+    worst_us = max(exact_us, fuzzy_us, miss_us)
+    return {
+        "index_bytes": size,
+        "load_ms": round(load_ms, 2),
+        "exact_us": round(exact_us, 2),
+        "exact_hit_rate": round(exact_hits / len(exact), 3),
+        "fuzzy_us": round(fuzzy_us, 2),
+        "fuzzy_hit_rate": round(fuzzy_hits / len(fuzzy), 3),
+        "miss_us": round(miss_us, 2),
+        "false_hits": false_hits,
+        "speedup_vs_model_call": round(model_ms * 1000 / worst_us),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--model-ms", type=float, default=400.0, help="typical model call latency to compare against")
+    parser.add_argument("--min-similarity", type=float, default=0.85)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.iterations, args.model_ms, args.min_similarity)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:24} {value}")
+
+
+if __name__ == "__main__":
+    main()
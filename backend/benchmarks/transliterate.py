@@ -0,0 +1,74 @@
+"""
+Benchmark: local transliteration tables vs asking Gemini for a phonetic spelling.
+Builds distinct phrases per language by chaining two or three phrasebook seed phrases, then
+times one phrase at a time with an empty word memo (cold) and a warm one, and
+batch() over the whole set (warm), reporting phrases per millisecond and how many phrases
+fit in one model round trip.
+Run from repo root: python -m backend.benchmarks.transliterate [--phrases 5000] [--model-ms 400] [--json]
+"""
+import argparse
+import itertools
+import json
+import time
+
+from backend.services.phrasebook import SEED_PHRASES
+from backend.services.transliterate import get_transliterator
+
+LANGUAGES = {"fr": "French", "ar": "Moroccan Darija (Arabic)", "bg": "Bulgarian"}
+
+
+def _phrases(lang: str, n: int) -> list[str]:
+    seeds = [s.rstrip(" ?!.") for s in SEED_PHRASES[lang]]
+    combos = itertools.chain(itertools.permutations(seeds, 2), itertools.permutations(seeds, 3))
+    return list(itertools.islice(itertools.chain(SEED_PHRASES[lang], map(", ".join, combos)), n))
+
+
+def run(phrases: int, model_ms: float) -> dict:
+    result: dict = {"phrases": phrases, "model_ms": model_ms}
+    for lang, name in LANGUAGES.items():
+        engine = get_transliterator(name)
+        texts = _phrases(lang, phrases)
+        engine.clear()
+        start = time.perf_counter()
+        for text in texts:
+            engine.phrase(text)
+        cold_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in texts:
+            engine.phrase(text)
+        warm_s = time.perf_counter() - start
+        start = time.perf_counter()
+        engine.batch(texts)
+        batch_s = time.perf_counter() - start
+        per_ms = len(texts) / (batch_s * 1000)
+        result[lang] = {
+            "cold_us_per_phrase": round(cold_s / len(texts) * 1e6, 2),
+            "warm_us_per_phrase": round(warm_s / len(texts) * 1e6, 2),
+            "batch_phrases_per_ms": round(per_ms),
+            "phrases_per_model_call": round(per_ms * model_ms),
+            "sample": f"{texts[0]} -> {engine.phrase(texts[0])}",
+        }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phrases", type=int, default=5000)
+    parser.add_argument("--model-ms", type=float, default=400.0, help="typical model call latency to compare against")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.phrases, args.model_ms)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    for key, value in result.items():
+        if isinstance(value, dict):
+            print(key)
+            for k, v in value.items():
+                print(f"  {k:24} {v}")
+        else:
+            print(f"{key:26} {value}")
+
+
+if __name__ == "__main__":
+    main()
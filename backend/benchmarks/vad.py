@@ -0,0 +1,100 @@
+"""
+Benchmark: VoiceActivityDetector on synthetic speech + silence PCM (16 kHz int16).
+Utterances are voiced harmonics with a syllable envelope plus fricative noise bursts,
+separated by pauses of low background noise. Reports per-frame CPU cost, bytes saved,
+speech frames kept and whether every utterance onset survived.
+Run from repo root: python -m backend.benchmarks.vad [--seconds 120] [--chunk-ms 256] [--json]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.services.vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_pcm(seconds: float, seed: int = 7) -> tuple[bytes, list[tuple[int, int]]]:
+    """PCM bytes and the (start, end) sample ranges of each utterance."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    signal = rng.normal(0.0, 10.0, total)  # background noise around -70 dBFS
+    utterances = []
+    pos = int(rng.uniform(0.5, 2.0) * SAMPLE_RATE)
+    while pos < total:
+        length = int(rng.uniform(0.6, 3.0) * SAMPLE_RATE)
+        end = min(total, pos + length)
+        t = np.arange(end - pos) / SAMPLE_RATE
+        f0 = rng.uniform(100, 240)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 6) * t)
+        speech = voiced * envelope * rng.uniform(1500, 6000)
+        # a few fricatives ("s", "f"): short high-frequency noise bursts
+        for _ in range(int(len(t) / SAMPLE_RATE * 2)):
+            start = int(rng.uniform(0, max(1, len(t) - 1600)))
+            speech[start:start + 1600] = rng.normal(0.0, rng.uniform(300, 900), len(speech[start:start + 1600]))
+        signal[pos:end] += speech
+        utterances.append((pos, end))
+        pos = end + int(rng.uniform(0.8, 4.0) * SAMPLE_RATE)
+    pcm = np.clip(signal, -32768, 32767).astype("<i2")
+    return pcm.tobytes(), utterances
+
+
+def run(seconds: float, chunk_ms: int, frame_ms: int) -> dict:
+    pcm, utterances = synthetic_pcm(seconds)
+    vad = VoiceActivityDetector(sample_rate=SAMPLE_RATE, frame_ms=frame_ms)
+    chunk_bytes = SAMPLE_RATE * chunk_ms // 1000 * 2
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        vad.process(chunk)
+    elapsed = time.perf_counter() - start
+
+    # Output audio is concatenated, so get the per-frame decision from a second detector fed frame by frame
+    frame_bytes = vad.frame_bytes
+    probe = VoiceActivityDetector(sample_rate=SAMPLE_RATE, frame_ms=frame_ms, preroll_ms=0)
+    mask = np.array([bool(probe.process(pcm[i:i + frame_bytes]).audio)
+                     for i in range(0, len(pcm) - frame_bytes + 1, frame_bytes)])
+    frame_samples = frame_bytes // 2
+    speech_frames = np.zeros(len(mask), dtype=bool)
+    onsets_kept = 0
+    for s, e in utterances:
+        speech_frames[s // frame_samples:e // frame_samples] = True
+        onsets_kept += bool(mask[s // frame_samples:s // frame_samples + 3].any())
+
+    stats = vad.stats()
+    return {
+        "audio_seconds": seconds,
+        "speech_fraction": round(float(speech_frames.mean()), 3),
+        "frames": stats["frames"],
+        "us_per_frame": round(elapsed / stats["frames"] * 1e6, 2),
+        "realtime_factor": round(seconds / elapsed, 1),
+        "bytes_saved_ratio": stats["bytes_saved_ratio"],
+        "frames_suppressed": stats["frames_suppressed"],
+        "speech_frames_kept": round(float(mask[speech_frames].mean()), 4),
+        "utterances": len(utterances),
+        "onsets_kept": onsets_kept,
+        "segments_detected": stats["segments"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--chunk-ms", type=int, default=256, help="client chunk size (4096 samples = 256 ms)")
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = run(args.seconds, args.chunk_ms, args.frame_ms)
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:22} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,135 @@ class Settings(BaseSettings):
     # Live translation / Gemini Live API (WebSocket streaming)
     live_translation_api_key: Optional[str] = None
 
+    # Shared Gemini client: max in-flight async model calls per process,
+    # and the size of the keep-alive HTTP connection pool behind them.
+    gemini_max_concurrency: int = 64
+    gemini_max_connections: int = 100
+
+    # Model router: consecutive failures before a model's circuit opens, how long
+    # it stays open, and how long a model that 404'd for our key is skipped.
+    model_circuit_failure_threshold: int = 5
+    model_circuit_open_seconds: float = 30.0
+    model_unavailable_recheck_seconds: float = 900.0
+
+    # Stage / request / model latency histograms and WebSocket counters (/api/metrics)
+    metrics_enabled: bool = True
+
+    # Local Gemini stand-in for benchmarks / load tests (no API key or quota needed):
+    # log-normal latency around GEMINI_FAKE_LATENCY_MS, injected error rate, stream chunks.
+    gemini_fake: bool = False
+    gemini_fake_latency_ms: float = 400.0
+    gemini_fake_latency_sigma: float = 0.4
+    gemini_fake_error_rate: float = 0.0
+    gemini_fake_stream_chunks: int = 6
+    gemini_fake_seed: Optional[int] = None
+
+    # Hedged suggestion calls (async path): if the best model has not answered within its
+    # observed HEDGE_QUANTILE latency (HEDGE_DEFAULT_DELAY_SECONDS until it has samples), the
+    # next model gets the same request; hedges are capped at HEDGE_MAX_EXTRA_RATIO of calls.
+    hedge_enabled: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_delay_seconds: float = 0.5
+    hedge_default_delay_seconds: float = 3.0
+    hedge_max_extra_ratio: float = 0.1
+
+    # Response cache for suggestions/translations/phonetics. Set RESPONSE_CACHE_PATH
+    # to a SQLite file to keep entries across restarts.
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 4096
+    response_cache_ttl_seconds: float = 21600.0
+    response_cache_path: Optional[str] = None
+
+    # Phonetic spelling from the local transliteration tables (French, Darija, Bulgarian)
+    # instead of model output, for LocalAgent.phonetic and suggested_phonetic. Gemini is
+    # asked for other languages only with PHONETIC_LLM_FALLBACK (or with the tables off).
+    phonetic_local_enabled: bool = True
+    phonetic_llm_fallback: bool = False
+
+    # Offline phrasebook (built with python -m backend.services.phrasebook): utterances that
+    # match a pre-generated phrase with at least this edit-distance similarity are answered
+    # from the memory-mapped index without a model call. Unset path = disabled.
+    phrasebook_path: Optional[str] = None
+    phrasebook_min_similarity: float = 0.85
+
+    # Single-flight: concurrent identical translation / phonetic / suggestion calls
+    # share one upstream request (complements the cache, which only has finished results)
+    single_flight_enabled: bool = True
+
+    # ValueTracker: billable events kept in memory (oldest are dropped beyond this)
+    event_retention: int = 100_000
+
+    # Durable event log: segment directory (unset = memory only), segment size,
+    # segments kept after compaction, and how long the writer gathers a batch.
+    event_log_dir: Optional[str] = None
+    event_log_segment_bytes: int = 8 * 1024 * 1024
+    event_log_max_segments: int = 64
+    event_log_flush_ms: float = 50.0
+
+    # REST session store: "memory" or "sqlite" (SESSION_STORE_PATH), idle TTL,
+    # LRU budget (entries and approximate JSON bytes) and background sweep interval.
+    session_store: str = "memory"
+    session_store_path: str = "sessions.sqlite3"
+    session_idle_ttl_seconds: float = 3600.0
+    session_max_entries: int = 10_000
+    session_max_bytes: int = 64 * 1024 * 1024
+    session_sweep_interval_seconds: float = 60.0
+
+    # Conversation memory: recent exchanges kept verbatim, token budget of the rolling
+    # summary of older ones, and how many overflowed exchanges trigger a re-summary.
+    conversation_window_turns: int = 6
+    conversation_summary_max_tokens: int = 200
+    conversation_summary_batch_turns: int = 3
+
+    # Per-session suggestion prefix: upload it as Gemini cached content once it is at
+    # least this many (estimated) tokens; smaller prefixes go in system_instruction.
+    prompt_cache_enabled: bool = True
+    prompt_cache_min_tokens: int = 1024
+    prompt_cache_ttl_seconds: float = 3600.0
+
+    # /api/conversation/batch: items per request and concurrent model calls per batch
+    batch_max_items: int = 200
+    batch_max_concurrency: int = 8
+
+    # Pre-warmed Gemini Live connections (opened at onboarding / arrive, claimed by
+    # /ws/translate via session_id in the context message); closed after this idle time.
+    # Off by default: each warm connection holds a Live session (and quota) open unused.
+    live_prewarm_enabled: bool = False
+    live_warm_idle_seconds: float = 300.0
+    live_warm_max_sessions: int = 100
+
+    # Resumable /ws/translate: a dropped connection parks its Live session (buffering tool
+    # payloads) for this long; reconnecting with the resume_token reattaches to it.
+    live_resume_enabled: bool = True
+    live_resume_grace_seconds: float = 30.0
+    live_resume_max_parked: int = 100
+
+    # Client PCM is regrouped into frames of this length before audio_in (20 / 40 / 100 ...).
+    audio_frame_ms: int = 40
+
+    # /ws/translate queues (frames / messages per connection). Client audio overflow policy:
+    # "drop_oldest", "block" (stop reading the socket) or "slow_down" (drop_oldest plus a
+    # flow message to the client between the high/low fill watermarks).
+    ws_audio_in_max_chunks: int = 25
+    ws_audio_out_max_chunks: int = 32
+    ws_tool_out_max_messages: int = 64
+    ws_audio_in_policy: str = "slow_down"
+    ws_slow_down_high_watermark: float = 0.75
+    ws_slow_down_low_watermark: float = 0.25
+
+    # Uplink voice activity detection (16 kHz PCM): silent frames are not sent to Gemini Live.
+    # Speech = frame energy above max(VAD_THRESHOLD_DB, noise floor + margin); hangover and
+    # pre-roll keep the audio just after / before each utterance.
+    vad_enabled: bool = True
+    vad_frame_ms: int = 20
+    vad_threshold_db: float = -50.0
+    vad_noise_margin_db: float = 10.0
+    vad_hangover_ms: int = 300
+    vad_preroll_ms: int = 200
+
+    # Local goodbye detector: verdicts below this confidence fall back to Gemini.
+    end_phrase_confidence_threshold: float = 0.8
+
     # Prefer GOOGLE_API_KEY if set (e.g. for Vertex), else GEMINI_API_KEY
     def get_gemini_api_key(self) -> str:
         key = self.gemini_api_key
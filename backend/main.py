@@ -7,12 +7,13 @@ import json
 import os
 import uuid
 from contextlib import asynccontextmanager
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
 from backend.config import get_settings
 from backend.models.schemas import (
@@ -20,17 +21,80 @@ from backend.models.schemas import (
     UserContext,
     LocationOption,
 )
-from backend.agents.communicator import CommunicatorAgent
-from backend.services.gemini_client import detect_end_phrase
+from backend.agents.session_context import SessionContextCache
+from backend.services.batch import run_batch
+from backend.services.conversation_memory import get_conversation_memory
+from backend.services.gemini_client import (
+    aclose_client,
+    detect_end_phrase_async,
+    get_model_router,
+    suggestion_key,
+    summarize_conversation_async,
+)
 from backend.services.value_tracker import ValueTracker
-from backend.services.live_session import run_live_session
+from backend.services.ws_queues import get_ws_registry
+from backend.services.live_session import (
+    get_live_session_manager,
+    live_context_from_user_context,
+    run_live_session,
+)
+from backend.services.live_streams import LiveStream, get_parked_streams
+from backend.services.response_cache import get_response_cache
+from backend.services.hedging import get_hedge_policy
+from backend.services.metrics import MetricsMiddleware, WsCounters, get_metrics
+from backend.services.phrasebook import get_phrasebook
+from backend.services.single_flight import get_single_flight
+from backend.services.session_store import create_session_store, run_sweeper
 
 value_tracker = ValueTracker()
 
 load_dotenv()
 
-# In-memory session store (use Redis/DB in production)
-sessions: dict[str, dict] = {}
+# Session store: in-memory by default, SESSION_STORE=sqlite to persist (see session_store.py)
+sessions = create_session_store(get_settings())
+memory = get_conversation_memory()
+# Validated UserContext, CommunicatorAgent and prompt prefix, compiled once per session
+contexts = SessionContextCache(max_entries=get_settings().session_max_entries)
+sessions.add_eviction_listener(contexts.invalidate)
+# Gemini Live connections opened at onboarding / arrive, claimed by /ws/translate
+live_sessions = get_live_session_manager()
+sessions.add_eviction_listener(live_sessions.discard)
+# /ws/translate streams detached by a dropped connection, waiting for a resume_token
+parked_streams = get_parked_streams()
+# Stage / model / request histograms and WebSocket counters for /api/metrics
+metrics = get_metrics()
+ws_counters = WsCounters(metrics)
+
+
+def _collect_gauges():
+    ws = get_ws_registry().stats()
+    yield "polyglot_ws_connections", "gauge", {}, ws["active"]
+    depth: dict[str, int] = {}
+    for conn in ws["connections"]:
+        for name, q in conn["queues"].items():
+            depth[name] = depth.get(name, 0) + q["depth"]
+    for name, value in depth.items():
+        yield "polyglot_ws_queue_depth", "gauge", {"queue": name}, value
+    for name, value in ws["dropped_total"].items():
+        yield "polyglot_ws_queue_dropped_total", "counter", {"queue": name}, value
+    yield "polyglot_ws_parked_streams", "gauge", {}, parked_streams.stats()["parked_now"]
+    yield "polyglot_sessions", "gauge", {}, sessions.stats()["sessions"]
+    yield "polyglot_model_calls_in_flight", "gauge", {}, get_single_flight().stats()["in_flight"]
+    phrasebook = get_phrasebook()
+    if phrasebook is not None:
+        stats = phrasebook.stats()
+        yield "polyglot_phrasebook_lookups_total", "counter", {"result": "exact"}, stats["exact_hits"]
+        yield "polyglot_phrasebook_lookups_total", "counter", {"result": "fuzzy"}, stats["fuzzy_hits"]
+        yield "polyglot_phrasebook_lookups_total", "counter", {"result": "miss"}, stats["misses"]
+
+
+metrics.add_collector(_collect_gauges)
+
+
+def _prewarm_live(session_id: str, user_context: dict[str, Any]) -> bool:
+    if not get_settings().live_prewarm_enabled:
+        return False
+    return live_sessions.warm(session_id, live_context_from_user_context(user_context))
 
 
 def _location_to_languages(loc: LocationOption) -> tuple[str, str]:
@@ -53,8 +117,23 @@ def _location_to_region(loc: LocationOption) -> str:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    value_tracker.open_log()
+    sweeper = asyncio.create_task(run_sweeper(sessions, get_settings().session_sweep_interval_seconds))
     yield
-    sessions.clear()
+    sweeper.cancel()
+    try:
+        await sweeper
+    except asyncio.CancelledError:
+        pass
+    await parked_streams.close()
+    await live_sessions.close()
+    contexts.clear()
+    sessions.close()
+    value_tracker.close_log()
+    await aclose_client()
+    cache = get_response_cache()
+    if cache is not None:
+        cache.close()
 
 
 app = FastAPI(
@@ -69,10 +148,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 @app.post("/api/onboarding")
-def submit_onboarding(answers: OnboardingAnswers) -> dict:
+async def submit_onboarding(answers: OnboardingAnswers) -> dict:
     """
     Submit onboarding answers; returns session_id and user_context for client.
     """
@@ -86,12 +166,13 @@ def submit_onboarding(answers: OnboardingAnswers) -> dict:
         target_region=region,
     )
     session_id = str(uuid.uuid4())
-    sessions[session_id] = {
+    await sessions.set_async(session_id, {
         "user_context": user_context.model_dump(),
         "conversation_history_english": [],
         "arrived": False,
         "last_other_said": "",
-    }
+    })
+    _prewarm_live(session_id, user_context.model_dump(mode="json"))
     return {
         "session_id": session_id,
         "target_language": target_lang_name,
@@ -108,6 +189,11 @@ class ProcessTurnBody(BaseModel):
     other_person_said_local: str
 
 
+class BatchProcessBody(BaseModel):
+    items: list[ProcessTurnBody]
+    max_concurrency: Optional[int] = Field(default=None, ge=1, description="Capped at BATCH_MAX_CONCURRENCY")
+
+
 class ConfirmBody(BaseModel):
     session_id: str
     user_said: str
@@ -115,35 +201,44 @@ class ConfirmBody(BaseModel):
 
 
 @app.post("/api/arrive")
-def mark_arrived(body: ArriveBody) -> dict:
+async def mark_arrived(body: ArriveBody) -> dict:
     """User clicked 'I'm here' at location."""
     session_id = body.session_id
-    if session_id not in sessions:
+    data = await sessions.update_async(session_id, lambda d: d.update(arrived=True))
+    if data is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    sessions[session_id]["arrived"] = True
-    region = sessions[session_id]["user_context"]["target_region"]
+    # Re-warm if the onboarding connection idled out while the user travelled
+    _prewarm_live(session_id, data["user_context"])
+    region = data["user_context"]["target_region"]
     return {"message": f"Welcome to {region}", "region": region}
 
 
 @app.post("/api/conversation/process")
-def process_turn(body: ProcessTurnBody) -> dict:
+async def process_turn(body: ProcessTurnBody) -> dict:
     """
     STEP Z: Other person spoke in local language.
     Returns translation (English) and suggested response (English + local + phonetic).
     """
     session_id = body.session_id
     other_person_said_local = body.other_person_said_local
-    if session_id not in sessions:
+    with metrics.stage("session_lookup"):
+        data = await sessions.get_async(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    data = sessions[session_id]
-    ctx = UserContext(**data["user_context"])
-    comm = CommunicatorAgent(ctx)
-    history = data.get("conversation_history_english") or []
-    english_translation, suggested = comm.process_other_person_speech(
-        other_person_said_local, conversation_history_english=history
-    )
-    data["last_other_said"] = english_translation
-    value_event = value_tracker.score_interaction(ctx, other_person_said_local, suggested)
+    with metrics.stage("context"):
+        context = contexts.get(session_id, data)
+    ctx, comm = context.user_context, context.communicator
+    with metrics.stage("memory"):
+        history, summary = memory.prompt_context(data)
+    with metrics.stage("suggest"):
+        english_translation, suggested = await comm.process_other_person_speech_async(
+            other_person_said_local, conversation_history_english=history, conversation_summary=summary
+        )
+    with metrics.stage("session_write"):
+        # Apply to the current session: /confirm or a summary may have written it during the call
+        await sessions.update_async(session_id, lambda d: d.update(last_other_said=english_translation))
+    with metrics.stage("value_score"):
+        value_event = value_tracker.score_interaction(ctx, other_person_said_local, suggested)
     return {
         "other_person_said_english": english_translation,
         "suggested_response": suggested.model_dump(),
@@ -151,30 +246,182 @@ def process_turn(body: ProcessTurnBody) -> dict:
     }
 
 
+@app.post("/api/conversation/batch")
+async def process_turn_batch(body: BatchProcessBody) -> dict:
+    """
+    STEP Z for many utterances at once (offline queues, replays). Sessions run concurrently
+    (at most BATCH_MAX_CONCURRENCY model calls), each session's items in order; duplicate
+    utterances with the same prompt context share one call. Results are in input order, each
+    either {"ok": true, ...same as /api/conversation/process} or {"ok": false, "status", "detail"}.
+    """
+    settings = get_settings()
+    if len(body.items) > settings.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {settings.batch_max_items} items per batch")
+    concurrency = min(body.max_concurrency or settings.batch_max_concurrency, settings.batch_max_concurrency)
+    # Session data, compiled context and prompt memory, read once per session: process does
+    # not change the history, so every item of a session sees the same context
+    session_ids = list(dict.fromkeys(item.session_id for item in body.items))
+    loaded = dict(zip(session_ids, await asyncio.gather(*(sessions.get_async(s) for s in session_ids))))
+    prepared: dict[str, Optional[tuple[dict[str, Any], Any, list[str], Optional[str]]]] = {}
+
+    def prepare(session_id: str):
+        if session_id not in prepared:
+            data = loaded.get(session_id)
+            if data is None:
+                prepared[session_id] = None
+            else:
+                history, summary = memory.prompt_context(data)
+                prepared[session_id] = (data, contexts.get(session_id, data), history, summary)
+        return prepared[session_id]
+
+    def key_of(item: ProcessTurnBody):
+        p = prepare(item.session_id)
+        if p is None:
+            return None
+        _, context, history, summary = p
+        return suggestion_key(context.user_context, item.other_person_said_local, history, summary)
+
+    async def call(item: ProcessTurnBody):
+        p = prepare(item.session_id)
+        if p is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        _, context, history, summary = p
+        return await context.communicator.process_other_person_speech_async(
+            item.other_person_said_local, conversation_history_english=history, conversation_summary=summary
+        )
+
+    async def finish(item: ProcessTurnBody, value) -> dict[str, Any]:
+        english_translation, suggested = value
+        context = prepared[item.session_id][1]
+        await sessions.update_async(item.session_id, lambda d: d.update(last_other_said=english_translation))
+        value_event = value_tracker.score_interaction(context.user_context, item.other_person_said_local, suggested)
+        return {
+            "other_person_said_english": english_translation,
+            "suggested_response": suggested.model_dump(),
+            "value_event": value_event,
+        }
+
+    results, stats = await run_batch(
+        body.items, lambda item: item.session_id, key_of, call, finish, max_concurrency=concurrency
+    )
+    out = []
+    for index, (item, result) in enumerate(zip(body.items, results)):
+        entry = {"index": index, "session_id": item.session_id}
+        if isinstance(result, HTTPException):
+            entry.update(ok=False, status=result.status_code, detail=result.detail)
+        elif isinstance(result, Exception):
+            entry.update(ok=False, status=502, detail=str(result))
+        else:
+            entry.update(ok=True, **result)
+        out.append(entry)
+    return {"results": out, "stats": stats.to_dict()}
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/conversation/process/stream")
+async def process_turn_stream(body: ProcessTurnBody) -> StreamingResponse:
+    """
+    Streaming STEP Z (Server-Sent Events). Emits one `field` event per JSON field as soon as
+    the model has written it (english_translation first), then a `done` event with the same
+    payload as /api/conversation/process. Failures after the stream starts arrive as `error`.
+    """
+    session_id = body.session_id
+    other_person_said_local = body.other_person_said_local
+    with metrics.stage("session_lookup"):
+        data = await sessions.get_async(session_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    with metrics.stage("context"):
+        context = contexts.get(session_id, data)
+    ctx, comm = context.user_context, context.communicator
+    with metrics.stage("memory"):
+        history, summary = memory.prompt_context(data)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in comm.stream_other_person_speech(
+                other_person_said_local, conversation_history_english=history, conversation_summary=summary
+            ):
+                if event[0] == "field":
+                    yield _sse("field", {"field": event[1], "value": event[2]})
+                    continue
+                _, english_translation, suggested = event
+                await sessions.update_async(session_id, lambda d: d.update(last_other_said=english_translation))
+                value_event = value_tracker.score_interaction(ctx, other_person_said_local, suggested)
+                yield _sse("done", {
+                    "other_person_said_english": english_translation,
+                    "suggested_response": suggested.model_dump(),
+                    "value_event": value_event,
+                })
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/conversation/confirm")
-def confirm_user_said(body: ConfirmBody) -> dict:
+async def confirm_user_said(body: ConfirmBody) -> dict:
     """
     After user attempts to say the suggested phrase, optionally add to history
     and check for end phrase (e.g. Au revoir).
     """
     session_id = body.session_id
     user_said = body.user_said
-    if session_id not in sessions:
+
+    def add_turn(d: dict[str, Any]) -> None:
+        memory.add_turn(d, f"Other: {d.get('last_other_said', '')} | You: {user_said}")
+
+    # One read-modify-write, so a /process finishing meanwhile cannot drop this turn
+    with metrics.stage("session_write"):
+        data = await sessions.update_async(session_id, add_turn)
+    if data is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    data = sessions[session_id]
-    history = data.get("conversation_history_english") or []
-    last_other = data.get("last_other_said", "")
-    history.append(f"Other: {last_other} | You: {user_said}")
-    data["conversation_history_english"] = history
-    ended = detect_end_phrase(user_said, data["user_context"].get("target_language", "French"))
+    if memory.needs_summary(data):
+        memory.schedule_summary(session_id, sessions, summarize_conversation_async)
+    with metrics.stage("end_phrase"):
+        ended = await detect_end_phrase_async(user_said, data["user_context"].get("target_language", "French"))
     return {"conversation_ended": ended}
 
 
 @app.get("/api/session/{session_id}")
 def get_session(session_id: str) -> dict:
-    if session_id not in sessions:
+    data = sessions.get(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return sessions[session_id]
+    return data
+
+
+@app.get("/api/sessions/stats")
+def session_stats() -> dict[str, Any]:
+    """Session store occupancy and eviction counters, plus compiled per-session contexts."""
+    return {**sessions.stats(), "compiled_contexts": contexts.stats()}
+
+
+@app.get("/api/models")
+def model_health() -> dict[str, Any]:
+    """Model router state: preferred model, routing order, per-model latency/error/circuit, hedging."""
+    policy = get_hedge_policy()
+    return {**get_model_router().snapshot(), "hedging": policy.stats() if policy is not None else {"enabled": False}}
+
+
+@app.get("/api/cache")
+def cache_stats() -> dict[str, Any]:
+    """Response cache occupancy and hit/miss counters, single-flight coalescing and phrasebook hits."""
+    cache = get_response_cache()
+    stats = cache.stats() if cache is not None else {"enabled": False}
+    phrasebook = get_phrasebook()
+    return {
+        **stats,
+        "single_flight": get_single_flight().stats(),
+        "phrasebook": phrasebook.stats() if phrasebook is not None else {"enabled": False},
+    }
 
 
 @app.get("/api/dashboard")
@@ -194,22 +441,50 @@ def value_events(limit: int = 50) -> dict[str, Any]:
     return {"events": value_tracker.get_recent_events(limit=limit)}
 
 
+@app.get("/api/value/history")
+def value_history(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    event_type: Optional[str] = None,
+    limit: int = 1000,
+) -> dict[str, Any]:
+    """Paid.ai billable events with since <= timestamp < until (ISO 8601), newest first."""
+    try:
+        events = value_tracker.get_history(since=since, until=until, event_type=event_type, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"events": events}
+
+
+@app.get("/api/value/windows")
+def value_windows(granularity: str = "minute", limit: int = 60) -> dict[str, Any]:
+    """Paid.ai tumbling rollups (newest first), per minute or per hour, with breakdowns."""
+    try:
+        windows = value_tracker.get_windows(granularity=granularity, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"granularity": granularity, "windows": windows}
+
+
 @app.websocket("/ws/translate")
 async def websocket_translate(websocket: WebSocket) -> None:
     """
-    Step A: Expect initial JSON with user context (destination, occasion, slang_level, etc.).
+    Step A: Expect initial JSON with user context (destination, occasion, slang_level, etc.),
+    or {"resume_token": ...} to reattach to a stream parked after a dropped connection.
     Step B: Open Gemini Live session with system prompt from context.
     Step C: Concurrent loops: (1) receive PCM from client -> Gemini, (2) receive from Gemini -> client (audio binary, tool calls JSON).
     ValueTracker logs an event on each completed turn.
+    On disconnect the stream is parked for LIVE_RESUME_GRACE_SECONDS instead of closed;
+    {"type": "end"} from the client closes it for good.
     """
     await websocket.accept()
-    context: Optional[dict[str, Any]] = None
-    audio_in: asyncio.Queue[bytes] = asyncio.Queue()
-    audio_out: asyncio.Queue[bytes] = asyncio.Queue()
-    tool_out: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-    live_tasks: list[asyncio.Task] = []
+    settings = get_settings()
+    stream = LiveStream(settings, get_ws_registry())
+    client_gone = False
+    ended = False
 
     def on_turn(turn_index: int, payload: dict[str, Any]) -> None:
+        context = stream.context
         value_tracker.record_step_z(
             conversation_turn_index=turn_index,
             english_translation=payload.get("english_translation", ""),
@@ -219,65 +494,149 @@ async def websocket_translate(websocket: WebSocket) -> None:
             slang_level=context.get("slang_level") if context else None,
         )
 
+    async def flow_control() -> None:
+        """slow_down policy: ask the client to send less while audio_in is filling up."""
+        ratio = stream.audio_in.fill_ratio()
+        if not stream.slowed and ratio >= settings.ws_slow_down_high_watermark:
+            stream.slowed = True
+        elif stream.slowed and ratio <= settings.ws_slow_down_low_watermark:
+            stream.slowed = False
+        else:
+            return
+        action = "slow_down" if stream.slowed else "resume"
+        stream.registry.record_flow(stream.conn_id, action)
+        await stream.tool_out.put({"type": "flow", "action": action, "queue": "audio_in", "depth": stream.audio_in.qsize()})
+
+    async def start_live(live: LiveStream, context: dict[str, Any]) -> None:
+        # Use the connection pre-warmed for this REST session when there is one (else cold connect)
+        warm = await live_sessions.claim(context.get("session_id"), context)
+        await run_live_session(
+            context,
+            live.audio_in,
+            live.audio_out,
+            live.tool_out,
+            turn_callback=on_turn,
+            vad=live.vad,
+            warm=warm,
+        )
+
+    async def attach(data: dict[str, Any]) -> None:
+        """First text message: reattach to a parked stream, or start a new Live session."""
+        nonlocal stream
+        resumed = parked_streams.resume(data.get("resume_token")) if settings.live_resume_enabled else None
+        if resumed is not None:
+            fresh, stream = stream, resumed
+            await fresh.close()
+            stale = stream.drop_stale_audio()
+            # The new socket starts out assuming PCM: honour the codec it asks for (audio is
+            # encoded as it is sent, so buffered chunks follow) and announce it either way
+            codec = stream.set_codec(data["downlink_codec"]) if data.get("downlink_codec") else stream.downlink.announcement()
+            # Before anything buffered in tool_out, which the writer picks up once woken
+            await websocket.send_text(json.dumps(codec))
+            await websocket.send_text(json.dumps({
+                "type": "session",
+                "resumed": True,
+                "resume_token": stream.token,
+                "missed": stream.tool_out.qsize(),
+                "stale_audio_dropped": stale,
+            }))
+            if stream.slowed:
+                stream.slowed = False
+                await stream.tool_out.put({"type": "flow", "action": "resume", "queue": "audio_in", "depth": 0})
+            fresh.outbound.set()
+            stream.outbound.set()
+            return
+        stream.context = data
+        if data.get("downlink_codec"):
+            await stream.tool_out.put(stream.set_codec(data["downlink_codec"]))
+        if settings.live_resume_enabled:
+            stream.token = parked_streams.new_token()
+            await stream.tool_out.put({
+                "type": "session",
+                "resumed": False,
+                "resume_token": stream.token,
+                "grace_seconds": parked_streams.grace_seconds,
+            })
+        stream.task = asyncio.create_task(start_live(stream, data))
+
     async def receive_from_client() -> None:
-        nonlocal context
+        nonlocal client_gone, ended
         try:
             while True:
                 msg = await websocket.receive()
+                if msg.get("type") == "websocket.disconnect":
+                    break
                 if "text" in msg and msg["text"]:
+                    ws_counters.record("in", "text", len(msg["text"]))
                     data = json.loads(msg["text"])
-                    if context is None:
-                        context = data
-                        t = asyncio.create_task(
-                            run_live_session(
-                                context,
-                                audio_in,
-                                audio_out,
-                                tool_out,
-                                turn_callback=on_turn,
-                            )
-                        )
-                        live_tasks.append(t)
+                    if data.get("type") == "end":
+                        ended = True
+                        break
+                    if stream.context is None:
+                        await attach(data)
                     continue
                 if "bytes" in msg and msg["bytes"]:
-                    await audio_in.put(msg["bytes"])
+                    ws_counters.record("in", "binary", len(msg["bytes"]))
+                    # Regroup fragments into whole AUDIO_FRAME_MS frames; "block" waits here, so we
+                    # stop reading the socket until Gemini catches up
+                    stream.framer.write(msg["bytes"])
+                    frames = stream.framer.take()
+                    if frames:
+                        await stream.audio_in.put(frames)
+                        if stream.audio_in.policy == "slow_down":
+                            await flow_control()
         except WebSocketDisconnect:
             pass
         except Exception:
             pass
         finally:
-            await audio_in.put(None)
-
-    async def send_tools_to_client() -> None:
-        try:
-            while True:
-                tool_payload = await tool_out.get()
-                await websocket.send_text(json.dumps(tool_payload))
-        except (WebSocketDisconnect, Exception):
-            pass
+            client_gone = True
+            stream.outbound.set()
 
-    async def send_audio_to_client() -> None:
+    async def send_to_client() -> None:
         try:
-            while True:
-                audio_chunk = await audio_out.get()
-                await websocket.send_bytes(audio_chunk)
+            while not client_gone:
+                if not stream.tool_out.empty():
+                    text = json.dumps(stream.tool_out.get_nowait())
+                    await websocket.send_text(text)
+                    ws_counters.record("out", "text", len(text))
+                elif not stream.audio_out.empty():
+                    data = stream.downlink.encode(stream.audio_out.get_nowait())
+                    await websocket.send_bytes(data)
+                    ws_counters.record("out", "binary", len(data))
+                else:
+                    outbound = stream.outbound
+                    outbound.clear()
+                    await outbound.wait()
         except (WebSocketDisconnect, Exception):
             pass
 
     try:
         await asyncio.gather(
             receive_from_client(),
-            send_tools_to_client(),
-            send_audio_to_client(),
+            send_to_client(),
         )
     finally:
-        for t in live_tasks:
-            if not t.done():
-                t.cancel()
-                try:
-                    await t
-                except asyncio.CancelledError:
-                    pass
+        # Keep the Live session running for a reconnect unless the client said it was done
+        if ended or not settings.live_resume_enabled or not parked_streams.park(stream):
+            stream.end_input()
+            await stream.close()
+
+
+@app.get("/api/ws/stats")
+def ws_stats() -> dict[str, Any]:
+    """Per-stream /ws/translate queue depth, high-water marks, drops and flow signals, plus Live pre-warming and parked streams."""
+    return {
+        **get_ws_registry().stats(),
+        "live_sessions": live_sessions.stats(),
+        "resumable": parked_streams.stats(),
+    }
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus text format: stage / request / model latency histograms, WebSocket counters, gauges."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/api/health")
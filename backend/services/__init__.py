@@ -4,6 +4,12 @@ from .gemini_client import (
     get_phonetic_spelling,
     suggest_response,
     detect_end_phrase,
+    translate_to_english_async,
+    translate_to_local_async,
+    get_phonetic_spelling_async,
+    suggest_response_async,
+    suggest_response_stream_async,
+    detect_end_phrase_async,
 )
 
 __all__ = [
@@ -12,4 +18,10 @@ __all__ = [
     "get_phonetic_spelling",
     "suggest_response",
     "detect_end_phrase",
+    "translate_to_english_async",
+    "translate_to_local_async",
+    "get_phonetic_spelling_async",
+    "suggest_response_async",
+    "suggest_response_stream_async",
+    "detect_end_phrase_async",
 ]
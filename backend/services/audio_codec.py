@@ -0,0 +1,84 @@
+"""
+Downlink audio codecs for /ws/translate (Gemini Live output: 24 kHz mono int16 PCM).
+The client picks one with "downlink_codec" in its initial context message:
+  - "pcm":   raw little-endian int16 (default)
+  - "mulaw": G.711 μ-law, one byte per sample (half the bandwidth). Browsers decode it
+             with a 256-entry table, no native codec needed.
+Encoding is a single NumPy table lookup over the whole chunk.
+"""
+from typing import Any, Optional
+
+import numpy as np
+
+CODECS = ("pcm", "mulaw")
+DOWNLINK_SAMPLE_RATE = 24000
+
+_BIAS = 0x84
+_CLIP = 32635
+
+
+def _build_mulaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    x = np.arange(-32768, 32768, dtype=np.int32)
+    sign = np.where(x < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(x), _CLIP) + _BIAS
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    encoded = (~(sign | (exponent << 4) | mantissa)) & 0xFF
+    # Index by the int16 bit pattern read as uint16
+    encode = np.empty(65536, dtype=np.uint8)
+    encode[x.astype(np.uint16)] = encoded.astype(np.uint8)
+
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exp = (u >> 4) & 0x07
+    decoded = (((u & 0x0F) << 3) + _BIAS << exp) - _BIAS
+    decode = np.where(u & 0x80, -decoded, decoded).astype("<i2")
+    return encode, decode
+
+
+_MULAW_ENCODE, _MULAW_DECODE = _build_mulaw_tables()
+
+
+def mulaw_encode(pcm: bytes) -> bytes:
+    """int16 little-endian PCM -> μ-law bytes (a trailing odd byte is ignored)."""
+    samples = np.frombuffer(pcm, dtype="<u2", count=len(pcm) // 2)
+    return _MULAW_ENCODE[samples].tobytes()
+
+
+def mulaw_decode(data: bytes) -> bytes:
+    """μ-law bytes -> int16 little-endian PCM."""
+    return _MULAW_DECODE[np.frombuffer(data, dtype=np.uint8)].tobytes()
+
+
+def negotiate_codec(requested: Optional[str]) -> str:
+    codec = (requested or "pcm").lower()
+    return codec if codec in CODECS else "pcm"
+
+
+class DownlinkEncoder:
+    """Per-connection encoder; counts PCM bytes in vs bytes actually sent."""
+
+    def __init__(self, codec: str = "pcm"):
+        self.codec = negotiate_codec(codec)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.chunks = 0
+
+    def encode(self, pcm: bytes) -> bytes:
+        out = mulaw_encode(pcm) if self.codec == "mulaw" else pcm
+        self.chunks += 1
+        self.bytes_in += len(pcm)
+        self.bytes_out += len(out)
+        return out
+
+    def announcement(self) -> dict[str, Any]:
+        """Control message telling the client how binary frames are encoded."""
+        return {"type": "codec", "downlink": self.codec, "sample_rate": DOWNLINK_SAMPLE_RATE}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "chunks": self.chunks,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "compression_ratio": round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else None,
+        }
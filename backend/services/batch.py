@@ -0,0 +1,105 @@
+"""
+Ordered, deduplicated fan-out for batch endpoints (/api/conversation/batch).
+Items of the same session run one after another in input order, different sessions run
+concurrently under one semaphore, and items with the same dedup key share a single call:
+the first occurrence does the work, later ones await its result. Every waiter depends
+only on an earlier item, so chains never deadlock. Results come back in input order.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchStats:
+    def __init__(self, items: int, max_concurrency: int):
+        self.items = items
+        self.max_concurrency = max_concurrency
+        self.sessions = 0
+        self.calls = 0
+        self.deduplicated = 0
+        self.failed = 0
+        self.peak_concurrency = 0
+        self.elapsed_ms = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "sessions": self.sessions,
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+            "max_concurrency": self.max_concurrency,
+            "peak_concurrency": self.peak_concurrency,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+
+async def run_batch(
+    items: Sequence[T],
+    session_of: Callable[[T], Hashable],
+    key_of: Callable[[T], Optional[Hashable]],
+    call: Callable[[T], Awaitable[Any]],
+    finish: Callable[[T, Any], Awaitable[R]],
+    max_concurrency: int = 8,
+) -> tuple[list[Any], BatchStats]:
+    """
+    call(item) does the expensive, shareable work (at most once per key; key None = never shared);
+    finish(item, value) applies it to the item's own session (always, in per-session order).
+    An exception from either ends up as that item's result; the caller turns it into an error entry.
+    """
+    stats = BatchStats(len(items), max(1, max_concurrency))
+    semaphore = asyncio.Semaphore(stats.max_concurrency)
+    results: list[Any] = [None] * len(items)
+    shared: dict[Hashable, asyncio.Future] = {}
+    chains: dict[Hashable, list[int]] = {}
+    for i, item in enumerate(items):
+        chains.setdefault(session_of(item), []).append(i)
+    stats.sessions = len(chains)
+    running = 0
+
+    async def compute(item: T) -> Any:
+        nonlocal running
+        async with semaphore:
+            running += 1
+            stats.peak_concurrency = max(stats.peak_concurrency, running)
+            stats.calls += 1
+            try:
+                return await call(item)
+            finally:
+                running -= 1
+
+    async def value_for(item: T) -> Any:
+        key = key_of(item)
+        if key is None:
+            return await compute(item)
+        future = shared.get(key)
+        if future is not None:
+            stats.deduplicated += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        shared[key] = future
+        try:
+            value = await compute(item)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it, no "never retrieved" warning
+            raise
+        future.set_result(value)
+        return value
+
+    async def run_chain(indices: list[int]) -> None:
+        for i in indices:
+            item = items[i]
+            try:
+                results[i] = await finish(item, await value_for(item))
+            except Exception as e:
+                stats.failed += 1
+                results[i] = e
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_chain(indices) for indices in chains.values()))
+    stats.elapsed_ms = (time.perf_counter() - start) * 1000
+    return results, stats
@@ -0,0 +1,116 @@
+"""
+Incremental billing aggregates for ValueTracker.
+Running totals plus tumbling per-minute and per-hour rollups (broken down by destination,
+occasion and interaction_type) are updated on every append, so summaries cost O(1)
+and window queries O(windows) instead of re-summing the whole event log.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+
+GRANULARITIES = {"minute": 60, "hour": 3600}
+BREAKDOWNS = ("destination", "occasion", "interaction_type")
+
+
+def _label(value: Any) -> str:
+    if value is None or value == "":
+        return "unknown"
+    if isinstance(value, Enum):
+        return str(value.value)
+    return str(value)
+
+
+class _Totals:
+    __slots__ = ("count", "cost_eur", "complexity")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.cost_eur = 0.0
+        self.complexity = 0
+
+    def add(self, cost_eur: float, complexity: int) -> None:
+        self.count += 1
+        self.cost_eur += cost_eur
+        self.complexity += complexity
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "events": self.count,
+            "cost_eur": round(self.cost_eur, 2),
+            "average_complexity": round(self.complexity / self.count, 2) if self.count else 0.0,
+        }
+
+
+class _Window:
+    __slots__ = ("start", "totals", "breakdowns")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.totals = _Totals()
+        self.breakdowns: dict[str, dict[str, _Totals]] = {name: {} for name in BREAKDOWNS}
+
+    def to_dict(self, seconds: int) -> dict[str, Any]:
+        return {
+            "window_start": datetime.fromtimestamp(self.start, timezone.utc).isoformat(),
+            "window_seconds": seconds,
+            **self.totals.to_dict(),
+            **{
+                f"by_{name}": {label: t.to_dict() for label, t in groups.items()}
+                for name, groups in self.breakdowns.items()
+            },
+        }
+
+
+class BillingAggregates:
+    """Lifetime totals and bounded tumbling windows; retention is per granularity (window count)."""
+
+    def __init__(self, minute_windows: int = 180, hour_windows: int = 168):
+        self.retention = {"minute": max(1, minute_windows), "hour": max(1, hour_windows)}
+        self.totals = _Totals()
+        self._windows: dict[str, OrderedDict[int, _Window]] = {g: OrderedDict() for g in GRANULARITIES}
+        self._lock = threading.Lock()
+
+    def add(self, event: dict[str, Any], epoch_seconds: float) -> None:
+        cost = event.get("estimated_cost_eur", event.get("estimated_value_eur", 0)) or 0
+        complexity = event.get("complexity_score", 0) or 0
+        labels = {name: _label(event.get(name)) for name in BREAKDOWNS}
+        with self._lock:
+            self.totals.add(cost, complexity)
+            for granularity, seconds in GRANULARITIES.items():
+                windows = self._windows[granularity]
+                start = int(epoch_seconds // seconds) * seconds
+                window = windows.get(start)
+                if window is None:
+                    window = windows[start] = _Window(start)
+                    while len(windows) > self.retention[granularity]:
+                        windows.popitem(last=False)
+                window.totals.add(cost, complexity)
+                for name, label in labels.items():
+                    group = window.breakdowns[name].get(label)
+                    if group is None:
+                        group = window.breakdowns[name][label] = _Totals()
+                    group.add(cost, complexity)
+
+    def summary(self) -> tuple[int, float, int]:
+        """(event count, cost sum, complexity sum) over the lifetime of the process."""
+        with self._lock:
+            return self.totals.count, self.totals.cost_eur, self.totals.complexity
+
+    def windows(self, granularity: str = "minute", limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Most recent tumbling windows first."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        seconds = GRANULARITIES[granularity]
+        with self._lock:
+            windows = list(self._windows[granularity].values())
+            if limit is not None:
+                windows = windows[-limit:] if limit > 0 else []
+            return [w.to_dict(seconds) for w in reversed(windows)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.totals = _Totals()
+            for windows in self._windows.values():
+                windows.clear()
@@ -0,0 +1,116 @@
+"""
+Bounded conversation memory for REST sessions.
+A session keeps a fixed window of recent exchanges (conversation_history_english) plus a
+rolling summary of older ones. Exchanges pushed out of the window wait in
+conversation_summary_pending until a background task folds them into the summary, so the
+prompt gets a stable token budget however long the conversation runs.
+Token counts are estimates (~4 characters per token).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from backend.config import get_settings
+from backend.services.session_store import SessionStore
+
+Summarizer = Callable[[str, list[str], int], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4 if text else 0
+
+
+def _trim_to_tokens(text: str, max_tokens: int, keep_tail: bool = True) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return "…" + text[-(max_chars - 1):] if keep_tail else text[: max_chars - 1] + "…"
+
+
+class ConversationMemory:
+    """Operates in place on session dicts; the caller persists them with SessionStore.set()."""
+
+    def __init__(self, window_turns: int = 6, summary_max_tokens: int = 200, summary_batch_turns: int = 3):
+        self.window_turns = max(1, window_turns)
+        self.summary_max_tokens = max(16, summary_max_tokens)
+        self.summary_batch_turns = max(1, summary_batch_turns)
+        self._in_flight: set[str] = set()
+
+    def add_turn(self, data: dict[str, Any], turn: str) -> None:
+        history = data.get("conversation_history_english") or []
+        history.append(turn)
+        overflow = history[: max(0, len(history) - self.window_turns)]
+        data["conversation_history_english"] = history[len(overflow):]
+        if overflow:
+            data.setdefault("conversation_summary_pending", []).extend(overflow)
+        tokens = data.setdefault("conversation_tokens", {"turns": 0, "raw_history_tokens": 0})
+        tokens["turns"] += 1
+        tokens["raw_history_tokens"] += estimate_tokens(turn)
+        self._update_prompt_tokens(data)
+
+    def prompt_context(self, data: dict[str, Any]) -> tuple[list[str], str]:
+        """(recent window, summary of everything older) for suggest_response."""
+        history = data.get("conversation_history_english") or []
+        summary = data.get("conversation_summary") or ""
+        pending = data.get("conversation_summary_pending") or []
+        if pending:
+            # Not folded in yet: append verbatim, trimmed so the budget still holds
+            summary = _trim_to_tokens(" | ".join(filter(None, [summary, *pending])), self.summary_max_tokens)
+        return history, summary
+
+    def _update_prompt_tokens(self, data: dict[str, Any]) -> None:
+        history, summary = self.prompt_context(data)
+        tokens = data["conversation_tokens"]
+        tokens["prompt_history_tokens"] = sum(estimate_tokens(t) for t in history) + estimate_tokens(summary)
+        tokens["saved_tokens"] = max(0, tokens["raw_history_tokens"] - tokens["prompt_history_tokens"])
+
+    def needs_summary(self, data: dict[str, Any]) -> bool:
+        return len(data.get("conversation_summary_pending") or []) >= self.summary_batch_turns
+
+    def schedule_summary(self, session_id: str, store: SessionStore, summarizer: Summarizer) -> None:
+        """Fold pending exchanges into the summary in a background task (one per session at a time)."""
+        if session_id in self._in_flight:
+            return
+        self._in_flight.add(session_id)
+        asyncio.create_task(self._summarize(session_id, store, summarizer))
+
+    async def _summarize(self, session_id: str, store: SessionStore, summarizer: Summarizer) -> None:
+        try:
+            data = await store.get_async(session_id)
+            if data is None:
+                return
+            pending = list(data.get("conversation_summary_pending") or [])
+            if not pending:
+                return
+            previous = data.get("conversation_summary") or ""
+            try:
+                summary = await summarizer(previous, pending, self.summary_max_tokens)
+            except Exception:
+                summary = ""
+            if not summary.strip():
+                # Model unavailable: keep the most recent context that fits the budget
+                summary = " | ".join(filter(None, [previous, *pending]))
+            # Applied to the current session: it may have moved on while the model was summarising
+            def fold(data: dict[str, Any]) -> None:
+                data["conversation_summary"] = _trim_to_tokens(summary.strip(), self.summary_max_tokens)
+                data["conversation_summary_pending"] = (data.get("conversation_summary_pending") or [])[len(pending):]
+                if "conversation_tokens" in data:
+                    self._update_prompt_tokens(data)
+
+            await store.update_async(session_id, fold)
+        finally:
+            self._in_flight.discard(session_id)
+
+
+_memory: Optional[ConversationMemory] = None
+
+
+def get_conversation_memory() -> ConversationMemory:
+    global _memory
+    if _memory is None:
+        settings = get_settings()
+        _memory = ConversationMemory(
+            window_turns=settings.conversation_window_turns,
+            summary_max_tokens=settings.conversation_summary_max_tokens,
+            summary_batch_turns=settings.conversation_summary_batch_turns,
+        )
+    return _memory
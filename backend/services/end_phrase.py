@@ -0,0 +1,185 @@
+"""
+Local end-of-conversation detector used in front of the LLM fallback in detect_end_phrase.
+Per-language goodbye lexicons (French, Moroccan Darija in Arabic script / Latin / Arabizi,
+Bulgarian in Cyrillic / Latin, plus English) matched on accent- and case-folded text.
+Goodbyes only count when they make up the last clause of the utterance (after optional
+fillers such as "merci" or "ok"): "Je veux acheter un bye" is not a goodbye. Text with no
+lexicon match in a supported language is a confident "no"; only thanks / hi-bye words in
+the closing clause, goodbyes in the wrong place and one-word utterances go to Gemini.
+"""
+import re
+import unicodedata
+from typing import NamedTuple, Optional
+
+# Phrases that end a conversation on their own (written unfolded; folded at import).
+_STRONG = {
+    "en": (
+        "goodbye", "good bye", "bye", "bye bye", "byebye", "see ya", "see you later",
+        "see you soon", "farewell", "take care", "have a nice day", "have a good day",
+        "have a good one", "good night", "catch you later", "so long", "ciao",
+    ),
+    "fr": (
+        "au revoir", "à bientôt", "à plus tard", "à tout à l'heure",
+        "à la prochaine", "bonne journée", "bonne soirée", "bonne nuit", "bonne fin de journée",
+        "bonne continuation", "adieu", "tchao", "salut à plus",
+    ),
+    "ar": (
+        # Latin / Arabizi
+        "bslama", "b'slama", "bsslama", "beslama", "bessalama", "bslamtek", "m3a salama",
+        "m3a slama", "ma3a salama", "maa salama", "ma salama", "tsbah 3la khir", "tsba7 3la khir",
+        "tesbah ala khir", "nchoufek mn b3d", "nchofk mn b3d", "ntla9aw", "nt9aw mn b3d",
+        "lah y3awnek bslama",
+        # Arabic script
+        "بسلامة", "بالسلامة", "مع السلامة", "تصبح على خير", "تصبحي على خير", "نشوفك من بعد",
+        "نتلاقاو", "الى اللقاء",
+    ),
+    "bg": (
+        # Cyrillic
+        "довиждане", "чао", "всичко хубаво", "всичко най-хубаво", "лека нощ", "до скоро",
+        "до утре", "приятен ден", "приятна вечер", "сбогом", "до нови срещи",
+        # Latin
+        "dovizhdane", "dovijdane", "dovizdane", "chao", "vsichko hubavo", "vsichko naj-hubavo",
+        "leka nosht", "do skoro", "do utre", "priyaten den", "prijaten den", "priatna vecher",
+        "sbogom", "do novi sreshti",
+    ),
+}
+
+# Phrases that often close a conversation but not always (thanks, hi/bye words, and
+# goodbyes that fold into everyday words: "à plus" / "a plus", "à demain", "see you").
+_WEAK = {
+    "en": ("thanks", "thank you", "cheers", "later", "that's all", "that is all", "see you"),
+    "fr": ("merci", "merci beaucoup", "salut", "c'est tout", "ça sera tout", "bon", "à plus", "à demain"),
+    "ar": (
+        "shukran", "choukran", "chokran", "baraka lahu fik", "barak allahu fik", "allah ysahel",
+        "yallah", "safi", "شكرا", "الله يسهل", "يالاه", "صافي",
+    ),
+    "bg": (
+        "благодаря", "мерси", "хайде", "това е всичко",
+        "blagodarya", "blagodaria", "mersi", "hajde", "haide", "tova e vsichko",
+    ),
+}
+
+# May precede a goodbye in the closing clause ("ok bye", "merci beaucoup au revoir"),
+# together with the weak phrases
+_FILLERS = (
+    "ok", "okay", "alright", "well", "right", "so", "and", "yes", "alors", "allez", "eh bien",
+    "bon ben", "donc", "et", "oui", "voila", "wakha", "iyeh", "safi", "ah", "oh", "ами", "добре",
+    "да", "и", "ami", "dobre", "da", "i",
+)
+
+# Clause boundaries in the raw text (fold_text drops punctuation); hyphens stay inside words
+_CLAUSE_SPLIT = re.compile(r"[,.;:!?…¡¿،؟؛]+")
+
+# May follow a goodbye at the end of an utterance ("au revoir monsieur", "مع السلامة خويا")
+_VOCATIVES = (
+    "monsieur", "madame", "mademoiselle", "mon ami", "les amis", "tout le monde", "everyone",
+    "my friend", "mate", "sir", "khoya", "khouya", "sahbi", "habibi", "خويا", "صاحبي", "حبيبي",
+    "приятелю", "priyatelyu",
+)
+
+_LANGUAGE_KEYS = (
+    ("darija", "ar"), ("arabic", "ar"), ("bulgarian", "bg"), ("french", "fr"), ("english", "en"),
+)
+
+_ARABIC_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي", "ـ": None})
+
+
+def fold_text(text: str) -> str:
+    """Accent-, case- and punctuation-fold text (keeps Arabizi digits, Arabic and Cyrillic letters)."""
+    out: list[str] = []
+    base = ""
+    for ch in unicodedata.normalize("NFKD", text or ""):
+        if unicodedata.combining(ch):
+            # Drop Latin accents and Arabic harakat, but keep Cyrillic marks (й, ё) intact
+            if "\u0400" <= base <= "\u04ff":
+                out.append(ch)
+            continue
+        base = ch
+        out.append(ch)
+    t = unicodedata.normalize("NFC", "".join(out)).casefold().translate(_ARABIC_FOLD)
+    t = re.sub(r"['’`ʼ]", "", t)
+    t = re.sub(r"[^\w]+", " ", t)
+    return " ".join(t.split())
+
+
+def _alternation(phrases: tuple[str, ...]) -> str:
+    folded = sorted({fold_text(p) for p in phrases if fold_text(p)}, key=len, reverse=True)
+    return "(?:" + "|".join(re.escape(p) for p in folded) + ")"
+
+
+def _compile(phrases: tuple[str, ...]) -> re.Pattern:
+    return re.compile(r"(?<!\w)" + _alternation(phrases) + r"(?!\w)")
+
+
+def _compile_closing(phrases: tuple[str, ...], fillers: tuple[str, ...]) -> re.Pattern:
+    """The phrase is a whole clause, optionally after fillers and before a form of address."""
+    return re.compile(
+        "^(?:" + _alternation(fillers) + " )*(" + _alternation(phrases) + ")(?: " + _alternation(_VOCATIVES) + ")?$"
+    )
+
+
+_STRONG_RE = {lang: _compile(phrases) for lang, phrases in _STRONG.items()}
+_CLOSING_RE = {
+    lang: _compile_closing(phrases, _FILLERS + _WEAK[lang]) for lang, phrases in _STRONG.items()
+}
+_WEAK_RE = {lang: _compile(phrases) for lang, phrases in _WEAK.items()}
+
+
+def _closing_clause(spoken: str) -> str:
+    """Folded last clause of the utterance ("Merci, à bientôt !" -> "a bientot")."""
+    for clause in reversed(_CLAUSE_SPLIT.split(spoken or "")):
+        folded = fold_text(clause)
+        if folded:
+            return folded
+    return ""
+
+
+class EndPhraseVerdict(NamedTuple):
+    """is_end is None when the input is ambiguous and should go to the LLM."""
+    is_end: Optional[bool]
+    confidence: float
+    matched: Optional[str] = None
+
+
+def language_key(local_language: str) -> Optional[str]:
+    lang = (local_language or "").lower()
+    for needle, key in _LANGUAGE_KEYS:
+        if needle in lang:
+            return key
+    if lang in ("fr", "ar", "bg", "en"):
+        return lang
+    return None
+
+
+def classify_end_phrase(spoken: str, local_language: str = "French") -> EndPhraseVerdict:
+    """
+    Classify a confirm locally.
+    - Closing clause is a goodbye (any lexicon): end, high confidence (lower after a long sentence).
+    - A goodbye elsewhere ("goodbye and then I went home", "je veux acheter un bye"): ambiguous.
+    - Thanks / hi-bye style words in the closing clause: ambiguous (leaning "no" in longer sentences).
+    - One word with no match, or an unsupported language: ambiguous.
+    - Otherwise: not an end, confident.
+    """
+    folded = fold_text(spoken)
+    if not folded:
+        return EndPhraseVerdict(False, 0.9)
+    words = len(folded.split())
+    closing = _closing_clause(spoken)
+    for lang in _CLOSING_RE:
+        m = _CLOSING_RE[lang].search(closing)
+        if m:
+            return EndPhraseVerdict(True, 0.95 if words <= 12 else 0.8, m.group(1))
+    for lang in _STRONG_RE:
+        m = _STRONG_RE[lang].search(folded)
+        if m:
+            return EndPhraseVerdict(None, 0.5, m.group(0))
+    for lang in _WEAK_RE:
+        m = _WEAK_RE[lang].search(closing)
+        if m:
+            # A bare "merci" / "salut" is a coin flip; inside a longer sentence it leans "no"
+            if words <= 3:
+                return EndPhraseVerdict(None, 0.5, m.group(0))
+            return EndPhraseVerdict(False, 0.7, m.group(0))
+    if language_key(local_language) is None or words <= 1:
+        return EndPhraseVerdict(None, 0.5)
+    return EndPhraseVerdict(False, 0.9)
@@ -0,0 +1,291 @@
+"""
+Durable append-only log for ValueTracker billable events.
+Events are written as JSON lines into numbered segment files by a background thread
+that group-commits (one write + fsync per batch), so append() never blocks the request
+path. On startup the segments are replayed; old segments are merged and trimmed by
+compact(); history reads go through memory-mapped segments.
+"""
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from backend.services.event_store import timestamp_to_micros
+
+_SEGMENT_PREFIX = "events-"
+_SEGMENT_SUFFIX = ".jsonl"
+_STOP = object()
+
+
+def _segment_name(seq: int) -> str:
+    return f"{_SEGMENT_PREFIX}{seq:08d}{_SEGMENT_SUFFIX}"
+
+
+def _segment_seq(name: str) -> Optional[int]:
+    if not (name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)):
+        return None
+    try:
+        return int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:  # merged away by a concurrent compact()
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
+        return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+
+class EventLog:
+    """
+    Segmented JSONL event log with a batching writer thread.
+    Counters: `written` events are on disk, `appended` includes those still queued.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        max_segments: int = 64,
+        flush_interval: float = 0.05,
+        batch_max: int = 1024,
+        fsync: bool = True,
+    ):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max(2, max_segments)
+        self.flush_interval = flush_interval
+        self.batch_max = max(1, batch_max)
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._segments_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.appended = 0
+        self.batches = 0
+        self.compactions = 0
+
+    # --- write path -------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._thread.start()
+
+    def append(self, event: dict[str, Any]) -> None:
+        """Queue an event for the writer thread (never blocks on I/O)."""
+        self.appended += 1
+        self._queue.put(event)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush everything queued so far and stop the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def mark_replayed(self, count: int) -> None:
+        """Record events already on disk (after replay) so pending/skip arithmetic lines up."""
+        self.written += count
+        self.appended += count
+
+    @property
+    def pending(self) -> int:
+        return self.appended - self.written
+
+    def _run(self) -> None:
+        with self._segments_lock:
+            seq = max(self._segment_seqs(), default=0) or 1
+        f = open(os.path.join(self.directory, _segment_name(seq)), "ab")
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_max and batch[-1] is not _STOP:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is _STOP
+                events = [e for e in batch if e is not _STOP]
+                if events:
+                    f.write(b"".join(
+                        json.dumps(e, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+                        for e in events
+                    ))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                    self.written += len(events)
+                    self.batches += 1
+                    if f.tell() >= self.segment_max_bytes:
+                        f.close()
+                        seq += 1
+                        f = open(os.path.join(self.directory, _segment_name(seq)), "ab")
+                        self.compact()
+                if stop:
+                    break
+        finally:
+            f.close()
+
+    # --- segments / compaction -------------------------------------------
+
+    def _segment_seqs(self) -> list[int]:
+        seqs = [_segment_seq(name) for name in os.listdir(self.directory)]
+        return sorted(s for s in seqs if s is not None)
+
+    def _segment_paths(self) -> list[str]:
+        return [os.path.join(self.directory, _segment_name(s)) for s in self._segment_seqs()]
+
+    def compact(self) -> None:
+        """
+        Merge runs of small sealed segments into one file, then drop the oldest
+        segments beyond max_segments. The newest (active) segment is never touched.
+        """
+        with self._segments_lock:
+            sealed = self._segment_paths()[:-1]
+            merged: list[list[str]] = []
+            run: list[str] = []
+            run_bytes = 0
+            for path in sealed:
+                size = os.path.getsize(path)
+                if run and run_bytes + size > self.segment_max_bytes:
+                    merged.append(run)
+                    run, run_bytes = [], 0
+                run.append(path)
+                run_bytes += size
+            if run:
+                merged.append(run)
+            for group in merged:
+                if len(group) < 2:
+                    continue
+                tmp = group[0] + ".compact"
+                with open(tmp, "wb") as out:
+                    for path in group:
+                        with open(path, "rb") as src:
+                            out.write(src.read())
+                    out.flush()
+                    if self.fsync:
+                        os.fsync(out.fileno())
+                os.replace(tmp, group[0])
+                for path in group[1:]:
+                    os.remove(path)
+            paths = self._segment_paths()
+            for path in paths[: max(0, len(paths) - self.max_segments)]:
+                os.remove(path)
+            self.compactions += 1
+
+    # --- read path --------------------------------------------------------
+
+    def replay(self) -> Iterator[dict[str, Any]]:
+        """All logged events, oldest first (used to rebuild in-memory state on startup)."""
+        with self._segments_lock:
+            paths = self._segment_paths()
+        for path in paths:
+            mm = _map(path)
+            if mm is None:
+                continue
+            try:
+                pos, end = 0, mm.rfind(b"\n") + 1
+                while pos < end:
+                    nl = mm.find(b"\n", pos, end)
+                    line = mm[pos:nl]
+                    pos = nl + 1
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            finally:
+                mm.close()
+
+    def _iter_newest_first(self) -> Iterator[dict[str, Any]]:
+        with self._segments_lock:
+            paths = self._segment_paths()
+        for path in reversed(paths):
+            mm = _map(path)
+            if mm is None:
+                continue
+            try:
+                # Ignore a trailing line the writer has not finished yet
+                end = mm.rfind(b"\n")
+                while end > 0:
+                    start = mm.rfind(b"\n", 0, end) + 1
+                    line = mm[start:end]
+                    end = start - 1
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            finally:
+                mm.close()
+
+    def recent(self, limit: int, skip: int = 0) -> list[dict[str, Any]]:
+        """Newest logged events first, after skipping the `skip` newest."""
+        out: list[dict[str, Any]] = []
+        if limit <= 0:
+            return out
+        for i, event in enumerate(self._iter_newest_first()):
+            if i < skip:
+                continue
+            out.append(event)
+            if len(out) >= limit:
+                break
+        return out
+
+    def history(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        event_type: Optional[str] = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Events with since <= timestamp < until (ISO 8601), newest first."""
+        lo = timestamp_to_micros(since) if since else None
+        hi = timestamp_to_micros(until) if until else None
+        out: list[dict[str, Any]] = []
+        for event in self._iter_newest_first():
+            try:
+                ts = timestamp_to_micros(event.get("timestamp") or "")
+            except ValueError:
+                continue
+            if hi is not None and ts >= hi:
+                continue
+            if lo is not None and ts < lo:
+                break
+            if event_type and event.get("event_type") != event_type:
+                continue
+            out.append(event)
+            if len(out) >= limit:
+                break
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        with self._segments_lock:
+            paths = self._segment_paths()
+            disk_bytes = sum(os.path.getsize(p) for p in paths)
+        return {
+            "directory": self.directory,
+            "segments": len(paths),
+            "disk_bytes": disk_bytes,
+            "written": self.written,
+            "pending": self.pending,
+            "batches": self.batches,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,194 @@
+"""
+Compact columnar store for ValueTracker billable events.
+Each field lives in its own array.array column (numbers, epoch-microsecond timestamps,
+interned category codes), bounded by a retention cap and overwritten ring-style.
+recent() rebuilds plain dicts with the original keys, key order and values, so the
+/api/value/events and /api/dashboard payloads are unchanged.
+"""
+import math
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_INT_NONE = -(2 ** 31)
+_SMALL_NONE = -128
+
+# field -> column kind. Anything else an event carries goes to a sparse side table.
+_COLUMNS = {
+    "event_type": "category",
+    "complexity_score": "small",
+    "conversation_turn_index": "int",
+    "slang_intensity_score": "small",
+    "idiom_detected": "bool",
+    "estimated_cost_eur": "float",
+    "estimated_value_eur": "float",
+    "interaction_type": "category",
+    "timestamp": "timestamp",
+    "destination": "category",
+    "occasion": "category",
+}
+_TYPECODES = {"category": "I", "small": "b", "int": "i", "bool": "b", "float": "d", "timestamp": "q"}
+
+
+class _Interner:
+    """Category strings <-> small integer codes (code 0 is None)."""
+
+    def __init__(self) -> None:
+        self.values: list[Optional[str]] = [None]
+        self.codes: dict[str, int] = {}
+
+    def code(self, value: Any) -> int:
+        if value is None:
+            return 0
+        if isinstance(value, Enum):
+            value = value.value
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def timestamp_to_micros(timestamp: str) -> int:
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def micros_to_timestamp(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+class ColumnarEventStore:
+    """
+    Array-backed ring of events, newest `retention` kept. Thread-safe.
+    Each event remembers its key layout (interned tuple of keys) so dict views
+    reproduce exactly the keys the event was recorded with.
+    """
+
+    def __init__(self, retention: int = 100_000):
+        self.retention = max(1, retention)
+        self._columns = {name: array(_TYPECODES[kind]) for name, kind in _COLUMNS.items()}
+        self._layout = array("I")
+        self._layouts: list[tuple[str, ...]] = []
+        self._layout_codes: dict[tuple[str, ...], int] = {}
+        self._interners = {name: _Interner() for name, kind in _COLUMNS.items() if kind == "category"}
+        self._extras: dict[int, dict[str, Any]] = {}
+        self._next = 0  # slot the next append writes to (once the ring is full)
+        self._size = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, event: dict[str, Any]) -> None:
+        keys = tuple(event)
+        with self._lock:
+            layout = self._layout_codes.get(keys)
+            if layout is None:
+                layout = self._layout_codes[keys] = len(self._layouts)
+                self._layouts.append(keys)
+            values = {name: self._encode(name, kind, event.get(name)) for name, kind in _COLUMNS.items()}
+            extras = {k: v for k, v in event.items() if k not in _COLUMNS}
+
+            if self._size < self.retention:
+                slot = self._size
+                self._layout.append(layout)
+                for name, value in values.items():
+                    self._columns[name].append(value)
+                self._size += 1
+            else:
+                slot = self._next
+                self._layout[slot] = layout
+                for name, value in values.items():
+                    self._columns[name][slot] = value
+                self._extras.pop(slot, None)
+                self._next = (slot + 1) % self.retention
+                self.evicted += 1
+            if extras:
+                self._extras[slot] = extras
+
+    def _encode(self, name: str, kind: str, value: Any) -> Any:
+        if kind == "category":
+            return self._interners[name].code(value)
+        if kind == "float":
+            return math.nan if value is None else float(value)
+        if kind == "timestamp":
+            return timestamp_to_micros(value) if value else _INT_NONE
+        if kind == "bool":
+            return _SMALL_NONE if value is None else int(bool(value))
+        if kind == "small":
+            return _SMALL_NONE if value is None else max(-127, min(127, int(value)))
+        return _INT_NONE if value is None else int(value)
+
+    def _decode(self, name: str, slot: int) -> Any:
+        kind = _COLUMNS[name]
+        raw = self._columns[name][slot]
+        if kind == "category":
+            return self._interners[name].values[raw]
+        if kind == "float":
+            return None if math.isnan(raw) else raw
+        if kind == "timestamp":
+            return None if raw == _INT_NONE else micros_to_timestamp(raw)
+        if kind == "bool":
+            return None if raw == _SMALL_NONE else bool(raw)
+        if kind == "small":
+            return None if raw == _SMALL_NONE else raw
+        return None if raw == _INT_NONE else raw
+
+    def _view(self, slot: int) -> dict[str, Any]:
+        extras = self._extras.get(slot, {})
+        return {
+            key: (self._decode(key, slot) if key in _COLUMNS else extras.get(key))
+            for key in self._layouts[self._layout[slot]]
+        }
+
+    def _slots_oldest_first(self) -> Iterator[int]:
+        start = self._next if self._size == self.retention else 0
+        for i in range(self._size):
+            yield (start + i) % self.retention
+
+    def recent(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Most recent events as dicts, newest first."""
+        with self._lock:
+            if limit <= 0 or not self._size:
+                return []
+            newest = (self._next - 1) % self.retention if self._size == self.retention else self._size - 1
+            n = min(limit, self._size)
+            return [self._view((newest - i) % self.retention) for i in range(n)]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Events oldest first (snapshot taken under the lock)."""
+        with self._lock:
+            views = [self._view(slot) for slot in self._slots_oldest_first()]
+        return iter(views)
+
+    def clear(self) -> None:
+        with self._lock:
+            for column in self._columns.values():
+                del column[:]
+            del self._layout[:]
+            self._extras.clear()
+            self._next = 0
+            self._size = 0
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column buffers."""
+        with self._lock:
+            total = sum(c.buffer_info()[1] * c.itemsize for c in self._columns.values())
+            return total + self._layout.buffer_info()[1] * self._layout.itemsize
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "events": self._size,
+            "retention": self.retention,
+            "evicted": self.evicted,
+            "column_bytes": self.nbytes(),
+        }
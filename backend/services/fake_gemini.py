@@ -0,0 +1,285 @@
+"""
+Local stand-in for the Gemini API (GEMINI_FAKE=true), for benchmarks and load tests
+without spending quota. It implements the slice of genai.Client this backend uses:
+models.generate_content (sync and aio), aio.models.generate_content_stream, caches,
+and aio.live.connect for /ws/translate. Latency is log-normal around
+GEMINI_FAKE_LATENCY_MS, calls fail with GEMINI_FAKE_ERROR_RATE, and streams arrive
+in GEMINI_FAKE_STREAM_CHUNKS pieces. Answers are canned but shaped like the real
+ones (JSON suggestions, YES/NO end phrases, one-line translations).
+"""
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+from backend.config import get_settings
+
+LIVE_OUTPUT_RATE = 24000
+# Bytes of 16 kHz int16 uplink audio after which the fake Live model answers a turn
+# even without audio_stream_end
+_LIVE_TURN_BYTES = 16000 * 2 * 3
+
+
+class FakeGeminiError(Exception):
+    """Injected upstream failure (message mimics a 503 so it is not mistaken for a 404)."""
+
+
+class FakeBehaviour:
+    """Latency distribution, error rate and streaming shape shared by every fake call."""
+
+    def __init__(
+        self,
+        latency_ms: float = 400.0,
+        latency_sigma: float = 0.4,
+        error_rate: float = 0.0,
+        stream_chunks: int = 6,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = max(0.0, latency_ms)
+        self.latency_sigma = max(0.0, latency_sigma)
+        self.error_rate = min(1.0, max(0.0, error_rate))
+        self.stream_chunks = max(1, stream_chunks)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def latency(self) -> float:
+        """One sampled latency in seconds (median latency_ms)."""
+        with self._lock:
+            if self.latency_ms <= 0:
+                return 0.0
+            return self._rng.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+
+    def maybe_fail(self) -> None:
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            raise FakeGeminiError("503 UNAVAILABLE: injected fake Gemini error")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_ms": self.latency_ms,
+            "latency_sigma": self.latency_sigma,
+            "error_rate": self.error_rate,
+        }
+
+
+def _prompt_text(contents: Any) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(_prompt_text(c) for c in contents)
+    parts = getattr(contents, "parts", None)
+    if parts:
+        return "\n".join(getattr(p, "text", "") or "" for p in parts)
+    return str(contents or "")
+
+
+def _last_value(prompt: str, marker: str) -> str:
+    for line in reversed(prompt.splitlines()):
+        if marker in line:
+            return line.split(marker, 1)[1].strip()
+    return ""
+
+
+def fake_answer(contents: Any, config: Any = None) -> str:
+    """A canned answer shaped like what the real model returns for this prompt."""
+    prompt = _prompt_text(contents)
+    wants_json = getattr(config, "response_mime_type", None) == "application/json" or getattr(
+        config, "cached_content", None
+    )
+    if wants_json or "Return ONLY a valid JSON object" in prompt:
+        said = _last_value(prompt, "The other person just said (in local language):") or "Bonjour"
+        return json.dumps({
+            "english_translation": f"(en) {said}",
+            "suggested_english": "Thank you, that sounds great.",
+            "suggested_local": "Merci, ça a l'air super.",
+            "suggested_phonetic": "mair-SEE, sah ah LAIR soo-PAIR",
+        })
+    if "Answer only YES or NO" in prompt:
+        said = _last_value(prompt, "User said:").lower()
+        return "YES" if any(w in said for w in ("bye", "revoir", "ciao", "salut")) else "NO"
+    if "Update the running summary" in prompt:
+        return ("The traveler and a local exchanged greetings and talked about the order. "
+                + _last_value(prompt, "New exchanges:")[:200])
+    if "phonetic spelling" in prompt:
+        return "-".join(_last_value(prompt, "Phrase:").split()) or "bon-ZHOOR"
+    if prompt.startswith("Translate the following"):
+        return f"(translated) {_last_value(prompt, 'Text:')}"
+    return "OK"
+
+
+class _FakeModels:
+    def __init__(self, behaviour: FakeBehaviour):
+        self._b = behaviour
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        time.sleep(self._b.latency())
+        self._b.maybe_fail()
+        return SimpleNamespace(text=fake_answer(contents, config), model=model)
+
+
+class _FakeAsyncModels:
+    def __init__(self, behaviour: FakeBehaviour):
+        self._b = behaviour
+
+    async def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        await asyncio.sleep(self._b.latency())
+        self._b.maybe_fail()
+        return SimpleNamespace(text=fake_answer(contents, config), model=model)
+
+    async def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> AsyncIterator[Any]:
+        # Time to first chunk is a third of the sampled latency; the rest is spread over the chunks
+        total = self._b.latency()
+        await asyncio.sleep(total / 3)
+        self._b.maybe_fail()
+        text = fake_answer(contents, config)
+        n = self._b.stream_chunks
+        step = max(1, -(-len(text) // n))
+        pieces = [text[i:i + step] for i in range(0, len(text), step)]
+
+        async def chunks() -> AsyncIterator[Any]:
+            for i, piece in enumerate(pieces):
+                if i:
+                    await asyncio.sleep(total * 2 / 3 / max(1, len(pieces) - 1))
+                yield SimpleNamespace(text=piece)
+
+        return chunks()
+
+
+class _FakeCaches:
+    def __init__(self) -> None:
+        self._ids = iter(range(1, 1 << 62))
+
+    def create(self, model: str, config: Any = None) -> Any:
+        return SimpleNamespace(name=f"cachedContents/fake-{next(self._ids)}", model=model)
+
+    def delete(self, name: str) -> None:
+        return None
+
+
+class _FakeAsyncCaches(_FakeCaches):
+    async def create(self, model: str, config: Any = None) -> Any:  # type: ignore[override]
+        return super().create(model, config)
+
+    async def delete(self, name: str) -> None:  # type: ignore[override]
+        return None
+
+
+class FakeLiveSession:
+    """
+    Answers each turn (audio_stream_end, or every ~3 s of uplink audio) after one sampled
+    latency with a tool call and a few downlink audio chunks of 24 kHz silence.
+    """
+
+    def __init__(self, behaviour: FakeBehaviour, audio_chunks: int = 4, chunk_ms: int = 40):
+        self._b = behaviour
+        self._turns: asyncio.Queue = asyncio.Queue()
+        self._audio_bytes = 0
+        self._audio_chunk = bytes(LIVE_OUTPUT_RATE * chunk_ms // 1000 * 2)
+        self._audio_chunks = audio_chunks
+        self.closed = False
+        self.turns = 0
+
+    async def send_realtime_input(self, media: Any = None, audio_stream_end: Optional[bool] = None, **_: Any) -> None:
+        if self.closed:
+            raise RuntimeError("fake Live session closed")
+        if media is not None:
+            self._audio_bytes += len(getattr(media, "data", b"") or b"")
+        if audio_stream_end or self._audio_bytes >= _LIVE_TURN_BYTES:
+            self._audio_bytes = 0
+            self._turns.put_nowait(True)
+
+    async def receive(self) -> AsyncIterator[Any]:
+        while not self.closed:
+            end = await self._turns.get()
+            if end is None:
+                return
+            await asyncio.sleep(self._b.latency())
+            self._b.maybe_fail()
+            self.turns += 1
+            yield SimpleNamespace(
+                tool_call=SimpleNamespace(args={
+                    "english_translation": f"(fake turn {self.turns}) Hello, how can I help?",
+                    "local_spelling": "Bonjour, je peux vous aider ?",
+                    "phonetic_spelling": "bon-ZHOOR, zhuh puh voo zay-DAY",
+                }),
+                inline_data=None,
+            )
+            for _ in range(self._audio_chunks):
+                yield SimpleNamespace(tool_call=None, inline_data=SimpleNamespace(data=self._audio_chunk))
+
+    def close(self) -> None:
+        self.closed = True
+        self._turns.put_nowait(None)
+
+
+class _FakeLive:
+    def __init__(self, behaviour: FakeBehaviour):
+        self._b = behaviour
+        self.connections = 0
+
+    @asynccontextmanager
+    async def connect(self, model: str, config: Any = None) -> AsyncIterator[FakeLiveSession]:
+        # Connection setup costs about one call latency
+        await asyncio.sleep(self._b.latency())
+        self._b.maybe_fail()
+        self.connections += 1
+        session = FakeLiveSession(self._b)
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+class FakeGeminiClient:
+    """Drop-in for genai.Client in gemini_client and live_session."""
+
+    def __init__(self, behaviour: Optional[FakeBehaviour] = None):
+        self.behaviour = behaviour or FakeBehaviour()
+        self.models = _FakeModels(self.behaviour)
+        self.caches = _FakeCaches()
+        self.aio = SimpleNamespace(
+            models=_FakeAsyncModels(self.behaviour),
+            caches=_FakeAsyncCaches(),
+            live=_FakeLive(self.behaviour),
+            aclose=self._aclose,
+        )
+
+    async def _aclose(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+_fake_client: Optional[FakeGeminiClient] = None
+_fake_client_lock = threading.Lock()
+
+
+def get_fake_client() -> FakeGeminiClient:
+    """Process-wide fake client (shared by REST and Live calls), configured from GEMINI_FAKE_* settings."""
+    global _fake_client
+    if _fake_client is None:
+        with _fake_client_lock:
+            if _fake_client is None:
+                settings = get_settings()
+                _fake_client = FakeGeminiClient(FakeBehaviour(
+                    latency_ms=settings.gemini_fake_latency_ms,
+                    latency_sigma=settings.gemini_fake_latency_sigma,
+                    error_rate=settings.gemini_fake_error_rate,
+                    stream_chunks=settings.gemini_fake_stream_chunks,
+                    seed=settings.gemini_fake_seed,
+                ))
+    return _fake_client
@@ -1,8 +1,19 @@
 """Gemini API client for translation, suggestions, and agent reasoning.
-Uses the google-genai SDK (Gemini Developer API)."""
+Uses the google-genai SDK (Gemini Developer API).
+
+One process-wide genai.Client is shared by every call, so connections are kept
+alive and reused. The *_async variants go through client.aio and are bounded by
+a concurrency limit (GEMINI_MAX_CONCURRENCY) so async handlers never hold a
+threadpool slot for the model round trip. Identical concurrent cacheable calls
+share one in-flight request (single_flight.py)."""
+import asyncio
+import hashlib
 import json
 import os
-from typing import Optional
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 from google import genai
 from google.genai import types
@@ -12,7 +23,18 @@ try:
 except ImportError:
     ClientError = Exception  # noqa: A001
 
+from backend.config import get_settings
 from backend.models.schemas import UserContext, SuggestedResponse
+from backend.services.end_phrase import classify_end_phrase
+from backend.services.fake_gemini import get_fake_client
+from backend.services.hedging import get_hedge_policy, race_hedged
+from backend.services.metrics import MODEL_CALL_SECONDS, get_metrics
+from backend.services.json_stream import IncrementalJSONFields
+from backend.services.model_router import ModelRouter
+from backend.services.prompt_prefix import SessionPrompt
+from backend.services.response_cache import cache_key, context_fingerprint, get_response_cache
+from backend.services.single_flight import get_single_flight
+from backend.services.transliterate import get_transliterator
 
 # Model IDs to try (Gemini Developer API). Order: prefer newer, then common fallbacks.
 GEMINI_MODELS = (
@@ -25,6 +47,16 @@ GEMINI_MODELS = (
     "gemini-pro",
 )
 
+_SUGGEST_CONFIG = types.GenerateContentConfig(response_mime_type="application/json")
+
+T = TypeVar("T")
+
+_client: Optional[genai.Client] = None
+_router: Optional[ModelRouter] = None
+_client_lock = threading.Lock()
+# (event loop, semaphore) — an asyncio.Semaphore is bound to the loop it first runs on
+_async_limit: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
 
 def _get_api_key() -> str:
     key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
@@ -33,74 +65,359 @@ def _get_api_key() -> str:
     return key
 
 
+def _http_options() -> Optional[types.HttpOptions]:
+    """Size the keep-alive pool when the installed SDK accepts our own httpx clients."""
+    fields = getattr(types.HttpOptions, "model_fields", {})
+    if "httpx_client" not in fields or "httpx_async_client" not in fields:
+        return None
+    import httpx
+
+    n = max(1, get_settings().gemini_max_connections)
+    limits = httpx.Limits(max_connections=n, max_keepalive_connections=n)
+    return types.HttpOptions(
+        httpx_client=httpx.Client(limits=limits),
+        httpx_async_client=httpx.AsyncClient(limits=limits),
+    )
+
+
 def _get_client() -> genai.Client:
-    return genai.Client(api_key=_get_api_key())
+    """Process-wide client; created on first use and reused by sync and async calls."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if get_settings().gemini_fake:
+                    _client = get_fake_client()
+                else:
+                    _client = genai.Client(api_key=_get_api_key(), http_options=_http_options())
+    return _client
 
 
-def _generate(prompt: str) -> str:
-    client = _get_client()
+def set_client(client: Any) -> None:
+    """Inject a client (e.g. a FakeGeminiClient in benchmarks); None goes back to the default."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+async def aclose_client() -> None:
+    """Close the shared client's connection pools (called on app shutdown)."""
+    global _client
+    client, _client = _client, None
+    if client is None:
+        return
+    aclose = getattr(client.aio, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+    close = getattr(client, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def get_model_router() -> ModelRouter:
+    """Process-wide router over GEMINI_MODELS (health is shared by sync and async calls)."""
+    global _router
+    if _router is None:
+        with _client_lock:
+            if _router is None:
+                settings = get_settings()
+                _router = ModelRouter(
+                    GEMINI_MODELS,
+                    failure_threshold=settings.model_circuit_failure_threshold,
+                    open_seconds=settings.model_circuit_open_seconds,
+                    unavailable_recheck_seconds=settings.model_unavailable_recheck_seconds,
+                )
+    return _router
+
+
+@asynccontextmanager
+async def _concurrency_limit() -> AsyncIterator[None]:
+    global _async_limit
+    loop = asyncio.get_running_loop()
+    if _async_limit is None or _async_limit[0] is not loop:
+        _async_limit = (loop, asyncio.Semaphore(max(1, get_settings().gemini_max_concurrency)))
+    async with _async_limit[1]:
+        yield
+
+
+def _is_model_unavailable(e: Exception) -> bool:
+    err_str = str(e).lower()
+    return "not found" in err_str or "404" in err_str or "not_found" in err_str
+
+
+def _is_cache_missing(e: Exception) -> bool:
+    """The request's cached content expired or was deleted; not a quota (429) or server (5xx) error."""
+    err_str = str(e).lower()
+    if not any(k in err_str for k in ("cachedcontent", "cached content", "cached_content")):
+        return False
+    return any(k in err_str for k in ("not found", "not_found", "404", "expired", "does not exist"))
+
+
+def _observe_model(model: str, start: float, error: Optional[BaseException] = None, outcome: str = "") -> float:
+    """Record one model call in the per-model latency histogram; returns its duration."""
+    elapsed = time.perf_counter() - start
+    if not outcome:
+        outcome = "ok" if error is None else ("unavailable" if _is_model_unavailable(error) else "error")
+    get_metrics().observe(MODEL_CALL_SECONDS, elapsed, model=model, outcome=outcome)
+    return elapsed
+
+
+def _call_models(call: Callable[[str], T]) -> T:
+    """Run call(model) on the router's best model; fall through only on 404 (model unavailable)."""
+    router = get_model_router()
     last_error = None
-    for model in GEMINI_MODELS:
+    for model in router.candidates():
+        start = time.perf_counter()
         try:
-            response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-            )
-            if response.text is None:
-                return ""
-            return response.text.strip()
+            result = call(model)
         except (ClientError, Exception) as e:
             last_error = e
-            err_str = str(e).lower()
-            if "not found" in err_str or "404" in err_str or "not_found" in err_str:
+            _observe_model(model, start, e)
+            if _is_model_unavailable(e):
+                router.record_unavailable(model, e)
                 continue
+            router.record_failure(model, e)
             raise
+        router.record_success(model, _observe_model(model, start))
+        return result
+    raise last_error or RuntimeError("No model available")
+
+
+async def _call_models_async(call: Callable[[str], Awaitable[T]]) -> T:
+    """Async twin of _call_models; holds one concurrency slot for the whole call."""
+    router = get_model_router()
+    last_error = None
+    async with _concurrency_limit():
+        for model in router.candidates():
+            start = time.perf_counter()
+            try:
+                result = await call(model)
+            except (ClientError, Exception) as e:
+                last_error = e
+                _observe_model(model, start, e)
+                if _is_model_unavailable(e):
+                    router.record_unavailable(model, e)
+                    continue
+                router.record_failure(model, e)
+                raise
+            router.record_success(model, _observe_model(model, start))
+            return result
     raise last_error or RuntimeError("No model available")
 
 
+async def _call_models_hedged_async(call: Callable[[str], Awaitable[T]]) -> T:
+    """
+    _call_models_async with hedging (HEDGE_ENABLED): if the best model is slower than its
+    observed HEDGE_QUANTILE suggestion latency (kept by the policy, apart from other call
+    kinds), the next model gets the same request and the first
+    valid answer wins. A 404 from the race falls back to the usual candidate walk.
+    Each attempt holds its own concurrency slot, so a hedge counts against
+    GEMINI_MAX_CONCURRENCY like any other upstream call.
+    """
+    policy = get_hedge_policy()
+    router = get_model_router()
+    candidates = router.candidates()
+    if policy is None or len(candidates) < 2:
+        return await _call_models_async(call)
+    primary, backup = candidates[0], candidates[1]
+
+    async def attempt(model: str) -> T:
+        async with _concurrency_limit():
+            return await timed(model)
+
+    async def timed(model: str) -> T:
+        start = time.perf_counter()
+        try:
+            result = await call(model)
+        except asyncio.CancelledError:
+            _observe_model(model, start, outcome="cancelled")
+            raise
+        except (ClientError, Exception) as e:
+            _observe_model(model, start, e)
+            if _is_model_unavailable(e):
+                router.record_unavailable(model, e)
+            else:
+                router.record_failure(model, e)
+            raise
+        elapsed = _observe_model(model, start)
+        router.record_success(model, elapsed)
+        policy.observe(model, elapsed)
+        return result
+
+    delay = policy.delay(primary)
+    try:
+        return await race_hedged(lambda: attempt(primary), lambda: attempt(backup), delay, policy)
+    except (ClientError, Exception) as e:
+        if not _is_model_unavailable(e):
+            raise
+    return await _call_models_async(call)
+
+
+def _response_text(response) -> str:
+    if response.text is None:
+        return ""
+    return response.text.strip()
+
+
+def _generate(prompt: str) -> str:
+    client = _get_client()
+    return _call_models(
+        lambda model: _response_text(client.models.generate_content(model=model, contents=prompt))
+    )
+
+
+async def _generate_async(prompt: str) -> str:
+    """Async twin of _generate via client.aio."""
+    client = _get_client()
+
+    async def call(model: str) -> str:
+        return _response_text(await client.aio.models.generate_content(model=model, contents=prompt))
+
+    return await _call_models_async(call)
+
+
+def _cache_lookup(key: Optional[str]):
+    cache = get_response_cache() if key else None
+    return cache.get(key) if cache is not None else None
+
+
+def _cache_store(key: Optional[str], value) -> None:
+    cache = get_response_cache() if key else None
+    if cache is not None and value:
+        cache.set(key, value)
+
+
+def _coalesced(kind: str, key: Optional[str], fn: Callable[[], T]) -> T:
+    """Share one in-flight call between identical concurrent requests (SINGLE_FLIGHT_ENABLED)."""
+    if key is None or not get_settings().single_flight_enabled:
+        return fn()
+    return get_single_flight().do(kind, key, fn)
+
+
+async def _coalesced_async(kind: str, key: Optional[str], fn: Callable[[], Awaitable[T]]) -> T:
+    if key is None or not get_settings().single_flight_enabled:
+        return await fn()
+    return await get_single_flight().do_async(kind, key, fn)
+
+
+def _generate_cached(key: str, prompt: str) -> str:
+    result = _generate(prompt)
+    _cache_store(key, result)
+    return result
+
+
+async def _generate_cached_async(key: str, prompt: str) -> str:
+    result = await _generate_async(prompt)
+    _cache_store(key, result)
+    return result
+
+
+def _translate_to_english_prompt(local_text: str, local_language: str) -> str:
+    return f"""Translate the following {local_language} text to English. Return only the English translation, no explanation.
+Text: {local_text}"""
+
+
+def _translate_to_local_prompt(english_text: str, local_language: str) -> str:
+    return f"""Translate the following English text to {local_language}. Return only the {local_language} translation, no explanation.
+Text: {english_text}"""
+
+
+def _phonetic_prompt(local_text: str, local_language: str) -> str:
+    return f"""Given this {local_language} phrase, provide a simple phonetic spelling in Latin script so an English speaker can pronounce it. Use common English sounds (e.g. "oo" for u, "ay" for é). One line only, no explanation.
+Phrase: {local_text}"""
+
+
 def translate_to_english(local_text: str, local_language: str = "French") -> str:
     """Translate from local language to English."""
-    prompt = f"""Translate the following {local_language} text to English. Return only the English translation, no explanation.
-Text: {local_text}"""
-    return _generate(prompt)
+    key = cache_key("translate_to_english", local_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    return _coalesced("translate_to_english", key, lambda: _generate_cached(key, _translate_to_english_prompt(local_text, local_language)))
+
+
+async def translate_to_english_async(local_text: str, local_language: str = "French") -> str:
+    key = cache_key("translate_to_english", local_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    return await _coalesced_async("translate_to_english", key, lambda: _generate_cached_async(key, _translate_to_english_prompt(local_text, local_language)))
 
 
 def translate_to_local(english_text: str, local_language: str = "French") -> str:
     """Translate from English to local language."""
-    prompt = f"""Translate the following English text to {local_language}. Return only the {local_language} translation, no explanation.
-Text: {english_text}"""
-    return _generate(prompt)
+    key = cache_key("translate_to_local", english_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    return _coalesced("translate_to_local", key, lambda: _generate_cached(key, _translate_to_local_prompt(english_text, local_language)))
+
+
+async def translate_to_local_async(english_text: str, local_language: str = "French") -> str:
+    key = cache_key("translate_to_local", english_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    return await _coalesced_async("translate_to_local", key, lambda: _generate_cached_async(key, _translate_to_local_prompt(english_text, local_language)))
 
 
 def get_phonetic_spelling(local_text: str, local_language: str = "French") -> str:
     """Return phonetic spelling (e.g. IPA or readable approximation) for the local phrase."""
-    prompt = f"""Given this {local_language} phrase, provide a simple phonetic spelling in Latin script so an English speaker can pronounce it. Use common English sounds (e.g. "oo" for u, "ay" for é). One line only, no explanation.
-Phrase: {local_text}"""
-    result = _generate(prompt)
+    key = cache_key("get_phonetic_spelling", local_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    result = _coalesced("get_phonetic_spelling", key, lambda: _generate_cached(key, _phonetic_prompt(local_text, local_language)))
     return result if result else local_text
 
 
-def suggest_response(
-    user_context: UserContext,
-    other_person_said_local: str,
-    conversation_history_english: Optional[list[str]] = None,
+async def get_phonetic_spelling_async(local_text: str, local_language: str = "French") -> str:
+    key = cache_key("get_phonetic_spelling", local_text, local_language)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+    result = await _coalesced_async("get_phonetic_spelling", key, lambda: _generate_cached_async(key, _phonetic_prompt(local_text, local_language)))
+    return result if result else local_text
+
+
+def _local_phonetics(user_context: UserContext) -> bool:
+    """suggested_phonetic comes from the transliteration tables instead of model output."""
+    return get_settings().phonetic_local_enabled and get_transliterator(user_context.target_language) is not None
+
+
+def _with_local_phonetic(
+    result: tuple[str, SuggestedResponse], user_context: UserContext
 ) -> tuple[str, SuggestedResponse]:
-    """
-    ONE Gemini call: returns (english_translation, suggested_response).
-    JSON fields: english_translation, suggested_english, suggested_local, suggested_phonetic.
-    """
-    ctx = user_context.onboarding
-    history = ""
-    if conversation_history_english:
-        history = "Recent exchange (English): " + " | ".join(conversation_history_english[-6:])
+    if not _local_phonetics(user_context):
+        return result
+    english_translation, suggested = result
+    phonetic = get_transliterator(user_context.target_language).phrase(suggested.local)
+    return english_translation, suggested.model_copy(update={"phonetic": phonetic})
+
 
+def _suggest_system_prompt(user_context: UserContext) -> str:
+    """Static part of the suggestion prompt: persona, profile and output format (one per session)."""
+    ctx = user_context.onboarding
     target_lang = user_context.target_language
     region = user_context.target_region
     morocco_instruction = ""
     if region == "Morocco" or "Darija" in target_lang:
         morocco_instruction = " The user is travelling to Morocco. Use Moroccan Darija Arabic, not Modern Standard Arabic. Use common Moroccan phrases."
+    # Phonetics are spelled locally for languages with transliteration tables: no output tokens spent on them
+    phonetic_step = """
+3. Provide "suggested_phonetic": a simple phonetic spelling in Latin script for "suggested_local" so an English speaker can pronounce it (e.g. "oo" for u, "ay" for é). One line only."""
+    keys = "english_translation, suggested_english, suggested_local, suggested_phonetic"
+    if _local_phonetics(user_context):
+        phonetic_step = ""
+        keys = "english_translation, suggested_english, suggested_local"
 
-    prompt = f"""You are a polyglot coach helping a traveler have a natural conversation in {target_lang} ({region}).{morocco_instruction}
+    return f"""You are a polyglot coach helping a traveler have a natural conversation in {target_lang} ({region}).{morocco_instruction}
 
 User profile:
 - How they want to come across: {ctx.personality}
@@ -110,58 +427,348 @@ User profile:
 - Profession: {ctx.profession}
 - Hobbies: {ctx.hobbies}
 
-The other person just said (in local language): {other_person_said_local}
-{history}
-
-Do ALL of the following in one response as JSON only (no markdown, no explanation):
+For each thing the other person says, do ALL of the following in one response as JSON only (no markdown, no explanation):
 1. Provide "english_translation": the English translation of what the other person said.
-2. Suggest a short, natural reply the user could say next, in English ("suggested_english"), then in the target language ("suggested_local"), matching their personality and occasion (one or two short sentences).
-3. Provide "suggested_phonetic": a simple phonetic spelling in Latin script for "suggested_local" so an English speaker can pronounce it (e.g. "oo" for u, "ay" for é). One line only.
+2. Suggest a short, natural reply the user could say next, in English ("suggested_english"), then in the target language ("suggested_local"), matching their personality and occasion (one or two short sentences).{phonetic_step}
+
+Return ONLY a valid JSON object with exactly these keys: {keys}."""
+
+
+def _suggest_turn_prompt(
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+) -> str:
+    """Per-turn delta: the new utterance plus conversation memory."""
+    history = ""
+    if conversation_summary:
+        history = f"Earlier in this conversation (summary): {conversation_summary}\n"
+    if conversation_history_english:
+        history += "Recent exchange (English): " + " | ".join(conversation_history_english[-6:])
+    return f"""The other person just said (in local language): {other_person_said_local}
+{history}"""
+
+
+def _suggest_prompt(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+) -> str:
+    return _suggest_system_prompt(user_context) + "\n\n" + _suggest_turn_prompt(
+        other_person_said_local, conversation_history_english, conversation_summary
+    )
+
+
+def build_session_prompt(user_context: UserContext) -> SessionPrompt:
+    """Compile a session's static suggestion prefix (explicit caching per PROMPT_CACHE_* settings)."""
+    settings = get_settings()
+    return SessionPrompt(
+        _suggest_system_prompt(user_context),
+        cache_enabled=settings.prompt_cache_enabled,
+        cache_min_tokens=settings.prompt_cache_min_tokens,
+        cache_ttl_seconds=settings.prompt_cache_ttl_seconds,
+    )
+
+
+def release_session_prompt(session_prompt: SessionPrompt) -> None:
+    """Delete a session's cached contents in the background (called when the session is evicted)."""
+    client = _client
+    if client is None or not session_prompt.stats()["cached_models"]:
+        return
+    threading.Thread(target=session_prompt.release, args=(client,), daemon=True).start()
+
+
+def _suggest_request(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]],
+    conversation_summary: Optional[str],
+    session_prompt: Optional[SessionPrompt],
+) -> str:
+    """Contents for one suggestion call: only the delta when the session prefix is compiled."""
+    if session_prompt is not None:
+        return _suggest_turn_prompt(other_person_said_local, conversation_history_english, conversation_summary)
+    return _suggest_prompt(user_context, other_person_said_local, conversation_history_english, conversation_summary)
+
+
+def _suggest_config(session_prompt: Optional[SessionPrompt], model: str) -> types.GenerateContentConfig:
+    return session_prompt.config(model) if session_prompt is not None else _SUGGEST_CONFIG
+
+
+def _parse_suggestion(text: str, other_person_said_local: str) -> tuple[str, SuggestedResponse]:
+    text = (text or "").strip()
+    if not text:
+        raise ValueError("Empty response")
+    # Remove markdown code block if present
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+    data = json.loads(text)
+    english_translation = (data.get("english_translation") or "").strip() or other_person_said_local or ""
+    suggested_english = (data.get("suggested_english") or "I'm sorry, I didn't catch that.").strip().strip('"\n ')
+    suggested_local = (data.get("suggested_local") or suggested_english).strip()
+    suggested_phonetic = (data.get("suggested_phonetic") or suggested_local).strip()
+    return english_translation, SuggestedResponse(
+        english=suggested_english,
+        local=suggested_local,
+        phonetic=suggested_phonetic,
+    )
+
+
+def _suggest_cache_key(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]],
+    conversation_summary: Optional[str] = None,
+) -> Optional[str]:
+    # Replies depend on the running conversation; only history-free turns are shared.
+    if conversation_history_english or conversation_summary:
+        return None
+    return cache_key("suggest_response", other_person_said_local, context_fingerprint(user_context))
+
+
+def suggestion_key(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+) -> str:
+    """
+    Identity of a suggestion request, for sharing one call between duplicate requests:
+    the response-cache key for history-free turns, else the utterance plus the full prompt context.
+    """
+    key = _suggest_cache_key(
+        user_context, other_person_said_local, conversation_history_english, conversation_summary
+    )
+    if key is not None:
+        return key
+    context = _suggest_system_prompt(user_context) + "\x1f" + _suggest_turn_prompt(
+        "", conversation_history_english, conversation_summary
+    )
+    return cache_key("suggest_turn", other_person_said_local, hashlib.sha1(context.encode("utf-8")).hexdigest())
 
-Return ONLY a valid JSON object with exactly these keys: english_translation, suggested_english, suggested_local, suggested_phonetic."""
 
+def _suggestion_from_cache(value: dict) -> tuple[str, SuggestedResponse]:
+    return value["english_translation"], SuggestedResponse(**value["suggested"])
+
+
+def _suggestion_to_cache(result: tuple[str, SuggestedResponse]) -> dict:
+    return {"english_translation": result[0], "suggested": result[1].model_dump()}
+
+
+def suggest_response(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+    session_prompt: Optional[SessionPrompt] = None,
+) -> tuple[str, SuggestedResponse]:
+    """
+    ONE Gemini call: returns (english_translation, suggested_response).
+    JSON fields: english_translation, suggested_english, suggested_local, suggested_phonetic.
+    """
+    key = _suggest_cache_key(
+        user_context, other_person_said_local, conversation_history_english, conversation_summary
+    )
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return _suggestion_from_cache(cached)
+    with get_metrics().stage("prompt_render"):
+        prompt = _suggest_request(
+            user_context, other_person_said_local, conversation_history_english, conversation_summary, session_prompt
+        )
     client = _get_client()
-    last_error = None
-    for model in GEMINI_MODELS:
+
+    def call(model: str) -> tuple[str, SuggestedResponse]:
+        if session_prompt is not None:
+            session_prompt.ensure_cached(client, model)
+        config = _suggest_config(session_prompt, model)
         try:
+            response = client.models.generate_content(model=model, contents=prompt, config=config)
+        except Exception as e:
+            if config.cached_content is None or not _is_cache_missing(e):
+                raise
+            # Cached content expired or was deleted server-side: resend the prefix
+            session_prompt.forget(model)
             response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                ),
+                model=model, contents=prompt, config=_suggest_config(session_prompt, model)
             )
-            text = (response.text or "").strip()
-            if not text:
-                raise ValueError("Empty response")
-            # Remove markdown code block if present
-            if text.startswith("```"):
-                text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-            data = json.loads(text)
-            english_translation = (data.get("english_translation") or "").strip() or other_person_said_local or ""
-            suggested_english = (data.get("suggested_english") or "I'm sorry, I didn't catch that.").strip().strip('"\n ')
-            suggested_local = (data.get("suggested_local") or suggested_english).strip()
-            suggested_phonetic = (data.get("suggested_phonetic") or suggested_local).strip()
-            return english_translation, SuggestedResponse(
-                english=suggested_english,
-                local=suggested_local,
-                phonetic=suggested_phonetic,
+        with get_metrics().stage("parse"):
+            return _with_local_phonetic(_parse_suggestion(response.text, other_person_said_local), user_context)
+
+    def compute() -> tuple[str, SuggestedResponse]:
+        result = _call_models(call)
+        _cache_store(key, _suggestion_to_cache(result))
+        return result
+
+    return _coalesced("suggest_response", key, compute)
+
+
+async def suggest_response_async(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+    session_prompt: Optional[SessionPrompt] = None,
+) -> tuple[str, SuggestedResponse]:
+    """Async twin of suggest_response (client.aio, bounded by the concurrency limit)."""
+    key = _suggest_cache_key(
+        user_context, other_person_said_local, conversation_history_english, conversation_summary
+    )
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return _suggestion_from_cache(cached)
+    with get_metrics().stage("prompt_render"):
+        prompt = _suggest_request(
+            user_context, other_person_said_local, conversation_history_english, conversation_summary, session_prompt
+        )
+    client = _get_client()
+
+    async def call(model: str) -> tuple[str, SuggestedResponse]:
+        if session_prompt is not None:
+            await session_prompt.ensure_cached_async(client, model)
+        config = _suggest_config(session_prompt, model)
+        try:
+            response = await client.aio.models.generate_content(model=model, contents=prompt, config=config)
+        except Exception as e:
+            if config.cached_content is None or not _is_cache_missing(e):
+                raise
+            session_prompt.forget(model)
+            response = await client.aio.models.generate_content(
+                model=model, contents=prompt, config=_suggest_config(session_prompt, model)
             )
-        except (ClientError, Exception) as e:
-            last_error = e
-            err_str = str(e).lower()
-            if "not found" in err_str or "404" in err_str or "not_found" in err_str:
-                continue
-            raise
+        with get_metrics().stage("parse"):
+            return _with_local_phonetic(_parse_suggestion(response.text, other_person_said_local), user_context)
+
+    async def compute() -> tuple[str, SuggestedResponse]:
+        result = await _call_models_hedged_async(call)
+        _cache_store(key, _suggestion_to_cache(result))
+        return result
+
+    return await _coalesced_async("suggest_response", key, compute)
+
+
+async def suggest_response_stream_async(
+    user_context: UserContext,
+    other_person_said_local: str,
+    conversation_history_english: Optional[list[str]] = None,
+    conversation_summary: Optional[str] = None,
+    session_prompt: Optional[SessionPrompt] = None,
+) -> AsyncIterator[tuple[Any, ...]]:
+    """
+    Streaming variant of suggest_response (generate_content_stream).
+    Yields ("field", key, value) as each JSON field completes, then
+    ("done", english_translation, suggested_response) once the whole object is parsed.
+    Falls back to the next model on 404 only if nothing has been yielded yet.
+    """
+    key = _suggest_cache_key(
+        user_context, other_person_said_local, conversation_history_english, conversation_summary
+    )
+    cached = _cache_lookup(key)
+    if cached is not None:
+        english_translation, suggested = _suggestion_from_cache(cached)
+        yield ("field", "english_translation", english_translation)
+        yield ("field", "suggested_english", suggested.english)
+        yield ("field", "suggested_local", suggested.local)
+        yield ("field", "suggested_phonetic", suggested.phonetic)
+        yield ("done", english_translation, suggested)
+        return
+
+    with get_metrics().stage("prompt_render"):
+        prompt = _suggest_request(
+            user_context, other_person_said_local, conversation_history_english, conversation_summary, session_prompt
+        )
+    client = _get_client()
+    router = get_model_router()
+    local_phonetics = _local_phonetics(user_context)
+    last_error = None
+    async with _concurrency_limit():
+        for model in router.candidates():
+            start = time.perf_counter()
+            parser = IncrementalJSONFields()
+            chunks: list[str] = []
+            emitted = False
+            try:
+                if session_prompt is not None:
+                    await session_prompt.ensure_cached_async(client, model)
+                config = _suggest_config(session_prompt, model)
+                try:
+                    stream = await client.aio.models.generate_content_stream(
+                        model=model, contents=prompt, config=config
+                    )
+                except Exception as e:
+                    if config.cached_content is None or not _is_cache_missing(e):
+                        raise
+                    session_prompt.forget(model)
+                    stream = await client.aio.models.generate_content_stream(
+                        model=model, contents=prompt, config=_suggest_config(session_prompt, model)
+                    )
+                async for chunk in stream:
+                    text = chunk.text or ""
+                    chunks.append(text)
+                    for name, value in parser.feed(text):
+                        if local_phonetics and name == "suggested_phonetic":
+                            continue
+                        emitted = True
+                        value = value.strip() if isinstance(value, str) else value
+                        yield ("field", name, value)
+                        if local_phonetics and name == "suggested_local":
+                            phonetic = get_transliterator(user_context.target_language).phrase(str(value))
+                            yield ("field", "suggested_phonetic", phonetic)
+                result = _with_local_phonetic(_parse_suggestion("".join(chunks), other_person_said_local), user_context)
+            except (asyncio.CancelledError, GeneratorExit):
+                # The consumer went away (client disconnected) mid-stream
+                _observe_model(model, start, outcome="cancelled")
+                raise
+            except (ClientError, Exception) as e:
+                last_error = e
+                _observe_model(model, start, e)
+                if not emitted and _is_model_unavailable(e):
+                    router.record_unavailable(model, e)
+                    continue
+                router.record_failure(model, e)
+                raise
+            router.record_success(model, _observe_model(model, start))
+            _cache_store(key, _suggestion_to_cache(result))
+            yield ("done", *result)
+            return
     raise last_error or RuntimeError("No model available")
 
 
+async def summarize_conversation_async(summary: str, exchanges: list[str], max_tokens: int = 200) -> str:
+    """Fold older exchanges into a running conversation summary (background, off the request path)."""
+    max_words = max(10, int(max_tokens * 0.75))
+    prompt = f"""Update the running summary of a traveler's conversation with a local. Keep names, places, prices, orders and anything the traveler committed to. At most {max_words} words, English, no preamble.
+Current summary: {summary or "(none)"}
+New exchanges: {" | ".join(exchanges)}"""
+    return await _generate_async(prompt)
+
+
+def _end_phrase_prompt(spoken: str, local_language: str) -> str:
+    return f"""Does this user message mean they are ending the conversation / saying goodbye in {local_language} or English? Answer only YES or NO.
+User said: {spoken}"""
+
+
+def _local_end_phrase(spoken: str, local_language: str) -> Optional[bool]:
+    """Local lexicon verdict, or None when it is not confident enough to skip the LLM."""
+    verdict = classify_end_phrase(spoken, local_language)
+    if verdict.is_end is None or verdict.confidence < get_settings().end_phrase_confidence_threshold:
+        return None
+    return verdict.is_end
+
+
 def detect_end_phrase(spoken: str, local_language: str = "French") -> bool:
     """Return True if user said goodbye (e.g. 'Au revoir' in French)."""
-    spoken_lower = spoken.strip().lower()
-    if "au revoir" in spoken_lower or "goodbye" in spoken_lower or "bye" in spoken_lower:
-        return True
-    prompt = f"""Does this user message mean they are ending the conversation / saying goodbye in {local_language} or English? Answer only YES or NO.
-User said: {spoken}"""
-    text = _generate(prompt).upper()
+    local = _local_end_phrase(spoken, local_language)
+    if local is not None:
+        return local
+    text = _generate(_end_phrase_prompt(spoken, local_language)).upper()
+    return text.startswith("YES")
+
+
+async def detect_end_phrase_async(spoken: str, local_language: str = "French") -> bool:
+    local = _local_end_phrase(spoken, local_language)
+    if local is not None:
+        return local
+    text = (await _generate_async(_end_phrase_prompt(spoken, local_language))).upper()
     return text.startswith("YES")
@@ -0,0 +1,167 @@
+"""
+Hedged requests for tail-latency control on the async suggestion path.
+If the primary model has not answered within its observed suggestion latency quantile
+(p95 by default), the same request goes to the next model in the router's order; the first
+valid response wins and the other call is cancelled. A token budget caps hedges at
+HEDGE_MAX_EXTRA_RATIO of primary calls, so a slow upstream cannot double our traffic.
+Latency is sampled here from suggestion calls only: the router's per-model window also
+holds end-phrase checks and summaries, whose latency says little about a suggestion's.
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from backend.config import get_settings
+
+T = TypeVar("T")
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class HedgePolicy:
+    """Hedge delay from the primary's suggestion latency quantile, a token budget, and win counters."""
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_delay: float = 0.5,
+        default_delay: float = 3.0,
+        min_samples: int = 20,
+        max_extra_ratio: float = 0.1,
+        burst: float = 5.0,
+        latency_window: int = 100,
+    ):
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.min_samples = max(1, min_samples)
+        self.max_extra_ratio = max(0.0, max_extra_ratio)
+        self.burst = max(1.0, burst)
+        self.latency_window = max(1, latency_window)
+        self._latencies: dict[str, deque[float]] = {}  # model -> recent suggestion latencies
+        self._tokens = 0.0  # hedges never exceed max_extra_ratio * requests
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.budget_denied = 0
+
+    def observe(self, model: str, latency_s: float) -> None:
+        """Record a successful suggestion call."""
+        with self._lock:
+            window = self._latencies.get(model)
+            if window is None:
+                window = self._latencies[model] = deque(maxlen=self.latency_window)
+            window.append(latency_s)
+
+    def delay(self, model: str) -> float:
+        """Seconds to wait for `model` before hedging."""
+        with self._lock:
+            return self._delay_locked(model)
+
+    def _delay_locked(self, model: str) -> float:
+        window = self._latencies.get(model)
+        if window is None or len(window) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, _percentile(sorted(window), self.quantile))
+
+    def start_request(self) -> None:
+        """Every primary call earns max_extra_ratio of a hedge."""
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.max_extra_ratio)
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                self.budget_denied += 1
+                return False
+            self._tokens -= 1.0
+            self.hedged += 1
+            return True
+
+    def record_winner(self, hedge_won: bool) -> None:
+        with self._lock:
+            if hedge_won:
+                self.hedge_wins += 1
+            else:
+                self.primary_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else None,
+                "hedge_wins": self.hedge_wins,
+                "primary_wins_after_hedge": self.primary_wins,
+                "hedge_win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else None,
+                "budget_denied": self.budget_denied,
+                "budget_tokens": round(self._tokens, 2),
+                "max_extra_ratio": self.max_extra_ratio,
+                "quantile": self.quantile,
+                "delay_ms": {model: round(self._delay_locked(model) * 1000, 1) for model in self._latencies},
+            }
+
+
+async def race_hedged(
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    delay: float,
+    policy: HedgePolicy,
+) -> T:
+    """
+    Run primary(); if it has not finished after `delay` and the budget allows, also run
+    backup(). The first to succeed wins and the other is cancelled; if one fails we keep
+    waiting for the other. Raises the primary's error when both fail.
+    """
+    policy.start_request()
+    first = asyncio.ensure_future(primary())
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done or not policy.try_hedge():
+            return await first
+        second = asyncio.ensure_future(backup())
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (first, second):
+                if task in done and not task.cancelled() and task.exception() is None:
+                    policy.record_winner(task is second)
+                    return task.result()
+        raise first.exception() or second.exception() or RuntimeError("Hedged request failed")
+    finally:
+        # The loser, or everything if we were cancelled ourselves
+        pending = [task for task in pending if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+_policy: Optional[HedgePolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_hedge_policy() -> Optional[HedgePolicy]:
+    """Process-wide hedging policy, or None when HEDGE_ENABLED is false."""
+    global _policy
+    settings = get_settings()
+    if not settings.hedge_enabled:
+        return None
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = HedgePolicy(
+                    quantile=settings.hedge_quantile,
+                    min_delay=settings.hedge_min_delay_seconds,
+                    default_delay=settings.hedge_default_delay_seconds,
+                    max_extra_ratio=settings.hedge_max_extra_ratio,
+                )
+    return _policy
@@ -0,0 +1,127 @@
+"""
+Incremental parser for a flat JSON object arriving in chunks (Gemini streaming).
+Emits each top-level field as soon as its value is complete, so clients can render
+english_translation before the model has finished writing suggested_phonetic.
+"""
+import json
+from typing import Any
+
+# Parser states
+_BEFORE_OBJECT = 0
+_EXPECT_KEY = 1
+_IN_KEY = 2
+_EXPECT_COLON = 3
+_EXPECT_VALUE = 4
+_IN_STRING_VALUE = 5
+_IN_NESTED_VALUE = 6
+_IN_SCALAR_VALUE = 7
+_DONE = 8
+
+
+class IncrementalJSONFields:
+    """
+    Feed text chunks with feed(); each call returns the (key, value) pairs of the
+    top-level fields completed by that chunk. Leading noise such as a ```json fence
+    is skipped up to the first "{". Nested values are returned once fully closed.
+    """
+
+    def __init__(self) -> None:
+        self._state = _BEFORE_OBJECT
+        self._buf: list[str] = []
+        self._key = ""
+        self._escape = False
+        self._depth = 0
+        self._nested_in_string = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        out: list[tuple[str, Any]] = []
+        for ch in chunk:
+            state = self._state
+            if state == _BEFORE_OBJECT:
+                if ch == "{":
+                    self._state = _EXPECT_KEY
+            elif state == _EXPECT_KEY:
+                if ch == '"':
+                    self._buf = []
+                    self._state = _IN_KEY
+                elif ch == "}":
+                    self._state = _DONE
+            elif state == _IN_KEY:
+                if self._consume_string_char(ch):
+                    self._key = self._decode_string()
+                    self._state = _EXPECT_COLON
+            elif state == _EXPECT_COLON:
+                if ch == ":":
+                    self._state = _EXPECT_VALUE
+            elif state == _EXPECT_VALUE:
+                if ch.isspace():
+                    continue
+                self._buf = []
+                if ch == '"':
+                    self._state = _IN_STRING_VALUE
+                elif ch in "{[":
+                    self._buf.append(ch)
+                    self._depth = 1
+                    self._nested_in_string = False
+                    self._state = _IN_NESTED_VALUE
+                else:
+                    self._buf.append(ch)
+                    self._state = _IN_SCALAR_VALUE
+            elif state == _IN_STRING_VALUE:
+                if self._consume_string_char(ch):
+                    out.append((self._key, self._decode_string()))
+                    self._state = _EXPECT_KEY
+            elif state == _IN_NESTED_VALUE:
+                self._buf.append(ch)
+                if self._nested_in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == "\\":
+                        self._escape = True
+                    elif ch == '"':
+                        self._nested_in_string = False
+                elif ch == '"':
+                    self._nested_in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        out.append((self._key, self._loads("".join(self._buf))))
+                        self._state = _EXPECT_KEY
+            elif state == _IN_SCALAR_VALUE:
+                if ch in ",}" or ch.isspace():
+                    out.append((self._key, self._loads("".join(self._buf).strip())))
+                    self._state = _DONE if ch == "}" else _EXPECT_KEY
+                else:
+                    self._buf.append(ch)
+        return out
+
+    def _consume_string_char(self, ch: str) -> bool:
+        """Append one char of a JSON string body; True when the closing quote is reached."""
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            return True
+        self._buf.append(ch)
+        return False
+
+    def _decode_string(self) -> str:
+        raw = "".join(self._buf)
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            return raw
+
+    @staticmethod
+    def _loads(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw
@@ -1,13 +1,27 @@
 """
 Gemini Live API — real-time bidirectional audio + tool calls.
 Used by /ws/translate for Best Use of Gemini track.
+
+LiveSessionManager pre-warms a Live connection per REST session (started from
+/api/onboarding and /api/arrive) so the first utterance does not pay connection
+setup; /ws/translate claims it by session_id and falls back to a cold connect.
 """
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from typing import Any, Callable, Optional
 
 from backend.config import get_settings
+from backend.services.fake_gemini import get_fake_client
+from backend.services.vad import VoiceActivityDetector
+
+# Live-capable model (adjust if your key has access to a different live model)
+LIVE_MODEL = "gemini-2.0-flash-live-001"
+
+_live_client = None
+_live_client_lock = threading.Lock()
 
 
 def build_system_prompt(context: dict[str, Any]) -> str:
@@ -40,53 +54,251 @@ Your role:
 """
 
 
+def _error_payload(message: str) -> dict[str, Any]:
+    return {
+        "error": message,
+        "phonetic_spelling": "",
+        "local_spelling": "",
+        "english_translation": "",
+    }
+
+
+def _get_live_client():
+    """Process-wide genai client for Live connections (raises ImportError / ValueError)."""
+    global _live_client
+    if _live_client is None:
+        if get_settings().gemini_fake:
+            _live_client = get_fake_client()
+            return _live_client
+        from google import genai
+
+        with _live_client_lock:
+            if _live_client is None:
+                settings = get_settings()
+                api_key = settings.get_live_api_key() or settings.get_gemini_api_key()
+                _live_client = genai.Client(api_key=api_key)
+    return _live_client
+
+
+def set_live_client(client: Any) -> None:
+    """Inject the client used for Live connections (e.g. a FakeGeminiClient); None resets it."""
+    global _live_client
+    with _live_client_lock:
+        _live_client = client
+
+
+def _live_config(system_instruction: str):
+    from google.genai import types
+
+    return types.LiveConnectConfig(
+        system_instruction=types.Content(role="user", parts=[types.Part.from_text(text=system_instruction)]),
+    )
+
+
+def live_context_from_user_context(user_context: dict[str, Any]) -> dict[str, Any]:
+    """The /ws/translate context a client would send, built from a REST session's user_context."""
+    onboarding = user_context.get("onboarding") or {}
+    return {
+        "destination": user_context.get("target_region"),
+        "target_region": user_context.get("target_region"),
+        "target_language": user_context.get("target_language"),
+        "occasion": onboarding.get("occasion"),
+        "slang_level": onboarding.get("slang_level"),
+        "personality": onboarding.get("personality"),
+        "profession": onboarding.get("profession"),
+        "hobbies": onboarding.get("hobbies"),
+    }
+
+
+# Fields a client context may set that change the coach, compared case-insensitively on
+# claim. Region strings are left out: the client sends its own label ("Paris, France")
+# while the REST session stores the region it was created with.
+_CLAIM_KEYS = ("target_language", "occasion", "slang_level", "personality", "profession", "hobbies")
+
+
+def _norm(value: Any) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+def _claimable(own: dict[str, Any], client: dict[str, Any]) -> bool:
+    """True unless the client context contradicts the session's own on a field it sets."""
+    for key in _CLAIM_KEYS:
+        wanted = _norm(client.get(key))
+        if wanted and wanted != _norm(own.get(key)):
+            return False
+    return True
+
+
+class WarmLiveSession:
+    """
+    A Live connection opened ahead of time. A background task holds the connect()
+    context open until the session is claimed and released, or sits idle too long.
+    """
+
+    def __init__(self, session_id: str, context: dict[str, Any]):
+        self.session_id = session_id
+        self.context = context  # the REST session's own context the prompt was built from
+        self.system_instruction = build_system_prompt(context)
+        self.created = time.monotonic()
+        self.session: Any = None
+        self.error: Optional[BaseException] = None
+        self.ready = asyncio.Event()  # connected (or failed: see error)
+        self.claimed = asyncio.Event()
+        self.released = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.task is not None and not self.task.done() and self.error is None
+
+    def release(self) -> None:
+        """Called by the user of a claimed session when it is done; closes the connection."""
+        self.released.set()
+
+
+class LiveSessionManager:
+    """session_id -> WarmLiveSession, bounded, each closed after idle_timeout unclaimed."""
+
+    def __init__(self, idle_timeout: float = 300.0, max_sessions: int = 100, claim_wait: float = 5.0):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max(1, max_sessions)
+        self.claim_wait = claim_wait
+        self._warm: dict[str, WarmLiveSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.warmed = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.failures = 0
+
+    def warm(self, session_id: str, context: dict[str, Any]) -> bool:
+        """Start connecting in the background (call from the event loop). False if not warmed."""
+        existing = self._warm.get(session_id)
+        if existing is not None and (existing.alive or not existing.ready.is_set()):
+            return True
+        if len(self._warm) >= self.max_sessions:
+            return False
+        self._loop = asyncio.get_running_loop()
+        warm = WarmLiveSession(session_id, context)
+        warm.task = asyncio.create_task(self._hold(warm))
+        self._warm[session_id] = warm
+        self.warmed += 1
+        return True
+
+    async def _hold(self, warm: WarmLiveSession) -> None:
+        try:
+            client = _get_live_client()
+            async with client.aio.live.connect(model=LIVE_MODEL, config=_live_config(warm.system_instruction)) as session:
+                warm.session = session
+                warm.ready.set()
+                try:
+                    await asyncio.wait_for(warm.claimed.wait(), timeout=self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.expired += 1
+                    return
+                await warm.released.wait()
+        except Exception as e:
+            warm.error = e
+            self.failures += 1
+        finally:
+            warm.ready.set()
+            if self._warm.get(warm.session_id) is warm:
+                del self._warm[warm.session_id]
+
+    async def claim(self, session_id: Optional[str], context: dict[str, Any]) -> Optional[WarmLiveSession]:
+        """
+        The warmed session for session_id unless the client context contradicts the
+        session's own (see _claimable); None means connect cold.
+        """
+        warm = self._warm.get(session_id) if session_id else None
+        if warm is None or warm.claimed.is_set() or not _claimable(warm.context, context):
+            self.misses += 1
+            return None
+        warm.claimed.set()  # stops the idle timer while the connect finishes
+        try:
+            await asyncio.wait_for(warm.ready.wait(), timeout=self.claim_wait)
+        except asyncio.TimeoutError:
+            pass
+        if warm.session is None or warm.error is not None:
+            warm.release()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return warm
+
+    def discard(self, session_id: str) -> None:
+        """Close an unclaimed warm session (e.g. its REST session was evicted). Thread-safe."""
+        if self._loop is not None and session_id in self._warm:
+            self._loop.call_soon_threadsafe(self._discard, session_id)
+
+    def _discard(self, session_id: str) -> None:
+        warm = self._warm.get(session_id)
+        if warm is not None and not warm.claimed.is_set() and warm.task is not None:
+            warm.task.cancel()
+
+    async def close(self) -> None:
+        tasks = [w.task for w in self._warm.values() if w.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._warm.clear()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "warm": sum(1 for w in self._warm.values() if w.alive and not w.claimed.is_set()),
+            "in_use": sum(1 for w in self._warm.values() if w.claimed.is_set()),
+            "warmed": self.warmed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "failures": self.failures,
+            "oldest_idle_seconds": round(max(
+                (now - w.created for w in self._warm.values() if not w.claimed.is_set()), default=0.0
+            ), 1),
+        }
+
+
+_manager: Optional[LiveSessionManager] = None
+
+
+def get_live_session_manager() -> LiveSessionManager:
+    global _manager
+    if _manager is None:
+        settings = get_settings()
+        _manager = LiveSessionManager(
+            idle_timeout=settings.live_warm_idle_seconds,
+            max_sessions=settings.live_warm_max_sessions,
+        )
+    return _manager
+
+
 async def run_live_session(
     context: dict[str, Any],
     audio_in: asyncio.Queue[bytes],
     audio_out: asyncio.Queue[bytes],
     tool_out: asyncio.Queue[dict[str, Any]],
     turn_callback: Optional[Callable[[int, dict[str, Any]], None]] = None,
+    vad: Optional[VoiceActivityDetector] = None,
+    warm: Optional[WarmLiveSession] = None,
 ) -> None:
     """
     Run a Gemini Live session: consume PCM from audio_in, push audio to audio_out and tool calls to tool_out.
     turn_callback(turn_index, tool_payload) is called each time Gemini completes a turn (for ValueTracker).
+    With a vad, silent frames are dropped before send_realtime_input and the end of each
+    utterance is signalled with audio_stream_end (when the SDK supports it).
+    With a claimed warm session its connection is used as is; otherwise we connect now (cold).
     """
     try:
-        from google import genai
         from google.genai import types
     except ImportError:
-        await tool_out.put({
-            "error": "google-genai not installed",
-            "phonetic_spelling": "",
-            "local_spelling": "",
-            "english_translation": "",
-        })
+        await tool_out.put(_error_payload("google-genai not installed"))
         return
 
-    try:
-        settings = get_settings()
-        api_key = settings.get_live_api_key() or settings.get_gemini_api_key()
-    except Exception as e:
-        await tool_out.put({
-            "error": str(e),
-            "phonetic_spelling": "",
-            "local_spelling": "",
-            "english_translation": "",
-        })
-        return
-
-    client = genai.Client(api_key=api_key)
-    system_instruction = build_system_prompt(context)
-
-    # Live-capable model (adjust if your key has access to a different live model)
-    model = "gemini-2.0-flash-live-001"
-    config = types.LiveConnectConfig(
-        system_instruction=types.Content(role="user", parts=[types.Part.from_text(system_instruction)]),
-    )
-
     turn_index = [0]  # mutable so inner closure can increment
+    stream_end_supported = [True]
 
-    async def send_audio_loop() -> None:
+    async def send_audio_loop(session) -> None:
         while True:
             try:
                 chunk = await asyncio.wait_for(audio_in.get(), timeout=300.0)
@@ -94,14 +306,24 @@ async def run_live_session(
                 break
             if chunk is None:
                 break
+            speech_ended = False
+            if vad is not None:
+                chunk, speech_ended = vad.process(chunk)
             try:
-                await session.send_realtime_input(
-                    media=types.Blob(data=chunk, mime_type="audio/pcm;rate=16000"),
-                )
+                if chunk:
+                    await session.send_realtime_input(
+                        media=types.Blob(data=chunk, mime_type="audio/pcm;rate=16000"),
+                    )
+                if speech_ended and stream_end_supported[0]:
+                    # Silence is no longer streamed, so tell the server-side turn detector explicitly
+                    try:
+                        await session.send_realtime_input(audio_stream_end=True)
+                    except TypeError:
+                        stream_end_supported[0] = False
             except Exception:
                 break
 
-    async def receive_loop() -> None:
+    async def receive_loop(session) -> None:
         try:
             async for msg in session.receive():
                 if getattr(msg, "tool_call", None):
@@ -121,13 +343,17 @@ async def run_live_session(
         except Exception:
             pass
 
+    if warm is not None:
+        try:
+            await asyncio.gather(send_audio_loop(warm.session), receive_loop(warm.session))
+        finally:
+            warm.release()
+        return
+
     try:
-        async with client.aio.live.connect(model=model, config=config) as session:
-            await asyncio.gather(send_audio_loop(), receive_loop())
+        client = _get_live_client()
+        config = _live_config(build_system_prompt(context))
+        async with client.aio.live.connect(model=LIVE_MODEL, config=config) as session:
+            await asyncio.gather(send_audio_loop(session), receive_loop(session))
     except Exception as e:
-        await tool_out.put({
-            "error": str(e),
-            "phonetic_spelling": "",
-            "local_spelling": "",
-            "english_translation": "",
-        })
+        await tool_out.put(_error_payload(str(e)))
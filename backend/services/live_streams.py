@@ -0,0 +1,183 @@
+"""
+Resumable /ws/translate streams.
+A LiveStream is the part of a live conversation that can outlive one WebSocket: its
+bounded queues, audio processors and the Gemini Live task. When a client drops, the
+stream is parked under its resume token for a grace period; the Live session keeps
+running and tool payloads pile up in tool_out. A reconnect that presents the token
+reattaches to the same stream (same Live session, same turn_index) and receives the
+payloads it missed. Unclaimed streams are closed when the grace period ends.
+"""
+import asyncio
+import secrets
+import time
+from typing import Any, Optional
+
+from backend.config import get_settings
+from backend.services.audio_codec import DownlinkEncoder
+from backend.services.pcm_buffer import PcmFrameBuffer
+from backend.services.vad import VoiceActivityDetector
+from backend.services.ws_queues import BoundedQueue, ConnectionRegistry
+
+
+class LiveStream:
+    """Queues, VAD, framer, downlink encoder and Live task for one conversation."""
+
+    def __init__(self, settings: Any, registry: ConnectionRegistry):
+        # Bounded queues: audio keeps the newest chunks, tool messages are never dropped and
+        # go out before any queued audio (single writer per connection)
+        self.outbound = asyncio.Event()
+        self.audio_in = BoundedQueue("audio_in", settings.ws_audio_in_max_chunks, settings.ws_audio_in_policy)
+        self.audio_out = BoundedQueue("audio_out", settings.ws_audio_out_max_chunks, "drop_oldest", wakeup=self.outbound)
+        self.tool_out = BoundedQueue("tool_out", settings.ws_tool_out_max_messages, "block", wakeup=self.outbound)
+        self.vad = VoiceActivityDetector(
+            frame_ms=settings.vad_frame_ms,
+            threshold_db=settings.vad_threshold_db,
+            noise_margin_db=settings.vad_noise_margin_db,
+            hangover_ms=settings.vad_hangover_ms,
+            preroll_ms=settings.vad_preroll_ms,
+        ) if settings.vad_enabled else None
+        self.framer = PcmFrameBuffer(
+            frame_bytes=16000 * settings.audio_frame_ms // 1000 * 2,
+            capacity_frames=max(16, 1000 // max(1, settings.audio_frame_ms)),
+        )
+        # Downlink audio encoding, negotiated by "downlink_codec" in the context message
+        self.downlink = DownlinkEncoder("pcm")
+        self.meters: dict[str, Any] = {"framer": self.framer, "downlink": self.downlink}
+        if self.vad is not None:
+            self.meters["vad"] = self.vad
+        self.registry = registry
+        self.conn_id = registry.open(
+            {"audio_in": self.audio_in, "audio_out": self.audio_out, "tool_out": self.tool_out},
+            meters=self.meters,
+        )
+        self.context: Optional[dict[str, Any]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.token: Optional[str] = None
+        self.slowed = False
+        self.attachments = 1
+        self.closed = False
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def set_codec(self, codec: str) -> dict[str, Any]:
+        """Switch the downlink encoder; returns the announcement for the client."""
+        self.downlink = self.meters["downlink"] = DownlinkEncoder(codec)
+        return self.downlink.announcement()
+
+    def end_input(self) -> None:
+        """Forward the partial frame left in the framer, then end the audio stream."""
+        tail = self.framer.flush()
+        if tail and not self.audio_in.full():
+            self.audio_in.put_nowait(tail)
+        self.audio_in.put_nowait(None)
+
+    def drop_stale_audio(self) -> int:
+        """Discard downlink audio produced while detached; returns chunks dropped."""
+        dropped = 0
+        while not self.audio_out.empty():
+            self.audio_out.get_nowait()
+            dropped += 1
+        return dropped
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.registry.close(self.conn_id)
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+class ParkedStreams:
+    """resume token -> detached LiveStream, each closed after grace_seconds unless resumed."""
+
+    def __init__(self, grace_seconds: float = 30.0, max_parked: int = 100):
+        self.grace_seconds = grace_seconds
+        self.max_parked = max(1, max_parked)
+        self._parked: dict[str, tuple[LiveStream, float, asyncio.TimerHandle]] = {}
+        self.parked = 0
+        self.resumed = 0
+        self.expired = 0
+        self.rejected = 0
+        self.replayed_payloads = 0
+
+    @staticmethod
+    def new_token() -> str:
+        return secrets.token_urlsafe(16)
+
+    def park(self, stream: LiveStream) -> bool:
+        """Detach a stream whose client went away. False if it cannot be parked (caller closes it)."""
+        if not stream.token or not stream.running or len(self._parked) >= self.max_parked:
+            return False
+        loop = asyncio.get_running_loop()
+        handle = loop.call_later(self.grace_seconds, self._expire, stream.token)
+        self._parked[stream.token] = (stream, time.monotonic(), handle)
+        self.parked += 1
+        return True
+
+    def _expire(self, token: str) -> None:
+        entry = self._parked.pop(token, None)
+        if entry is None:
+            return
+        self.expired += 1
+        asyncio.create_task(entry[0].close())
+
+    def resume(self, token: Optional[str]) -> Optional[LiveStream]:
+        """The parked stream for token (removed from the park), or None to start a new one."""
+        entry = self._parked.pop(token, None) if token else None
+        if entry is None:
+            if token:
+                self.rejected += 1
+            return None
+        stream, _, handle = entry
+        handle.cancel()
+        if not stream.running:
+            # The Live session ended while parked; nothing to reattach to
+            self.rejected += 1
+            asyncio.create_task(stream.close())
+            return None
+        stream.attachments += 1
+        self.resumed += 1
+        self.replayed_payloads += stream.tool_out.qsize()
+        return stream
+
+    async def close(self) -> None:
+        entries = list(self._parked.values())
+        self._parked.clear()
+        for stream, _, handle in entries:
+            handle.cancel()
+        await asyncio.gather(*(stream.close() for stream, _, _ in entries), return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "parked_now": len(self._parked),
+            "grace_seconds": self.grace_seconds,
+            "parked": self.parked,
+            "resumed": self.resumed,
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "replayed_payloads": self.replayed_payloads,
+            "buffered_payloads": sum(s.tool_out.qsize() for s, _, _ in self._parked.values()),
+            "oldest_parked_seconds": round(max((now - t for _, t, _ in self._parked.values()), default=0.0), 1),
+        }
+
+
+_parked: Optional[ParkedStreams] = None
+
+
+def get_parked_streams() -> ParkedStreams:
+    global _parked
+    if _parked is None:
+        settings = get_settings()
+        _parked = ParkedStreams(
+            grace_seconds=settings.live_resume_grace_seconds,
+            max_parked=settings.live_resume_max_parked,
+        )
+    return _parked
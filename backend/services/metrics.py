@@ -0,0 +1,285 @@
+"""
+Hot-path latency instrumentation exposed in Prometheus text format (/api/metrics).
+Stage timers (perf_counter) feed fixed-bucket histograms labelled with the stage and
+the endpoint being served (a contextvar set by MetricsMiddleware), so a slow turn
+can be split into session lookup, context build, prompt rendering, model call,
+parsing and scoring. Model calls get their own histogram per model; /ws/translate
+keeps frame and byte counters, and collectors add gauges such as queue depths at
+scrape time. Observing is a bisect plus two increments under a lock.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Optional
+
+from backend.config import get_settings
+
+# Seconds; covers in-process stages (tens of µs) up to slow model calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0,
+)
+
+STAGE_SECONDS = "polyglot_stage_seconds"
+REQUEST_SECONDS = "polyglot_http_request_seconds"
+MODEL_CALL_SECONDS = "polyglot_model_call_seconds"
+WS_FRAMES = "polyglot_ws_frames_total"
+WS_BYTES = "polyglot_ws_bytes_total"
+
+_HELP = {
+    STAGE_SECONDS: ("histogram", "Time spent in one stage of a request, by stage and endpoint."),
+    REQUEST_SECONDS: ("histogram", "HTTP request latency by route, method and status."),
+    MODEL_CALL_SECONDS: ("histogram", "Gemini call latency by model and outcome."),
+    WS_FRAMES: ("counter", "/ws/translate WebSocket frames by direction and kind."),
+    WS_BYTES: ("counter", "/ws/translate WebSocket payload bytes by direction and kind."),
+}
+
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="")
+
+
+def _label_key(labels: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative-on-export bucket counts, sum and count for one label set."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        i = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty)."""
+        counts, _, count = self.snapshot()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.bounds + (float("inf"),), counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Histograms and counters by (name, labels), plus gauge collectors run at scrape time."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self._counters: dict[tuple[str, tuple], Counter] = {}
+        self._stages: dict[tuple[str, str], Histogram] = {}  # fast path for stage()
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, dict[str, Any], float]]]] = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        key = (name, _label_key(labels))
+        h = self._histograms.get(key)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(key, Histogram())
+        return h
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        key = (name, _label_key(labels))
+        c = self._counters.get(key)
+        if c is None:
+            with self._lock:
+                c = self._counters.setdefault(key, Counter())
+        return c
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        if self.enabled:
+            self.histogram(name, **labels).observe(seconds)
+
+    def stage(self, stage: str) -> Any:
+        """with metrics.stage("model"): ... — timed into polyglot_stage_seconds for the current endpoint."""
+        if not self.enabled:
+            return _NULL_TIMER
+        key = (stage, current_endpoint.get() or "background")
+        h = self._stages.get(key)
+        if h is None:
+            h = self._stages[key] = self.histogram(STAGE_SECONDS, stage=key[0], endpoint=key[1])
+        return _Timer(h)
+
+    def add_collector(self, collect: Callable[[], Iterable[tuple[str, str, dict[str, Any], float]]]) -> None:
+        """collect() yields (name, type, labels, value) for gauges read at scrape time."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        lines: list[str] = []
+        described: set[str] = set()
+
+        def describe(name: str, kind: str) -> None:
+            if name in described:
+                return
+            described.add(name)
+            help_text = _HELP.get(name, (kind, name.replace("_", " ")))[1]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, key), h in histograms:
+            describe(name, "histogram")
+            counts, total, count = h.snapshot()
+            cumulative = 0
+            for bound, n in zip(h.bounds, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', repr(bound)))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{name}_sum{_format_labels(key)} {repr(total)}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+        for (name, key), c in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{_format_labels(key)} {c.value}")
+        for collect in self._collectors:
+            try:
+                samples = list(collect())
+            except Exception:
+                continue
+            for name, kind, labels, value in samples:
+                describe(name, kind)
+                lines.append(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class WsCounters:
+    """Frame and byte counters for each (direction, kind) of /ws/translate traffic, resolved once."""
+
+    def __init__(self, metrics: MetricsRegistry):
+        self.enabled = metrics.enabled
+        self._counters = {
+            (direction, kind): (
+                metrics.counter(WS_FRAMES, direction=direction, kind=kind),
+                metrics.counter(WS_BYTES, direction=direction, kind=kind),
+            )
+            for direction in ("in", "out")
+            for kind in ("binary", "text")
+        }
+
+    def record(self, direction: str, kind: str, nbytes: int) -> None:
+        if self.enabled:
+            frames, total = self._counters[(direction, kind)]
+            frames.inc()
+            total.inc(nbytes)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: sets current_endpoint for stage timers and records request
+    latency by route template (not raw path, to keep label cardinality bounded).
+    """
+
+    def __init__(self, app: Any, metrics: Optional["MetricsRegistry"] = None):
+        self.app = app
+        self.metrics = metrics or get_metrics()
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not self.metrics.enabled:
+            if scope["type"] == "websocket":
+                current_endpoint.set(scope.get("path", ""))
+            await self.app(scope, receive, send)
+            return
+        token = current_endpoint.set(scope.get("path", ""))
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.metrics.observe(
+                REQUEST_SECONDS, time.perf_counter() - start, route=path, method=scope.get("method", ""), status=status[0]
+            )
+            current_endpoint.reset(token)
+
+
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = MetricsRegistry(enabled=get_settings().metrics_enabled)
+    return _metrics
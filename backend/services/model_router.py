@@ -0,0 +1,170 @@
+"""
+Health-aware model router for the Gemini REST calls.
+Remembers which models resolved for our key, tracks per-model latency and error
+rates, and opens a circuit breaker on a model that keeps failing, so each call
+goes straight to the best healthy model instead of re-probing GEMINI_MODELS.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+# Model resolution status
+UNKNOWN = "unknown"
+AVAILABLE = "available"
+UNAVAILABLE = "unavailable"
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class ModelHealth:
+    """Mutable health record for one model (guarded by the router lock)."""
+
+    def __init__(self, model: str, latency_window: int = 100):
+        self.model = model
+        self.status = UNKNOWN
+        self.unavailable_until = 0.0
+        self.circuit = CLOSED
+        self.circuit_opened_at = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.latency_ewma: Optional[float] = None
+        self.latencies: deque[float] = deque(maxlen=latency_window)
+
+    def latency_percentile(self, q: float) -> float:
+        return _percentile(sorted(self.latencies), q)
+
+    def to_dict(self) -> dict[str, Any]:
+        calls = self.successes + self.failures
+        latencies = sorted(self.latencies)
+        return {
+            "model": self.model,
+            "status": self.status,
+            "circuit": self.circuit,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": round(self.failures / calls, 4) if calls else 0.0,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "latency_p50_ms": round(_percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+            "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+            "last_error": self.last_error,
+        }
+
+
+class ModelRouter:
+    """
+    Orders models for each call: healthy models in preference order first, models
+    with an open circuit last (as a last resort), and models that 404'd for our key
+    skipped until unavailable_recheck_seconds has passed.
+    """
+
+    def __init__(
+        self,
+        models: tuple[str, ...],
+        *,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        unavailable_recheck_seconds: float = 900.0,
+        ewma_alpha: float = 0.2,
+    ):
+        self.models = tuple(models)
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.unavailable_recheck_seconds = unavailable_recheck_seconds
+        self.ewma_alpha = ewma_alpha
+        self._health = {m: ModelHealth(m) for m in self.models}
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list[str]:
+        """Models to try for the next call, best first."""
+        now = time.monotonic()
+        healthy: list[str] = []
+        tripped: list[str] = []
+        with self._lock:
+            for model in self.models:
+                h = self._health[model]
+                if h.status == UNAVAILABLE:
+                    if now < h.unavailable_until:
+                        continue
+                    h.status = UNKNOWN  # re-probe once the recheck window has passed
+                if h.circuit == OPEN and now - h.circuit_opened_at >= self.open_seconds:
+                    # Cooldown over: trial calls go through; one failure re-opens the circuit
+                    h.circuit = HALF_OPEN
+                if h.circuit == OPEN:
+                    tripped.append(model)
+                    continue
+                healthy.append(model)
+        # Every model 404'd recently: probe them all again rather than failing outright
+        return healthy + tripped or list(self.models)
+
+    def best(self) -> Optional[str]:
+        candidates = self.candidates()
+        return candidates[0] if candidates else None
+
+    def record_success(self, model: str, latency_s: float) -> None:
+        with self._lock:
+            h = self._health.get(model)
+            if h is None:
+                return
+            h.status = AVAILABLE
+            h.successes += 1
+            h.consecutive_failures = 0
+            h.circuit = CLOSED
+            h.latencies.append(latency_s)
+            if h.latency_ewma is None:
+                h.latency_ewma = latency_s
+            else:
+                h.latency_ewma += self.ewma_alpha * (latency_s - h.latency_ewma)
+
+    def record_failure(self, model: str, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            h = self._health.get(model)
+            if h is None:
+                return
+            h.failures += 1
+            h.consecutive_failures += 1
+            h.last_error = str(error)[:200] if error is not None else None
+            if h.circuit == HALF_OPEN or h.consecutive_failures >= self.failure_threshold:
+                h.circuit = OPEN
+                h.circuit_opened_at = time.monotonic()
+
+    def record_unavailable(self, model: str, error: Optional[BaseException] = None) -> None:
+        """Model does not exist for this key (404): skip it until the recheck window passes."""
+        with self._lock:
+            h = self._health.get(model)
+            if h is None:
+                return
+            h.status = UNAVAILABLE
+            h.unavailable_until = time.monotonic() + self.unavailable_recheck_seconds
+            h.last_error = str(error)[:200] if error is not None else None
+
+    def latency_percentile(self, model: str, q: float) -> Optional[float]:
+        """Observed latency quantile for a model in seconds (None until it has samples)."""
+        with self._lock:
+            h = self._health.get(model)
+            if h is None or not h.latencies:
+                return None
+            return h.latency_percentile(q)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Router state for inspection (/api/models)."""
+        candidates = self.candidates()
+        with self._lock:
+            return {
+                "preferred": candidates[0] if candidates else None,
+                "order": candidates,
+                "models": [self._health[m].to_dict() for m in self.models],
+            }
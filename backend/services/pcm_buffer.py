@@ -0,0 +1,101 @@
+"""
+Preallocated ring buffer that regroups client PCM fragments into fixed-size frames.
+Browsers deliver audio in whatever sizes their recorder produces; /ws/translate writes
+each fragment straight into the ring (memoryview slice assignment, no concatenation)
+and only whole frames of AUDIO_FRAME_MS go on to audio_in: tiny fragments are held
+until a frame is complete, and when several frames are ready they leave as one
+frame-aligned payload. Gemini Live then gets at most one send per fragment and per
+frame, whichever is fewer.
+"""
+from typing import Any
+
+
+class PcmFrameBuffer:
+    """
+    Byte ring of `capacity_frames` frames. If the reader falls behind by more than the
+    capacity, the oldest whole frames are overwritten (counted in frames_dropped).
+    """
+
+    def __init__(self, frame_bytes: int, capacity_frames: int = 16):
+        self.frame_bytes = max(2, frame_bytes - frame_bytes % 2)
+        self.capacity = self.frame_bytes * max(2, capacity_frames)
+        self._buf = bytearray(self.capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0  # read position
+        self._size = 0  # buffered bytes
+        self.fragments = 0
+        self.bytes_in = 0
+        self.frames_out = 0
+        self.payloads = 0
+        self.frames_dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> None:
+        src = memoryview(data)
+        n = len(src)
+        self.fragments += 1
+        self.bytes_in += n
+        if n >= self.capacity:
+            # A fragment bigger than the whole ring: keep only its newest whole frames
+            keep = self.capacity - self.capacity % self.frame_bytes
+            self.frames_dropped += (self._size + n - keep) // self.frame_bytes
+            src = src[n - keep:]
+            n = keep
+            self._start = self._size = 0
+        overflow = self._size + n - self.capacity
+        if overflow > 0:
+            # Drop whole frames from the front so the remaining stream stays frame-aligned
+            drop = -(-overflow // self.frame_bytes) * self.frame_bytes
+            drop = min(drop, self._size)
+            self._start = (self._start + drop) % self.capacity
+            self._size -= drop
+            self.frames_dropped += drop // self.frame_bytes
+        end = (self._start + self._size) % self.capacity
+        first = min(n, self.capacity - end)
+        self._view[end:end + first] = src[:first]
+        if first < n:
+            self._view[:n - first] = src[first:]
+        self._size += n
+        self.high_water = max(self.high_water, self._size)
+
+    def _read(self, n: int) -> bytes:
+        start = self._start
+        first = min(n, self.capacity - start)
+        if first == n:
+            out = bytes(self._view[start:start + n])
+        else:
+            out = b"".join((self._view[start:], self._view[:n - first]))
+        self._start = (start + n) % self.capacity
+        self._size -= n
+        return out
+
+    def take(self) -> bytes:
+        """All complete frames buffered now as one payload (a whole number of frames), or b""."""
+        frames = self._size // self.frame_bytes
+        if not frames:
+            return b""
+        self.frames_out += frames
+        self.payloads += 1
+        return self._read(frames * self.frame_bytes)
+
+    def flush(self) -> bytes:
+        """Whatever is left (a partial frame, trimmed to whole samples), e.g. when the client disconnects."""
+        n = self._size - self._size % 2
+        out = self._read(n) if n else b""
+        self._start = self._size = 0
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "frame_bytes": self.frame_bytes,
+            "fragments": self.fragments,
+            "frames_out": self.frames_out,
+            "payloads": self.payloads,
+            "frames_dropped": self.frames_dropped,
+            "buffered_bytes": self._size,
+            "high_water_bytes": self.high_water,
+            "fragments_per_payload": round(self.fragments / self.payloads, 2) if self.payloads else None,
+        }
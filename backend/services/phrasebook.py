@@ -0,0 +1,442 @@
+"""
+Offline regional phrasebook answered in front of the suggestion model.
+A small set of utterances (greetings, ordering, prices, directions) makes up much of
+what locals say to a traveller. The build step (python -m backend.services.phrasebook)
+pre-generates the translation, suggested reply and phonetic for every seed phrase per
+region, slang level and personality, and writes them to one file that is memory-mapped
+at runtime: only the folded phrase keys and their trigram postings live in memory,
+answers are decoded from the map on a hit. Lookups fold the utterance like the goodbye
+detector, try an exact match, then trigram candidates confirmed by edit distance.
+"""
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, NamedTuple, Optional, Sequence
+
+from backend.config import get_settings
+from backend.models.schemas import (
+    LocationOption,
+    OnboardingAnswers,
+    PERSONALITY_OPTIONS,
+    SLANG_OPTIONS,
+    UserContext,
+)
+from backend.services.end_phrase import fold_text, language_key
+from backend.services.gemini_client import aclose_client, suggest_response_async
+
+# What a local is likely to say to a traveller (written unfolded; sent as-is to the model).
+SEED_PHRASES = {
+    "fr": (
+        # Greetings
+        "Bonjour", "Bonsoir", "Salut", "Bonjour, comment allez-vous ?", "Ça va ?", "Enchanté",
+        "Bienvenue", "Bonjour, je peux vous aider ?", "Pardon ?", "De rien",
+        # Ordering
+        "Qu'est-ce que je vous sers ?", "Vous désirez ?", "Qu'est-ce que vous voulez boire ?",
+        "Vous avez choisi ?", "Sur place ou à emporter ?", "Autre chose ?", "Ce sera tout ?",
+        "Vous avez réservé ?", "Vous êtes combien ?", "Ça vous a plu ?",
+        # Prices
+        "Je vous dois combien ?", "Vous payez comment ?", "Par carte ou en espèces ?",
+        "Vous voulez l'addition ?", "Vous voulez un sac ?", "Vous voulez le ticket ?",
+        # Directions
+        "Vous cherchez quelque chose ?", "Vous êtes perdu ?", "C'est tout droit", "C'est à gauche",
+        "C'est à droite", "C'est juste à côté", "C'est à deux minutes à pied", "Prenez le métro",
+        # Small talk
+        "Vous venez d'où ?", "Vous êtes ici en vacances ?", "Vous parlez français ?",
+        "Merci, bonne journée", "Au revoir",
+    ),
+    "ar": (
+        # Greetings (Latin / Arabizi, then Arabic script)
+        "Salam", "Salam alikoum", "Labas ?", "Kidayr ?", "Mrehba bik", "Ahlan", "Bslama",
+        "السلام عليكم", "لاباس؟", "مرحبا بيك", "بسلامة",
+        # Ordering
+        "Ach bghiti ?", "Chno bghiti tchrob ?", "Bghiti chi haja khra ?", "Safi ?", "Wach hadi ?",
+        "اش بغيتي؟", "شنو بغيتي تشرب؟",
+        # Prices
+        "Chhal bghiti tkhelles ?", "Hadi ghalya chwiya", "Nkhelles b la carte ?", "Ghir chwiya",
+        "شحال؟",
+        # Directions
+        "Fin ghadi ?", "Sir nichan", "Dour 3la limen", "Dour 3la liser", "Qrib mn hna",
+        "B3id chwiya", "فين غادي؟",
+        # Small talk
+        "Mnin nta ?", "Wach katdwi darija ?", "Awal mra f lmaghrib ?", "Baraka lahu fik",
+    ),
+    "bg": (
+        # Greetings
+        "Здравейте", "Здрасти", "Добър ден", "Добър вечер", "Как сте?", "Добре дошли",
+        "Мога ли да помогна?", "Моля?", "Няма защо",
+        # Ordering
+        "Какво ще желаете?", "Какво ще пиете?", "Избрахте ли?", "Нещо друго?",
+        "Това ли е всичко?", "За тук или за вкъщи?", "Имате ли резервация?", "Колко души сте?",
+        # Prices
+        "В брой или с карта?", "Сметката ли искате?", "Искате ли торбичка?", "Искате ли касова бележка?",
+        # Directions
+        "Търсите ли нещо?", "Изгубихте ли се?", "Направо", "Наляво", "Надясно", "Съвсем наблизо е",
+        "На пет минути пеша", "Хванете метрото",
+        # Small talk
+        "Откъде сте?", "Първи път ли сте в България?", "Говорите ли български?",
+        "Приятен ден", "Довиждане",
+    ),
+}
+
+# Region -> target language name, as set on the UserContext at onboarding
+REGION_LANGUAGES = {
+    "Paris": "French",
+    "London": "French",
+    "Morocco": "Moroccan Darija (Arabic)",
+    "Bulgaria": "Bulgarian",
+}
+
+_MAGIC = b"PBK1"
+_HEADER = struct.Struct("<4sII")  # magic, directory length, rows
+_ROW = struct.Struct("<II")  # answer offset in the pool, length (0 = not built)
+_SEP = "\x1f"
+_MIN_FUZZY_CHARS = 5  # shorter utterances only match exactly ("oui" is one edit from "qui")
+_MIN_DICE = 0.4
+_FUZZY_CANDIDATES = 3
+
+
+def group_key(region: str, slang_level: str, personality: str) -> str:
+    return _SEP.join(p.strip().casefold() for p in (region, slang_level, personality))
+
+
+def _trigrams(folded: str) -> set[str]:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _numbers(folded: str) -> list[str]:
+    # Whole-number tokens only: Arabizi digits inside words ("3la") are letters
+    return [t for t in folded.split() if t.isdigit()]
+
+
+def _edit_similarity(a: str, b: str, min_similarity: float = 0.0) -> float:
+    """1 - Levenshtein distance / longer length (0.0 as soon as min_similarity is out of reach)."""
+    if a == b:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    budget = int((1.0 - min_similarity) * len(a))
+    if len(a) - len(b) > budget:
+        return 0.0
+    # Only cells within `budget` of the diagonal can stay under budget (Ukkonen band)
+    big = budget + 1
+    previous = [j if j <= budget else big for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        lo, hi = max(1, i - budget), min(len(b), i + budget)
+        current = [big] * (len(b) + 1)
+        current[0] = i if i <= budget else big
+        for j in range(lo, hi + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != b[j - 1]))
+        if min(current[lo - 1:hi + 1]) > budget:
+            return 0.0
+        previous = current
+    return 1.0 - min(previous[-1], big) / len(a)
+
+
+class PhraseMatch(NamedTuple):
+    phrase: str  # folded phrasebook key that matched
+    similarity: float  # 1.0 for an exact match
+    english_translation: str
+    suggested_english: str
+    suggested_local: str
+    suggested_phonetic: str
+
+
+class _LanguageIndex:
+    """Folded phrase keys of one language: exact dict plus trigram postings for fuzzy matches."""
+
+    __slots__ = ("phrases", "exact", "grams", "postings")
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases = list(phrases)
+        self.exact = {p: i for i, p in enumerate(self.phrases)}
+        self.grams = [_trigrams(p) for p in self.phrases]
+        self.postings: dict[str, list[int]] = {}
+        for i, grams in enumerate(self.grams):
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def match(self, folded: str, min_similarity: float) -> Optional[tuple[int, float]]:
+        i = self.exact.get(folded)
+        if i is not None:
+            return i, 1.0
+        if len(folded) < _MIN_FUZZY_CHARS:
+            return None
+        grams = _trigrams(folded)
+        overlap: dict[int, int] = {}
+        for gram in grams:
+            for i in self.postings.get(gram, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+        # Trigram Dice prunes to a few candidates; edit distance decides
+        scored = sorted(
+            ((2 * n / (len(grams) + len(self.grams[i])), i) for i, n in overlap.items()), reverse=True
+        )[:_FUZZY_CANDIDATES]
+        numbers = _numbers(folded)
+        best: Optional[tuple[int, float]] = None
+        for dice, i in scored:
+            if dice < _MIN_DICE:
+                break
+            phrase = self.phrases[i]
+            if _numbers(phrase) != numbers:
+                continue  # never answer "2 cafés" with the reply built for "1 café"
+            similarity = _edit_similarity(folded, phrase, min_similarity)
+            if similarity >= min_similarity and (best is None or similarity > best[1]):
+                best = (i, similarity)
+        return best
+
+
+class Phrasebook:
+    """
+    Read-only view of a built index file. Layout: header (magic, directory length, rows),
+    JSON directory (phrase keys per language, first row of each group), the row table of
+    (offset, length) pairs, then the UTF-8 pool of answers. Row = group's first row + phrase position.
+    """
+
+    def __init__(self, path: str, min_similarity: float = 0.85):
+        self.path = path
+        self.min_similarity = min_similarity
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, dir_len, rows = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a phrasebook index")
+        directory = json.loads(self._map[_HEADER.size:_HEADER.size + dir_len])
+        self.meta: dict[str, Any] = directory["meta"]
+        self._table_offset = _HEADER.size + dir_len
+        self._pool_offset = self._table_offset + rows * _ROW.size
+        self._languages = {lang: _LanguageIndex(p) for lang, p in directory["languages"].items()}
+        self._groups: dict[str, tuple[str, int]] = {k: (v[0], v[1]) for k, v in directory["groups"].items()}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def find(
+        self, utterance: str, local_language: str, region: str, slang_level: str, personality: str
+    ) -> Optional[PhraseMatch]:
+        group = self._groups.get(group_key(region, slang_level, personality))
+        lang = language_key(local_language)
+        index = self._languages.get(lang) if group is not None and group[0] == lang else None
+        match = index.match(fold_text(utterance), self.min_similarity) if index is not None else None
+        answer = self._answer(group[1] + match[0]) if match is not None else None
+        with self._lock:
+            if answer is None:
+                self.misses += 1
+            elif match[1] == 1.0:
+                self.exact_hits += 1
+            else:
+                self.fuzzy_hits += 1
+        if answer is None:
+            return None
+        return PhraseMatch(index.phrases[match[0]], match[1], *answer)
+
+    def lookup(self, utterance: str, user_context: UserContext) -> Optional[PhraseMatch]:
+        """Pre-built answer for this utterance in the session's region / slang / personality, if confident."""
+        ob = user_context.onboarding
+        return self.find(
+            utterance, user_context.target_language, user_context.target_region, ob.slang_level, ob.personality
+        )
+
+    def _answer(self, row: int) -> Optional[list[str]]:
+        offset, length = _ROW.unpack_from(self._map, self._table_offset + row * _ROW.size)
+        if not length:
+            return None
+        start = self._pool_offset + offset
+        return self._map[start:start + length].decode("utf-8").split(_SEP)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.exact_hits + self.fuzzy_hits + self.misses
+        return {
+            "enabled": True,
+            "path": self.path,
+            "bytes": len(self._map),
+            "phrases": {lang: len(index.phrases) for lang, index in self._languages.items()},
+            "groups": len(self._groups),
+            "built_at": self.meta.get("built_at"),
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.fuzzy_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def folded_phrases(phrases: Sequence[str]) -> list[tuple[str, str]]:
+    """(folded key, original) per distinct key, in seed order."""
+    seen: dict[str, str] = {}
+    for phrase in phrases:
+        key = fold_text(phrase)
+        if key and key not in seen:
+            seen[key] = phrase
+    return list(seen.items())
+
+
+def write_index(
+    path: str,
+    languages: dict[str, list[str]],
+    groups: dict[str, tuple[str, list[Optional[Sequence[str]]]]],
+    meta: Optional[dict[str, Any]] = None,
+) -> int:
+    """
+    Write an index file atomically and return its size. languages: folded keys per language;
+    groups: group_key -> (language, answers aligned with that language's keys, None = missing),
+    each answer being (english_translation, suggested_english, suggested_local, suggested_phonetic).
+    """
+    pool = bytearray()
+    pooled: dict[bytes, int] = {}
+    rows: list[tuple[int, int]] = []
+    directory_groups: dict[str, list[Any]] = {}
+    for key, (lang, answers) in groups.items():
+        if len(answers) != len(languages[lang]):
+            raise ValueError(f"group {key!r} has {len(answers)} answers for {len(languages[lang])} phrases")
+        directory_groups[key] = [lang, len(rows)]
+        for answer in answers:
+            if answer is None:
+                rows.append((0, 0))
+                continue
+            data = _SEP.join(s.replace(_SEP, " ") for s in answer).encode("utf-8")
+            offset = pooled.get(data)
+            if offset is None:
+                offset = pooled[data] = len(pool)
+                pool += data
+            rows.append((offset, len(data)))
+
+    directory = {"meta": meta or {}, "languages": languages, "groups": directory_groups}
+    encoded = json.dumps(directory, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(encoded), len(rows)))
+        f.write(encoded)
+        for offset, length in rows:
+            f.write(_ROW.pack(offset, length))
+        f.write(pool)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+async def build_phrasebook(
+    path: str,
+    regions: Sequence[str] = tuple(REGION_LANGUAGES),
+    slang_levels: Sequence[str] = tuple(SLANG_OPTIONS),
+    personalities: Sequence[str] = tuple(PERSONALITY_OPTIONS),
+    occasion: str = "Holiday",
+    pronunciation_difficulty: str = "Medium",
+    max_concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    One suggestion call per (region, slang level, personality, seed phrase), through the
+    normal suggest_response_async path (response cache, model router, GEMINI_FAKE).
+    Occasion, profession and hobbies are fixed: these answers are deliberately generic.
+    Failed calls leave the row empty (served by the model at runtime).
+    """
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    phrases: dict[str, list[tuple[str, str]]] = {}
+    jobs: list[tuple[str, str, UserContext]] = []
+    for region in regions:
+        local_language = REGION_LANGUAGES[region]
+        lang = language_key(local_language)
+        phrases.setdefault(lang, folded_phrases(SEED_PHRASES[lang]))
+        for slang_level in slang_levels:
+            for personality in personalities:
+                context = UserContext(
+                    onboarding=OnboardingAnswers(
+                        location=LocationOption(region.lower()),
+                        personality=personality,
+                        occasion=occasion,
+                        pronunciation_difficulty=pronunciation_difficulty,
+                        slang_level=slang_level,
+                        profession="",
+                        hobbies="",
+                    ),
+                    target_language=local_language,
+                    target_region=region,
+                )
+                jobs.append((group_key(region, slang_level, personality), lang, context))
+
+    async def answer(context: UserContext, phrase: str) -> Optional[tuple[str, str, str, str]]:
+        async with semaphore:
+            try:
+                english_translation, suggested = await suggest_response_async(context, phrase)
+            except Exception:
+                return None
+        return english_translation, suggested.english, suggested.local, suggested.phonetic
+
+    groups: dict[str, tuple[str, list[Optional[Sequence[str]]]]] = {}
+    for key, lang, context in jobs:
+        answers = await asyncio.gather(*(answer(context, original) for _, original in phrases[lang]))
+        groups[key] = (lang, list(answers))
+    await aclose_client()
+
+    meta = {
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "occasion": occasion,
+        "pronunciation_difficulty": pronunciation_difficulty,
+    }
+    size = write_index(path, {lang: [k for k, _ in p] for lang, p in phrases.items()}, groups, meta)
+    failed = sum(1 for _, answers in groups.values() for a in answers if a is None)
+    return {
+        "path": path,
+        "bytes": size,
+        "groups": len(groups),
+        "phrases": {lang: len(p) for lang, p in phrases.items()},
+        "calls": sum(len(answers) for _, answers in groups.values()),
+        "failed": failed,
+        "elapsed_s": round(time.perf_counter() - start, 1),
+    }
+
+
+_phrasebook: Optional[Phrasebook] = None
+_phrasebook_loaded = False
+_phrasebook_lock = threading.Lock()
+
+
+def get_phrasebook() -> Optional[Phrasebook]:
+    """Process-wide index from PHRASEBOOK_PATH (None when unset or the file is missing)."""
+    global _phrasebook, _phrasebook_loaded
+    if not _phrasebook_loaded:
+        with _phrasebook_lock:
+            if not _phrasebook_loaded:
+                settings = get_settings()
+                if settings.phrasebook_path and os.path.exists(settings.phrasebook_path):
+                    _phrasebook = Phrasebook(settings.phrasebook_path, settings.phrasebook_min_similarity)
+                _phrasebook_loaded = True
+    return _phrasebook
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the offline phrasebook index (one Gemini call per phrase and group).")
+    parser.add_argument("--out", default=get_settings().phrasebook_path or "phrasebook.idx")
+    parser.add_argument("--region", action="append", choices=sorted(REGION_LANGUAGES), help="repeatable; default all")
+    parser.add_argument("--slang", action="append", choices=SLANG_OPTIONS, help="repeatable; default all")
+    parser.add_argument("--personality", action="append", choices=PERSONALITY_OPTIONS, help="repeatable; default all")
+    parser.add_argument("--occasion", default="Holiday")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    result = asyncio.run(build_phrasebook(
+        args.out,
+        regions=args.region or tuple(REGION_LANGUAGES),
+        slang_levels=args.slang or tuple(SLANG_OPTIONS),
+        personalities=args.personality or tuple(PERSONALITY_OPTIONS),
+        occasion=args.occasion,
+        max_concurrency=args.concurrency,
+    ))
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:12} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-session compiled prompt prefix for suggest_response.
+The profile/instruction part of the suggestion prompt never changes within a session,
+so it is rendered once and sent as the request's system_instruction; each turn only
+sends the delta (what the other person said + conversation memory). When the prefix is
+large enough for Gemini explicit context caching (PROMPT_CACHE_MIN_TOKENS), it is
+uploaded once per model with client.caches.create and later turns reference the
+cached-content handle instead of resending it.
+"""
+import threading
+import time
+from typing import Any, Optional
+
+from google.genai import types
+
+from backend.services.conversation_memory import estimate_tokens
+
+# Recreate a cached content this long before its server-side TTL runs out
+_REFRESH_MARGIN_SECONDS = 60.0
+
+
+class SessionPrompt:
+    """Static system prefix for one session plus its cached-content handles (one per model)."""
+
+    def __init__(
+        self,
+        system_instruction: str,
+        *,
+        cache_enabled: bool = True,
+        cache_min_tokens: int = 1024,
+        cache_ttl_seconds: float = 3600.0,
+    ):
+        self.system_instruction = system_instruction
+        self.tokens = estimate_tokens(system_instruction)
+        self.cache_ttl_seconds = max(60.0, cache_ttl_seconds)
+        self.cacheable = cache_enabled and self.tokens >= cache_min_tokens
+        # model -> (cached content name, monotonic expiry)
+        self._cached: dict[str, tuple[str, float]] = {}
+        # models we already tried (or are trying) to cache; failures are not retried
+        self._attempted: set[str] = set()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+
+    # --- request config ---------------------------------------------------
+
+    def config(self, model: str) -> types.GenerateContentConfig:
+        """JSON config for one turn: cached-content handle when we have a fresh one, else system_instruction."""
+        name = self.cached_name(model)
+        if name is not None:
+            self.cache_hits += 1
+            return types.GenerateContentConfig(cached_content=name, response_mime_type="application/json")
+        return types.GenerateContentConfig(
+            system_instruction=self.system_instruction, response_mime_type="application/json"
+        )
+
+    def cached_name(self, model: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cached.get(model)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1] - _REFRESH_MARGIN_SECONDS:
+                del self._cached[model]
+                self._attempted.discard(model)
+                return None
+            return entry[0]
+
+    def forget(self, model: str) -> None:
+        """Drop a handle the API rejected (expired or deleted); the session falls back to system_instruction."""
+        with self._lock:
+            self._cached.pop(model, None)
+            self._attempted.add(model)
+
+    # --- explicit cache lifecycle ----------------------------------------
+
+    def _claim(self, model: str) -> bool:
+        if not self.cacheable:
+            return False
+        with self._lock:
+            if model in self._attempted:
+                return False
+            self._attempted.add(model)
+            return True
+
+    def _create_config(self) -> types.CreateCachedContentConfig:
+        return types.CreateCachedContentConfig(
+            system_instruction=self.system_instruction,
+            ttl=f"{int(self.cache_ttl_seconds)}s",
+        )
+
+    def _store(self, model: str, cached: Any) -> None:
+        name = getattr(cached, "name", None)
+        if name:
+            with self._lock:
+                self._cached[model] = (name, time.monotonic() + self.cache_ttl_seconds)
+
+    def ensure_cached(self, client: Any, model: str) -> None:
+        """Upload the prefix for `model` once, if it is large enough; failures keep system_instruction."""
+        if not self._claim(model):
+            return
+        try:
+            self._store(model, client.caches.create(model=model, config=self._create_config()))
+        except Exception:
+            pass
+
+    async def ensure_cached_async(self, client: Any, model: str) -> None:
+        if not self._claim(model):
+            return
+        try:
+            self._store(model, await client.aio.caches.create(model=model, config=self._create_config()))
+        except Exception:
+            pass
+
+    def release(self, client: Any) -> None:
+        """Delete this session's cached contents (best effort; they also expire by TTL)."""
+        with self._lock:
+            names = [name for name, _ in self._cached.values()]
+            self._cached.clear()
+        for name in names:
+            try:
+                client.caches.delete(name=name)
+            except Exception:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            cached_models = sorted(self._cached)
+        return {
+            "prefix_tokens": self.tokens,
+            "cacheable": self.cacheable,
+            "cached_models": cached_models,
+            "cache_hits": self.cache_hits,
+        }
@@ -0,0 +1,229 @@
+"""
+Bounded LRU+TTL cache for Gemini text responses (suggestions, translations, phonetics).
+Keys are the normalised utterance plus a fingerprint of the context fields that change
+the output; an optional SQLite file tier keeps entries across restarts. Lookups only
+touch memory (the file is loaded at start-up); writes reach the file from a background
+thread that batches commits, so the async request paths never block on SQLite.
+"""
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+from backend.config import get_settings
+from backend.models.schemas import UserContext
+
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'"})
+_QUESTION_MARKS = "?？؟"
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    Case-fold, unify apostrophes, drop punctuation (except ' and -) and collapse whitespace.
+    A sentence-final question mark is kept: "Vous payez comment ?" and "Vous payez
+    comment." need different replies.
+    """
+    t = unicodedata.normalize("NFKC", text or "").translate(_APOSTROPHES).casefold()
+    tail = t.rstrip()
+    while tail and unicodedata.category(tail[-1]).startswith("P") and tail[-1] not in _QUESTION_MARKS:
+        tail = tail[:-1].rstrip()  # closing quotes / "!" after the "?"
+    question = bool(tail) and tail[-1] in _QUESTION_MARKS
+    t = "".join(
+        " " if unicodedata.category(ch).startswith("P") and ch not in "'-" else ch
+        for ch in t
+    )
+    t = " ".join(t.split())
+    return f"{t} ?" if question and t else t
+
+
+def context_fingerprint(user_context: UserContext) -> str:
+    """Fingerprint of the UserContext fields that affect suggestion output."""
+    ob = user_context.onboarding
+    parts = (
+        user_context.target_language,
+        user_context.target_region,
+        ob.slang_level,
+        ob.personality,
+        ob.occasion,
+    )
+    return hashlib.sha1("\x1f".join(p.strip().casefold() for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(kind: str, utterance: str, fingerprint: str) -> str:
+    raw = f"{kind}\x1f{fingerprint}\x1f{normalize_utterance(utterance)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+_CLEAR = object()  # writer-queue marker: empty the table
+
+
+class ResponseCache:
+    """
+    In-memory LRU with per-entry TTL, optionally backed by a SQLite file.
+    Values must be JSON-serialisable. Thread-safe (sync handlers run in the threadpool).
+    get() and set() never do disk I/O: the freshest max_entries rows are loaded when the
+    cache is created, and set() queues the row for the writer thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 21600.0,
+        disk_path: Optional[str] = None,
+        write_batch: int = 256,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.write_batch = max(1, write_batch)
+        # key -> (expires_at, value, loaded from disk)
+        self._entries: OrderedDict[str, tuple[float, Any, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            now = time.time()
+            self._db.execute("DELETE FROM response_cache WHERE expires_at < ?", (now,))
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT key, value, expires_at FROM response_cache ORDER BY expires_at DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+            for key, value, expires_at in reversed(rows):  # freshest end up most recently used
+                self._entries[key] = (expires_at, json.loads(value), True)
+            self._writer = threading.Thread(target=self._write_loop, name="response-cache-writer", daemon=True)
+            self._writer.start()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] >= now:
+                    self._entries.move_to_end(key)
+                    if entry[2]:
+                        self.disk_hits += 1
+                    else:
+                        self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, expires_at, value)
+        if self._writer is not None:
+            self._writes.put((key, json.dumps(value), expires_at))
+
+    def _store(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value, False)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _write_loop(self) -> None:
+        """Writer thread: drain queued rows and commit them together; None stops it."""
+        while True:
+            item = self._writes.get()
+            batch = [item]
+            while item is not None and len(batch) < self.write_batch:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            rows = []
+            for entry in batch:
+                if entry is None or entry is _CLEAR:
+                    self._write_rows(rows)
+                    rows = []
+                    if entry is _CLEAR:
+                        self._db.execute("DELETE FROM response_cache")
+                        self._db.commit()
+                    else:
+                        return
+                else:
+                    rows.append(entry)
+            self._write_rows(rows)
+
+    def _write_rows(self, rows: list[tuple[str, str, float]]) -> None:
+        if not rows:
+            return
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+            self.disk_writes += len(rows)
+        except sqlite3.Error:
+            pass  # the memory tier still has them; the file is only a warm start
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._writer is not None:
+            self._writes.put(_CLEAR)
+
+    def close(self) -> None:
+        """Flush queued writes and close the file (no-op without a disk tier)."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        self._writer = None
+        self._db.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_tier": self._db is not None,
+                "disk_writes": self.disk_writes,
+                "disk_write_queue": self._writes.qsize(),
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache, or None when RESPONSE_CACHE_ENABLED is false."""
+    global _cache
+    settings = get_settings()
+    if not settings.response_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    max_entries=settings.response_cache_max_entries,
+                    ttl_seconds=settings.response_cache_ttl_seconds,
+                    disk_path=settings.response_cache_path,
+                )
+    return _cache
@@ -0,0 +1,426 @@
+"""
+Session stores for the REST flow (onboarding -> conversation).
+SessionStore is the interface the handlers use; InMemorySessionStore evicts idle
+sessions (TTL) and least-recently-used sessions beyond an entry or byte budget,
+SQLiteSessionStore does the same on disk so sessions survive restarts and can be
+shared by several workers. Handlers must call set() after mutating a session, or use
+update() for a read-modify-write that cannot lose a concurrent write; async handlers
+use the *_async variants, which keep SQLite I/O off the event loop.
+Eviction listeners are told about every session dropped by TTL, LRU or delete(), so
+per-session caches kept outside the store can be released.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def _encode(data: dict[str, Any]) -> str:
+    return json.dumps(data, default=str, separators=(",", ":"))
+
+
+def _estimate_size(value: Any) -> int:
+    """Rough encoded size without encoding: string lengths plus a little punctuation per item."""
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return 2 + sum(len(str(k)) + 4 + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(_estimate_size(v) + 1 for v in value)
+    return 8  # numbers, booleans, None
+
+
+def _fingerprint(value: Any) -> tuple:
+    # Appending to or sliding a history window changes its length or its end items
+    if isinstance(value, list) and value:
+        return id(value), len(value), id(value[0]), id(value[-1])
+    return id(value), len(value)
+
+
+def _measure(data: dict[str, Any], cached: dict[str, tuple]) -> tuple[int, dict[str, tuple]]:
+    """Approximate size of a session, re-measuring only the top-level containers that changed."""
+    sizes = {}
+    total = 2
+    for key, value in data.items():
+        if isinstance(value, (list, dict)):
+            fingerprint = _fingerprint(value)
+            hit = cached.get(key)
+            size = hit[1] if hit is not None and hit[0] == fingerprint else _estimate_size(value)
+            sizes[key] = (fingerprint, size)
+        else:
+            size = _estimate_size(value)
+        total += len(key) + 4 + size
+    return total, sizes
+
+
+class SessionStore(ABC):
+    """Idle TTL + LRU budget session store. Counters are exposed by stats()."""
+
+    def __init__(self, idle_ttl_seconds: float = 3600.0, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str], None]] = []
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """listener(session_id) runs after a session is evicted or deleted (outside the store lock)."""
+        self._listeners.append(listener)
+
+    def _notify(self, session_ids: list[str]) -> None:
+        for session_id in session_ids:
+            for listener in self._listeners:
+                try:
+                    listener(session_id)
+                except Exception:
+                    pass
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        """Session data (refreshes its idle timer), or None if missing/expired."""
+
+    @abstractmethod
+    def set(self, session_id: str, data: dict[str, Any]) -> None:
+        """Insert or replace a session, then evict LRU sessions beyond the budget."""
+
+    @abstractmethod
+    def update(self, session_id: str, mutate: Callable[[dict[str, Any]], None]) -> Optional[dict[str, Any]]:
+        """mutate(data) on the current session and store it, atomically; None if missing/expired."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    async def get_async(self, session_id: str) -> Optional[dict[str, Any]]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def set_async(self, session_id: str, data: dict[str, Any]) -> None:
+        await asyncio.to_thread(self.set, session_id, data)
+
+    async def update_async(
+        self, session_id: str, mutate: Callable[[dict[str, Any]], None]
+    ) -> Optional[dict[str, Any]]:
+        return await asyncio.to_thread(self.update, session_id, mutate)
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop sessions idle for longer than the TTL; returns how many were evicted."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def occupancy(self) -> tuple[int, int]:
+        """(sessions, approximate bytes)."""
+
+    def close(self) -> None:
+        pass
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def stats(self) -> dict[str, Any]:
+        entries, nbytes = self.occupancy()
+        return {
+            "backend": type(self).__name__,
+            "sessions": entries,
+            "bytes": nbytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_lru": self.evicted_lru,
+        }
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    OrderedDict in LRU order; get() returns the live dict. Sizes are estimates kept per
+    top-level value, so set() after appending one turn does not re-measure the session.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        # session_id -> [data, last_access, size_bytes, per-key sizes]
+        self._entries: OrderedDict[str, list[Any]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            expired = now - entry[1] > self.idle_ttl_seconds
+            if expired:
+                self._remove(session_id)
+                self.evicted_ttl += 1
+            else:
+                entry[1] = now
+                self._entries.move_to_end(session_id)
+                return entry[0]
+        self._notify([session_id])
+        return None
+
+    def set(self, session_id: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            evicted = self._write(session_id, data)
+        self._notify(evicted)
+
+    def update(self, session_id: str, mutate: Callable[[dict[str, Any]], None]) -> Optional[dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            expired = now - entry[1] > self.idle_ttl_seconds
+            if expired:
+                self._remove(session_id)
+                self.evicted_ttl += 1
+            else:
+                data = entry[0]
+                mutate(data)
+                evicted = self._write(session_id, data)
+        if expired:
+            self._notify([session_id])
+            return None
+        self._notify(evicted)
+        return data
+
+    def _write(self, session_id: str, data: dict[str, Any]) -> list[str]:
+        old = self._entries.pop(session_id, None)
+        if old is not None:
+            self._bytes -= old[2]
+        size, sizes = _measure(data, old[3] if old is not None else {})
+        self._entries[session_id] = [data, time.monotonic(), size, sizes]
+        self._bytes += size
+        evicted = []
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            evicted.append(oldest)
+            self.evicted_lru += 1
+        return evicted
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            if session_id not in self._entries:
+                return
+            self._remove(session_id)
+        self._notify([session_id])
+
+    # Dict operations only: cheaper inline than a hop to a worker thread
+    async def get_async(self, session_id: str) -> Optional[dict[str, Any]]:
+        return self.get(session_id)
+
+    async def set_async(self, session_id: str, data: dict[str, Any]) -> None:
+        self.set(session_id, data)
+
+    async def update_async(
+        self, session_id: str, mutate: Callable[[dict[str, Any]], None]
+    ) -> Optional[dict[str, Any]]:
+        return self.update(session_id, mutate)
+
+    def _remove(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id)
+        self._bytes -= entry[2]
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        evicted = []
+        with self._lock:
+            # LRU order: least recently used first, so stop at the first fresh entry
+            while self._entries:
+                session_id, entry = next(iter(self._entries.items()))
+                if entry[1] >= cutoff:
+                    break
+                self._remove(session_id)
+                evicted.append(session_id)
+            self.evicted_ttl += len(evicted)
+        self._notify(evicted)
+        return len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        self.clear()
+
+    def occupancy(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions as JSON rows; get() returns a fresh dict, so set() is required to persist changes.
+    Reads do not write: the access time is kept in memory and flushed in one batch by the
+    next write, sweep, or once touch_flush_seconds have passed (so other workers see a
+    read at most that late).
+    """
+
+    def __init__(self, path: str, touch_flush_seconds: float = 5.0, max_pending_touches: int = 256, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.path = path
+        self.touch_flush_seconds = touch_flush_seconds
+        self.max_pending_touches = max(1, max_pending_touches)
+        self._touched: dict[str, float] = {}  # session_id -> last read not yet written
+        self._touch_flushed = time.time()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)")
+        self._db.commit()
+
+    def _read(self, session_id: str, now: float) -> tuple[Optional[str], bool]:
+        """(encoded data, expired) under the lock; an expired row is deleted."""
+        row = self._db.execute("SELECT data, last_access FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            self._touched.pop(session_id, None)
+            return None, False
+        if now - max(row[1], self._touched.get(session_id, 0.0)) > self.idle_ttl_seconds:
+            self._touched.pop(session_id, None)
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+            self.evicted_ttl += 1
+            return None, True
+        return row[0], False
+
+    def _flush_touches(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                "UPDATE sessions SET last_access = MAX(last_access, ?) WHERE id = ?",
+                [(at, session_id) for session_id, at in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touch_flushed = time.time()
+
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            encoded, expired = self._read(session_id, now)
+            if encoded is not None:
+                self._touched[session_id] = now
+                if len(self._touched) >= self.max_pending_touches or now - self._touch_flushed >= self.touch_flush_seconds:
+                    self._flush_touches()
+                    self._db.commit()
+        if expired:
+            self._notify([session_id])
+        return json.loads(encoded) if encoded is not None else None
+
+    def set(self, session_id: str, data: dict[str, Any]) -> None:
+        encoded = _encode(data)
+        with self._lock:
+            evicted = self._write(session_id, encoded)
+        self._notify(evicted)
+
+    def update(self, session_id: str, mutate: Callable[[dict[str, Any]], None]) -> Optional[dict[str, Any]]:
+        evicted: list[str] = []
+        data = None
+        with self._lock:
+            encoded, expired = self._read(session_id, time.time())
+            if encoded is not None:
+                data = json.loads(encoded)
+                mutate(data)
+                evicted = self._write(session_id, _encode(data))
+        self._notify([session_id] if expired else evicted)
+        return data
+
+    def _write(self, session_id: str, encoded: str) -> list[str]:
+        self._touched.pop(session_id, None)
+        self._flush_touches()  # so LRU eviction sees recent reads
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions (id, data, last_access, size) VALUES (?, ?, ?, ?)",
+            (session_id, encoded, time.time(), len(encoded)),
+        )
+        evicted = []
+        entries, nbytes = self._occupancy()
+        while entries > 1 and (entries > self.max_entries or nbytes > self.max_bytes):
+            oldest = self._db.execute(
+                "SELECT id, size FROM sessions ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (oldest[0],))
+            evicted.append(oldest[0])
+            entries -= 1
+            nbytes -= oldest[1]
+            self.evicted_lru += 1
+        self._db.commit()
+        return evicted
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._touched.pop(session_id, None)
+            cur = self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+        if cur.rowcount:
+            self._notify([session_id])
+
+    def sweep(self) -> int:
+        cutoff = time.time() - self.idle_ttl_seconds
+        with self._lock:
+            self._flush_touches()
+            evicted = [
+                row[0] for row in self._db.execute("SELECT id FROM sessions WHERE last_access < ?", (cutoff,))
+            ]
+            self._db.execute("DELETE FROM sessions WHERE last_access < ?", (cutoff,))
+            self._db.commit()
+            self.evicted_ttl += len(evicted)
+        self._notify(evicted)
+        return len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._db.execute("DELETE FROM sessions")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touches()
+            self._db.commit()
+            self._db.close()
+
+    def _occupancy(self) -> tuple[int, int]:
+        row = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        return row[0], row[1]
+
+    def occupancy(self) -> tuple[int, int]:
+        with self._lock:
+            return self._occupancy()
+
+
+def create_session_store(settings: Any) -> SessionStore:
+    """Build the store selected by SESSION_STORE ("memory" or "sqlite")."""
+    kwargs = {
+        "idle_ttl_seconds": settings.session_idle_ttl_seconds,
+        "max_entries": settings.session_max_entries,
+        "max_bytes": settings.session_max_bytes,
+    }
+    backend = (settings.session_store or "memory").lower()
+    if backend == "sqlite":
+        return SQLiteSessionStore(settings.session_store_path, **kwargs)
+    if backend != "memory":
+        raise ValueError(f"Unknown SESSION_STORE {settings.session_store!r} (use 'memory' or 'sqlite')")
+    return InMemorySessionStore(**kwargs)
+
+
+async def run_sweeper(store: SessionStore, interval_seconds: float) -> None:
+    """Background task: evict idle sessions every interval (started from the app lifespan)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(store.sweep)
+        except Exception:
+            pass
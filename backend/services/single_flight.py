@@ -0,0 +1,114 @@
+"""
+Single-flight coalescing for identical in-flight model calls.
+While a call for a key is running, further callers with the same key wait for its
+result instead of sending their own request, so a burst of identical translations
+(a tour group in one café) costs one upstream call. Only in-flight calls are shared;
+finished results are the response cache's job. Sync (threadpool) and async callers
+share the same flights: both wait on one concurrent.futures.Future per key.
+"""
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """key -> in-flight Future, with per-kind counts of upstream calls and coalesced callers."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._counts: dict[str, list[int]] = {}  # kind -> [calls, coalesced]
+
+    def _count(self, kind: str, index: int) -> None:
+        counts = self._counts.setdefault(kind, [0, 0])
+        counts[index] += 1
+
+    def _join(self, kind: str, key: Hashable) -> tuple[Future, bool]:
+        """(future, leader): the leader must run the call and resolve the future."""
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self._count(kind, 1)
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            self._count(kind, 0)
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    def do(self, kind: str, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn() unless an identical call is in flight; then return (or raise) its outcome."""
+        while True:
+            future, leader = self._join(kind, key)
+            if not leader:
+                try:
+                    return future.result()
+                except CancelledError:
+                    continue  # the leader was cancelled, not us: try again
+            try:
+                result = fn()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                self._finish(key, future)
+            future.set_result(result)
+            return result
+
+    async def do_async(self, kind: str, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async twin of do(); a follower's own cancellation never cancels the shared call."""
+        while True:
+            future, leader = self._join(kind, key)
+            if not leader:
+                try:
+                    return await asyncio.shield(asyncio.wrap_future(future))
+                except asyncio.CancelledError:
+                    if future.cancelled():
+                        continue
+                    raise
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                self._finish(key, future)
+            future.set_result(result)
+            return result
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._flights)
+            counts = {kind: list(c) for kind, c in self._counts.items()}
+        calls = sum(c[0] for c in counts.values())
+        coalesced = sum(c[1] for c in counts.values())
+        return {
+            "in_flight": in_flight,
+            "upstream_calls": calls,
+            "coalesced": coalesced,
+            "coalesced_ratio": round(coalesced / (calls + coalesced), 4) if calls + coalesced else None,
+            "by_kind": {kind: {"upstream_calls": c[0], "coalesced": c[1]} for kind, c in counts.items()},
+        }
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,139 @@
+"""
+Single-pass text analysis for ValueTracker scoring.
+One Aho-Corasick automaton holds every idiom, slang marker and interaction-type keyword,
+so a text is scanned once and every match comes back with its category.
+Matching is substring-based on lower-cased text, like the original `phrase in text` checks.
+"""
+from collections import deque
+from typing import Iterable, NamedTuple, Optional
+
+# Category -> keywords. Order of INTERACTION_TYPES is the classification precedence.
+IDIOMS = (
+    "piece of cake", "break a leg", "hit the road", "cost an arm", "once in a blue moon",
+    "coup de", "n'importe quoi",
+)
+SLANG_MARKERS = (
+    "bof", "trop", "genre", "grave", "kiffer", "truc", "machin", "bagnole", "bouffer", "kif",
+    "wesh", "inchallah", "wallah", "yallah", "inshallah", "habibi", "chouia", "b'slama", "safi",
+    "zwin", "daba", "bghiti", "kayen", "ma3andich", "allah", "bizarre", "dingue", "chelou",
+)
+INTERACTION_KEYWORDS = {
+    "greeting": ("hello", "hi", "bonjour", "salut", "hey", "good morning", "good evening"),
+    "emergency": ("help", "emergency", "urgent", "au secours", "aide"),
+    "transaction": ("price", "cost", "pay", "euro", "prix", "acheter", "buy", "bill"),
+    "professional": ("meeting", "report", "client", "project", "business", "réunion"),
+}
+INTERACTION_TYPES = tuple(INTERACTION_KEYWORDS)
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    pattern: str
+    category: str
+
+
+class TextAnalysis:
+    """All keyword matches in one text, with per-category lookups."""
+
+    __slots__ = ("matches", "categories")
+
+    def __init__(self, matches: list[Match]):
+        self.matches = matches
+        self.categories = frozenset(m.category for m in matches)
+
+    def has(self, category: str) -> bool:
+        return category in self.categories
+
+    @property
+    def idiom_detected(self) -> bool:
+        return "idiom" in self.categories or "slang" in self.categories
+
+    @property
+    def interaction_type(self) -> str:
+        for kind in INTERACTION_TYPES:
+            if kind in self.categories:
+                return kind
+        return "social"
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: build once, then find every (pattern, category) hit in one pass."""
+
+    def __init__(self, patterns: Iterable[tuple[str, str]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[str, str]]] = [[]]
+        seen: set[tuple[str, str]] = set()
+        for pattern, category in patterns:
+            if not pattern or (pattern, category) in seen:
+                continue
+            seen.add((pattern, category))
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((pattern, category))
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> list[Match]:
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: list[Match] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pattern, category in out[state]:
+                    matches.append(Match(i + 1 - len(pattern), i + 1, pattern, category))
+        return matches
+
+
+def _default_patterns() -> list[tuple[str, str]]:
+    patterns = [(p, "idiom") for p in IDIOMS] + [(p, "slang") for p in SLANG_MARKERS]
+    for kind, words in INTERACTION_KEYWORDS.items():
+        patterns.extend((w, kind) for w in words)
+    return patterns
+
+
+_matcher: Optional[AhoCorasick] = None
+
+
+def get_matcher() -> AhoCorasick:
+    global _matcher
+    if _matcher is None:
+        _matcher = AhoCorasick(_default_patterns())
+    return _matcher
+
+
+def analyze_text(text: str) -> TextAnalysis:
+    """Lower-case text once and return every idiom / slang / interaction keyword match."""
+    if not text:
+        return TextAnalysis([])
+    return TextAnalysis(get_matcher().find_all(text.lower()))
+
+
+def analyze_texts(texts: Iterable[str]) -> list[TextAnalysis]:
+    """Batch form of analyze_text (shares the compiled automaton)."""
+    matcher = get_matcher()
+    return [TextAnalysis(matcher.find_all(t.lower())) if t else TextAnalysis([]) for t in texts]
@@ -0,0 +1,185 @@
+"""
+Deterministic, table-driven phonetic spelling for the target languages (no model call).
+Bulgarian uses the official Streamlined System romanisation (a character table plus the
+word-final "ия" rule). French and Moroccan Darija (Latin / Arabizi or Arabic script) get
+an English-friendly approximation: whole-word exceptions, then ordered regex rewrites per
+word, then a character table. Rewrites emit upper case so later rules never re-match
+what an earlier one produced; the result is lower-cased at the end. Each distinct word
+is rewritten once, so a batch of phrases costs about one dict lookup per word.
+"""
+import re
+from typing import Optional, Sequence
+
+from backend.services.end_phrase import language_key
+
+_TOKENS = re.compile(r"(\w+)")  # split() keeps the words at odd indices
+
+# French: letters that count as vowels in look-arounds (upper case = already rewritten)
+_V = "aeiouyéèêëàâîïôûœAEIOUY"
+_C = "bcdfghjklmnpqrstvwxz"
+_NOT_NASAL = f"(?![{_V}nm])"
+
+_FRENCH_WORDS = {
+    "est": "eh", "et": "ay", "les": "lay", "des": "day", "mes": "may", "tes": "tay", "ses": "say",
+    "ces": "say", "le": "luh", "de": "duh", "je": "zhuh", "ce": "suh", "me": "muh", "te": "tuh",
+    "se": "suh", "ne": "nuh", "que": "kuh", "qu": "k", "c": "s", "d": "d", "j": "zh", "l": "l",
+    "m": "m", "n": "n", "s": "s", "t": "t", "un": "uhn", "une": "oon", "vous": "voo", "nous": "noo",
+    "ou": "oo", "où": "oo", "oui": "wee", "non": "nohn", "monsieur": "muhsyuh", "femme": "fahm",
+    "ville": "veel", "mille": "meel", "fils": "fees", "plus": "ploo", "tous": "too", "six": "sees",
+    "dix": "dees", "huit": "weet", "sept": "set", "cinq": "sank", "neuf": "nuhf", "bus": "boos",
+    "sud": "sood", "euro": "uhroh", "euros": "uhroh", "merci": "mehrsee", "avec": "ahvek",
+    "sac": "sahk", "parc": "pahrk", "pied": "pyay", "super": "soopehr", "mer": "mehr",
+    "hier": "yehr", "fier": "fyehr", "hiver": "eevehr",
+}
+
+# Applied in order to each case-folded word; the character table then maps c/q/x
+_FRENCH_RULES = (
+    # Soft c / g first, while the following vowel is still unrewritten ("gentil", "cent")
+    (r"gu(?=[eéèêiy])", "G"), (r"g(?=[eéèêiy])", "ZH"), (r"c(?=[eéèêiy])", "S"), (r"ç", "S"),
+    (r"eaux?$", "OH"), (r"eau", "OH"), (r"aux?$", "OH"), (r"au", "OH"),
+    (r"aille?s?$", "AHY"), (r"eille?s?$", "EHY"), (r"ouille?s?$", "OOY"), (r"ille", "EEY"),
+    (r"tion", "SYOHN"), (r"oin" + _NOT_NASAL, "WAN"), (r"o[iî]", "WAH"), (r"oy(?=[aeiou])", "WAHY"),
+    (r"où|ou", "OO"), (r"eu|œu|œ", "UH"), (r"ui", "WEE"), (rf"[ae]y(?=[{_V}])", "EHY"),
+    (r"ien" + _NOT_NASAL, "YAN"), (r"(?:ain|ein|in|im|yn|ym)" + _NOT_NASAL, "AN"),
+    (r"(?:en|em|an|am)" + _NOT_NASAL, "AHN"), (r"(?:on|om)" + _NOT_NASAL, "OHN"),
+    (r"(?:un|um)" + _NOT_NASAL, "UHN"),
+    (r"(?:er|ez|et)$", "AY"), (r"é", "AY"), (r"[èêë]", "EH"), (r"[ae][iî]", "EH"), (r"e(?=ls?$)", "EH"),
+    # An "e" before two consonants is open ("personne", "appelle"); digraphs are one sound
+    (rf"e(?=(?!ch|ph|th|gn)[{_C}]{{2}})", "EH"), (r"([bcdfgklmnprt])\1", r"\1"),
+    (r"ch", "SH"), (r"ph", "F"), (r"th", "T"), (r"gn", "NY"), (r"qu", "K"), (r"ck", "K"),
+    (r"j", "ZH"), (rf"(?<=[{_V}])s(?=[{_V}])", "Z"), (r"ss", "S"), (r"h", ""),
+    # Silent final consonant, then silent final e ("juste" keeps its t)
+    (r"(?<=.)(?:[dtpx]s|[stdxzp])$", ""), (r"(?<=..)e$", ""),
+    (rf"i(?=[{_V}])", "Y"), (r"[iîïy]", "EE"), (r"[uû]", "OO"), (r"[aàâ]", "AH"), (r"[oô]", "OH"),
+    (r"e", "UH"),
+)
+_FRENCH_CHARS = {"c": "k", "q": "k", "x": "ks"}
+
+
+def _arabizi(digit: str) -> str:
+    # Arabizi digits are letters only inside a word ("3la", "m3a"); "50 dirham" stays a number
+    return rf"(?<=[^\W\d_]){digit}|{digit}(?=[^\W\d_])"
+
+
+_DARIJA_WORDS = {"الله": "llah", "شكرا": "shokran", "السلام": "ssalam", "عليكم": "'alikum"}
+
+_DARIJA_RULES = (
+    # Arabic script: article, then long vowels / glides by position
+    (r"^ال", "L"), (r"^و", "W"), (r"و", "OO"), (r"^ي", "Y"), (r"ي", "EE"), (r"[ةى]$", "A"),
+    # Latin / Arabizi
+    (_arabizi("[32]"), "'"), (_arabizi("7"), "H"), (_arabizi("9"), "Q"), (_arabizi("5"), "KH"),
+    (_arabizi("8"), "GH"), (r"ch", "SH"), (r"dj", "J"), (r"ou", "OO"), (r"i$", "EE"),
+)
+
+_DARIJA_CHARS = {
+    "ا": "a", "أ": "a", "إ": "i", "آ": "a", "ب": "b", "ت": "t", "ث": "t", "ج": "j", "ح": "h",
+    "خ": "kh", "د": "d", "ذ": "d", "ر": "r", "ز": "z", "س": "s", "ش": "sh", "ص": "s", "ض": "d",
+    "ط": "t", "ظ": "d", "ع": "'", "غ": "gh", "ف": "f", "ق": "q", "ك": "k", "ل": "l", "م": "m",
+    "ن": "n", "ه": "h", "ة": "a", "ى": "a", "ء": "'", "ؤ": "'", "ئ": "'", "ڤ": "v", "ڭ": "g",
+    "گ": "g", "ڨ": "g", "پ": "p", "ـ": "",
+    # Harakat, when present
+    "َ": "a", "ِ": "i", "ُ": "u", "ً": "an", "ْ": "", "ّ": "",
+    # Arabic-Indic digits
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+}
+_ARABIC_PUNCTUATION = {"؟": "?", "،": ",", "؛": ";"}
+
+# Streamlined System (Bulgarian transliteration law, 2009); upper case keeps a capital initial
+_BULGARIAN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh", "з": "z", "и": "i",
+    "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s",
+    "т": "t", "у": "u", "ф": "f", "х": "h", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sht",
+    "ъ": "a", "ь": "y", "ю": "yu", "я": "ya", "ѝ": "i",
+}
+_BULGARIAN_CHARS = {**_BULGARIAN, **{k.upper(): v.capitalize() for k, v in _BULGARIAN.items()}}
+_BULGARIAN_RULES = ((r"ия$", "ia"), (r"ИЯ$", "IA"))
+
+
+class Transliterator:
+    """
+    One language's tables: whole-word exceptions, ordered regex rewrites and a character
+    table, applied once per distinct word (memoised). A phrase is split into words and
+    separators, unseen words are rewritten, and the rest is a dict lookup per word.
+    `separators` maps characters that sit between words (e.g. French elision
+    apostrophes are dropped so "qu'est" reads "keh").
+    """
+
+    def __init__(
+        self,
+        chars: dict[str, str],
+        rules: Sequence[tuple[str, str]] = (),
+        words: Optional[dict[str, str]] = None,
+        separators: Optional[dict[str, str]] = None,
+        fold_case: bool = True,
+        cache_size: int = 65536,
+    ):
+        self.table = str.maketrans(chars)
+        self.rules = [(re.compile(pattern), replacement) for pattern, replacement in rules]
+        self.words = dict(words or {})
+        # A few str.replace calls beat str.translate's per-character path on non-ASCII text
+        self.separators = tuple((separators or {}).items())
+        self.fold_case = fold_case
+        self.cache_size = max(1, cache_size)
+        self._memo: dict[str, str] = {}
+
+    def _rewrite(self, word: str) -> str:
+        known = self.words.get(word)
+        if known is not None:
+            return known
+        for pattern, replacement in self.rules:
+            word = pattern.sub(replacement, word)
+        word = word.translate(self.table)
+        return word.lower() if self.fold_case else word
+
+    def phrase(self, text: str) -> str:
+        if self.fold_case:
+            text = text.casefold()
+        parts = _TOKENS.split(text)
+        words = parts[1::2]
+        memo = self._memo
+        missing = set(words).difference(memo)
+        if missing:
+            if len(memo) + len(missing) > self.cache_size:
+                # Swap rather than clear: concurrent callers keep their own reference
+                memo = self._memo = {}
+                missing = set(words)
+            for word in missing:
+                memo[word] = self._rewrite(word)
+        parts[1::2] = map(memo.__getitem__, words)
+        out = "".join(parts)
+        for old, new in self.separators:
+            out = out.replace(old, new)
+        return out
+
+    def batch(self, texts: Sequence[str]) -> list[str]:
+        """Phonetics for many phrases: each distinct phrase once, all in one pass over the joined text."""
+        unique = list(dict.fromkeys(texts))
+        out = self.phrase("\n".join(t.replace("\n", " ") for t in unique)).split("\n")
+        mapping = dict(zip(unique, out))
+        return [mapping[t] for t in texts]
+
+    def clear(self) -> None:
+        self._memo = {}
+
+
+_ENGINES = {
+    "fr": Transliterator(_FRENCH_CHARS, _FRENCH_RULES, _FRENCH_WORDS, separators={"'": "", "’": ""}),
+    "ar": Transliterator(_DARIJA_CHARS, _DARIJA_RULES, _DARIJA_WORDS, separators=_ARABIC_PUNCTUATION),
+    "bg": Transliterator(_BULGARIAN_CHARS, _BULGARIAN_RULES, fold_case=False),
+}
+
+
+def get_transliterator(local_language: str) -> Optional[Transliterator]:
+    """Engine for a target language name ("French", "Bulgarian", "Moroccan Darija (Arabic)"), None if unsupported."""
+    return _ENGINES.get(language_key(local_language) or "")
+
+
+def transliterate(text: str, local_language: str) -> Optional[str]:
+    """Phonetic spelling of a local-language phrase, or None when the language has no tables."""
+    engine = get_transliterator(local_language)
+    return engine.phrase(text) if engine is not None else None
+
+
+def transliterate_batch(texts: Sequence[str], local_language: str) -> Optional[list[str]]:
+    engine = get_transliterator(local_language)
+    return engine.batch(texts) if engine is not None else None
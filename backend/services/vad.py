@@ -0,0 +1,142 @@
+"""
+Voice activity detection for /ws/translate uplink audio (16 kHz mono int16 PCM).
+Each chunk is split into fixed frames and classified in one vectorised pass:
+frame energy (dBFS) against an adaptive noise floor, with zero-crossing rate to
+reject mains hum and DC (tones below ~64 Hz) and keep quiet fricatives. Hangover
+keeps the tail of each utterance, pre-roll keeps the frames just before an onset
+(also across chunk boundaries), and everything else is dropped so silence never
+reaches Gemini Live.
+"""
+from collections import deque
+from typing import Any, NamedTuple
+
+import numpy as np
+
+_BIG = 1 << 40
+_FULL_SCALE = 32768.0
+
+
+class VadResult(NamedTuple):
+    audio: bytes  # frames to forward (speech + hangover + pre-roll), concatenated
+    speech_ended: bool  # an utterance's hangover ran out inside this chunk
+
+
+class VoiceActivityDetector:
+    """
+    Stateful per-session VAD. process() accepts chunks of any length; a partial
+    trailing frame is carried into the next call.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        threshold_db: float = -50.0,
+        noise_margin_db: float = 10.0,
+        hangover_ms: int = 300,
+        preroll_ms: int = 200,
+        zcr_min: float = 0.008,
+        fricative_zcr: float = 0.25,
+        fricative_slack_db: float = 8.0,
+    ):
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.frame_bytes = self.frame_samples * 2
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.hangover_frames = max(0, hangover_ms // frame_ms)
+        self.preroll_frames = max(0, preroll_ms // frame_ms)
+        self.zcr_min = zcr_min
+        self.fricative_zcr = fricative_zcr
+        self.fricative_slack_db = fricative_slack_db
+        self._noise_floor_db = threshold_db - noise_margin_db
+        self._remainder = b""
+        # frames since the last speech frame (large = in silence)
+        self._since_speech = _BIG
+        # trailing dropped frames, replayed as pre-roll if the next chunk starts with speech
+        self._preroll: deque[bytes] = deque(maxlen=self.preroll_frames or 1)
+        self.frames_total = 0
+        self.frames_suppressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.segments = 0
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        """Per-frame speech mask for an (n, frame_samples) int16 array."""
+        x = frames.astype(np.float32)
+        energy_db = 10.0 * np.log10(np.mean(x * x, axis=1) / (_FULL_SCALE * _FULL_SCALE) + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_samples - 1 or 1)
+
+        # Adaptive floor: follow quiet frames down at once, drift up ~1 dB per second of audio
+        quiet = float(np.percentile(energy_db, 10))
+        if quiet < self._noise_floor_db:
+            self._noise_floor_db = quiet
+        else:
+            self._noise_floor_db += min(quiet - self._noise_floor_db, 0.02 * len(frames))
+        threshold = max(self.threshold_db, self._noise_floor_db + self.noise_margin_db)
+
+        voiced = (energy_db > threshold) & (zcr > self.zcr_min)
+        fricative = (energy_db > threshold - self.fricative_slack_db) & (zcr > self.fricative_zcr)
+        return voiced | fricative
+
+    def process(self, chunk: bytes) -> VadResult:
+        data = self._remainder + chunk if self._remainder else chunk
+        n = len(data) // self.frame_bytes
+        self._remainder = data[n * self.frame_bytes:]
+        self.bytes_in += len(chunk)
+        if n == 0:
+            return VadResult(b"", False)
+        frames = np.frombuffer(data, dtype="<i2", count=n * self.frame_samples).reshape(n, self.frame_samples)
+        speech = self._classify(frames)
+        idx = np.arange(n)
+
+        # Hangover: frames within hangover_frames after the most recent speech frame
+        last = np.maximum.accumulate(np.where(speech, idx, -_BIG))
+        since = np.where(last >= 0, idx - last, self._since_speech + idx + 1)
+        keep = since <= self.hangover_frames
+        # Pre-roll inside the chunk: frames within preroll_frames before the next speech frame
+        if self.preroll_frames:
+            nxt = np.minimum.accumulate(np.where(speech, idx, _BIG)[::-1])[::-1]
+            keep |= (nxt - idx) <= self.preroll_frames
+
+        was_silent = self._since_speech > self.hangover_frames
+        ended = bool(np.any(since == self.hangover_frames + 1))
+        since_prev = np.concatenate(([self._since_speech], since[:-1]))
+        self.segments += int(np.count_nonzero(speech & (since_prev > self.hangover_frames)))
+        self._since_speech = int(since[-1])
+
+        out = frames[keep].tobytes()
+        # Pre-roll across the chunk boundary: speech starts before this chunk filled it
+        kept_idx = np.flatnonzero(keep)
+        if was_silent and kept_idx.size and kept_idx[0] == 0 and self._preroll:
+            first_speech = int(np.argmax(speech)) if speech.any() else 0
+            missing = self.preroll_frames - first_speech
+            if missing > 0:
+                carried = list(self._preroll)[-missing:]
+                out = b"".join(carried) + out
+                self.frames_suppressed -= len(carried)
+
+        if kept_idx.size:
+            self._preroll.clear()
+            tail = frames[kept_idx[-1] + 1:]
+        else:
+            tail = frames
+        if self.preroll_frames:
+            for frame in tail[-self.preroll_frames:]:
+                self._preroll.append(frame.tobytes())
+
+        self.frames_total += n
+        self.frames_suppressed += n - int(kept_idx.size)
+        self.bytes_out += len(out)
+        return VadResult(out, ended)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames_total,
+            "frames_suppressed": self.frames_suppressed,
+            "segments": self.segments,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved_ratio": round(1 - self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            "noise_floor_db": round(self._noise_floor_db, 1),
+        }
@@ -3,21 +3,28 @@ Paid.ai Agentic AI — Autonomous billing agent for HackEurope.
 Treats every completed "Step Z" translation loop as a distinct, billable event.
 """
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
+from backend.config import get_settings
 from backend.models.schemas import UserContext, SuggestedResponse
+from backend.services.billing_aggregates import BillingAggregates
+from backend.services.event_log import EventLog
+from backend.services.event_store import ColumnarEventStore, timestamp_to_micros
+from backend.services.text_analyzer import TextAnalysis, analyze_text, analyze_texts
 
-# Module-level event log (in production, use a persistent store)
-_events: list[dict[str, Any]] = []
+# Module-level event log: columnar, keeps the newest EVENT_RETENTION events
+_events = ColumnarEventStore(retention=get_settings().event_retention)
+# Running totals and per-minute/per-hour rollups, updated on every append
+_aggregates = BillingAggregates()
+# Durable append-only log (enabled with EVENT_LOG_DIR; see ValueTracker.open_log)
+_log: Optional[EventLog] = None
 
-# Common idioms / colloquial markers (presence increases complexity)
-_IDIOM_PATTERNS = (
-    "piece of cake", "break a leg", "hit the road", "cost an arm", "once in a blue moon",
-    "coup de", "n\'importe quoi", "bof", "trop", "genre", "grave", "kiffer", "truc",
-    "machin", "bagnole", "bouffer", "kif", "wesh", "inchallah", "wallah", "yallah",
-    "inshallah", "habibi", "chouia", "b'slama", "safi", "zwin", "daba", "daba",
-    "bghiti", "kayen", "ma3andich", "allah", "bizarre", "dingue", "chelou",
-)
+
+def _append_event(event: dict[str, Any], now: datetime) -> None:
+    _events.append(event)
+    _aggregates.add(event, now.timestamp())
+    if _log is not None:
+        _log.append(event)
 
 
 def _slang_intensity_score(slang_level: str) -> int:
@@ -34,15 +41,13 @@ def _slang_intensity_score(slang_level: str) -> int:
     return 0
 
 
-def _idiom_detection_score(text: str) -> int:
+def _idiom_detection_score(analysis: TextAnalysis) -> int:
     """0–2 points if idiom/colloquial markers detected."""
-    if not text:
-        return 0
-    t = text.lower()
-    for phrase in _IDIOM_PATTERNS:
-        if phrase in t:
-            return 2
-    return 0
+    return 2 if analysis.idiom_detected else 0
+
+
+def _rest_interaction_text(other_person_said_local: str, suggested_response: SuggestedResponse) -> str:
+    return (other_person_said_local or "") + " " + (suggested_response.english or "")
 
 
 class ValueTracker:
@@ -51,6 +56,43 @@ class ValueTracker:
     for the Paid.ai Agentic AI track.
     """
 
+    def open_log(self, directory: Optional[str] = None) -> Optional[EventLog]:
+        """
+        Replay the durable event log into memory and start its background writer.
+        Called once on app startup; a no-op when no directory is configured.
+        """
+        global _log
+        settings = get_settings()
+        directory = directory or settings.event_log_dir
+        if not directory or _log is not None:
+            return _log
+        log = EventLog(
+            directory,
+            segment_max_bytes=settings.event_log_segment_bytes,
+            max_segments=settings.event_log_max_segments,
+            flush_interval=settings.event_log_flush_ms / 1000,
+        )
+        replayed = 0
+        for event in log.replay():
+            _events.append(event)
+            try:
+                _aggregates.add(event, timestamp_to_micros(event.get("timestamp") or "") / 1e6)
+            except ValueError:
+                pass
+            replayed += 1
+        log.mark_replayed(replayed)
+        log.compact()
+        log.start()
+        _log = log
+        return log
+
+    def close_log(self) -> None:
+        """Flush queued events to disk and stop the writer (app shutdown)."""
+        global _log
+        log, _log = _log, None
+        if log is not None:
+            log.close()
+
     def record_step_z(
         self,
         *,
@@ -78,7 +120,7 @@ class ValueTracker:
         slang_score = _slang_intensity_score(slang_level)
 
         # Idiom/colloquial detection (0–2)
-        idiom_score = _idiom_detection_score(combined_text)
+        idiom_score = _idiom_detection_score(analyze_text(combined_text))
 
         # Phonetic length (non-trivial = +1)
         phonetic_bonus = 1 if (phonetic_spelling or "").strip() and len((phonetic_spelling or "").strip()) > 10 else 0
@@ -99,7 +141,8 @@ class ValueTracker:
         base_eur = 0.02
         estimated_cost_eur = round(base_eur * complexity_score + 0.01 * (conversation_turn_index + 1), 2)
 
-        timestamp = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
         event = {
             "event_type": "step_z",
             "complexity_score": complexity_score,
@@ -111,7 +154,7 @@ class ValueTracker:
             "destination": getattr(user_context.onboarding, "location", None) if user_context else None,
             "occasion": getattr(user_context.onboarding, "occasion", None) if user_context else None,
         }
-        _events.append(event)
+        _append_event(event, now)
         return event
 
     def score_interaction(
@@ -124,6 +167,31 @@ class ValueTracker:
         Legacy: score one REST interaction (used by /api/conversation/process).
         Also appends to the same event log for dashboard consistency.
         """
+        analysis = analyze_text(_rest_interaction_text(other_person_said_local, suggested_response))
+        return self._record_interaction(user_context, other_person_said_local, suggested_response, analysis)
+
+    def score_interactions(
+        self,
+        interactions: Iterable[tuple[UserContext, str, SuggestedResponse]],
+    ) -> list[dict[str, Any]]:
+        """
+        Batch form of score_interaction for billing replays: (user_context, other_person_said_local,
+        suggested_response) triples are analysed with one shared automaton pass each.
+        """
+        interactions = list(interactions)
+        analyses = analyze_texts(_rest_interaction_text(other, suggested) for _, other, suggested in interactions)
+        return [
+            self._record_interaction(ctx, other, suggested, analysis)
+            for (ctx, other, suggested), analysis in zip(interactions, analyses)
+        ]
+
+    def _record_interaction(
+        self,
+        user_context: UserContext,
+        other_person_said_local: str,
+        suggested_response: SuggestedResponse,
+        analysis: TextAnalysis,
+    ) -> dict[str, Any]:
         complexity_score = 0
         slang = (user_context.onboarding.slang_level or "").strip()
         if "Down with the kids" in slang or slang.lower() == "down with the kids":
@@ -150,20 +218,12 @@ class ValueTracker:
 
         complexity_score = max(1, min(10, complexity_score))
 
-        text_lower = (other_person_said_local or "").lower() + " " + (suggested_response.english or "").lower()
-        if any(w in text_lower for w in ("hello", "hi", "bonjour", "salut", "hey", "good morning", "good evening")):
-            interaction_type = "greeting"
-        elif any(w in text_lower for w in ("help", "emergency", "urgent", "au secours", "aide")):
-            interaction_type = "emergency"
-        elif any(w in text_lower for w in ("price", "cost", "pay", "euro", "prix", "acheter", "buy", "bill")):
-            interaction_type = "transaction"
-        elif any(w in text_lower for w in ("meeting", "report", "client", "project", "business", "réunion")):
-            interaction_type = "professional"
-        else:
-            interaction_type = "social"
+        # greeting > emergency > transaction > professional > social
+        interaction_type = analysis.interaction_type
 
         estimated_value_eur = round(complexity_score * 0.05, 2)
-        timestamp = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
 
         event = {
             "event_type": "rest_interaction",
@@ -173,23 +233,55 @@ class ValueTracker:
             "estimated_cost_eur": estimated_value_eur,
             "timestamp": timestamp,
         }
-        _events.append(event)
+        _append_event(event, now)
         return event
 
     def get_summary(self) -> dict[str, Any]:
-        """Return billing summary for the Paid.ai dashboard."""
-        total = len(_events)
-        total_cost = sum(e.get("estimated_cost_eur", e.get("estimated_value_eur", 0)) for e in _events)
-        avg_complexity = (sum(e.get("complexity_score", 0) for e in _events) / total) if total else 0.0
+        """Return billing summary for the Paid.ai dashboard (O(1): read from running aggregates)."""
+        total, total_cost, complexity_sum = _aggregates.summary()
+        avg_complexity = (complexity_sum / total) if total else 0.0
         return {
             "total_events": total,
             "total_cost_eur": round(total_cost, 2),
             "average_complexity": round(avg_complexity, 2),
         }
 
+    def get_windows(self, granularity: str = "minute", limit: int = 60) -> list[dict[str, Any]]:
+        """Tumbling per-minute or per-hour rollups (newest first) with destination/occasion/interaction_type breakdowns."""
+        return _aggregates.windows(granularity, limit)
+
     def get_recent_events(self, limit: int = 50) -> list[dict[str, Any]]:
-        """Return most recent billable events (newest first)."""
-        return list(reversed(_events[-limit:]))
+        """Return most recent billable events (newest first); older ones come from the durable log."""
+        events = _events.recent(limit)
+        if _log is not None and len(events) < limit:
+            # Memory holds the newest len(_events); the log's newest `flushed` of those overlap
+            flushed = max(0, len(_events) - _log.pending)
+            events.extend(_log.recent(limit - len(events), skip=flushed))
+        return events
+
+    def get_history(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        event_type: Optional[str] = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Events in [since, until) from the durable log (in-memory events when no log), newest first."""
+        if _log is not None:
+            return _log.history(since=since, until=until, event_type=event_type, limit=limit)
+        lo = timestamp_to_micros(since) if since else None
+        hi = timestamp_to_micros(until) if until else None
+        out = []
+        for event in _events.recent(len(_events)):
+            ts = timestamp_to_micros(event["timestamp"])
+            if (hi is not None and ts >= hi) or (event_type and event.get("event_type") != event_type):
+                continue
+            if lo is not None and ts < lo:
+                break
+            out.append(event)
+            if len(out) >= limit:
+                break
+        return out
 
     def get_dashboard(self) -> dict[str, Any]:
         """Legacy: full dashboard payload (summary + log)."""
@@ -0,0 +1,157 @@
+"""
+Bounded queues with explicit overflow policies for the /ws/translate pipeline.
+Audio queues keep only the newest chunks when a side falls behind ("drop_oldest"),
+so playback and recognition stay near real time instead of lagging. "block" pauses
+the producer instead, which for client audio means we stop reading the socket and
+let TCP push back. Every queue counts drops and its high-water mark; the registry
+exposes per-connection numbers for /api/ws/stats.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from typing import Any, Optional
+
+POLICIES = ("drop_oldest", "block", "slow_down")
+
+
+class BoundedQueue(asyncio.Queue):
+    """
+    asyncio.Queue with a fixed size and an overflow policy. The None end-of-stream
+    sentinel is never dropped or blocked: it evicts the oldest item if needed.
+    `wakeup` (shared by several queues) is set on every put so one writer can wait on all of them.
+    """
+
+    def __init__(self, name: str, maxsize: int, policy: str = "drop_oldest", wakeup: Optional[asyncio.Event] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r} (use one of {', '.join(POLICIES)})")
+        super().__init__(maxsize=max(1, maxsize))
+        self.name = name
+        self.policy = policy
+        self.wakeup = wakeup
+        self.put_count = 0
+        self.dropped = 0
+        self.high_water = 0
+        self.blocked_seconds = 0.0
+
+    def _evict_oldest(self) -> None:
+        try:
+            self.get_nowait()
+            self.task_done()
+        except asyncio.QueueEmpty:
+            return
+        self.dropped += 1
+
+    def _accept(self, item: Any) -> None:
+        super().put_nowait(item)
+        self.put_count += 1
+        self.high_water = max(self.high_water, self.qsize())
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def put_nowait(self, item: Any) -> None:
+        if self.full():
+            if self.policy == "block" and item is not None:
+                raise asyncio.QueueFull
+            self._evict_oldest()
+        self._accept(item)
+
+    async def put(self, item: Any) -> None:
+        if self.policy == "block" and item is not None:
+            waited = self.full()
+            start = time.monotonic()
+            await super().put(item)  # waits for a free slot, then calls put_nowait()
+            if waited:
+                self.blocked_seconds += time.monotonic() - start
+            return
+        self.put_nowait(item)
+
+    def fill_ratio(self) -> float:
+        return self.qsize() / self.maxsize
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "depth": self.qsize(),
+            "max_size": self.maxsize,
+            "high_water": self.high_water,
+            "put": self.put_count,
+            "dropped": self.dropped,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+
+class ConnectionRegistry:
+    """Live /ws/translate connections and their queues, plus totals for closed ones."""
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._connections: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.closed = 0
+        self.total_dropped: dict[str, int] = {}
+
+    def open(self, queues: dict[str, BoundedQueue], meters: Optional[dict[str, Any]] = None) -> int:
+        """Register a connection; `meters` are extra per-connection objects with a stats() method (e.g. VAD)."""
+        conn_id = next(self._ids)
+        with self._lock:
+            self._connections[conn_id] = {
+                "queues": queues,
+                "meters": meters or {},
+                "opened_at": time.time(),
+                "flow": {},
+            }
+        return conn_id
+
+    def record_flow(self, conn_id: int, action: str) -> None:
+        """Count slow_down / resume signals sent to a client."""
+        with self._lock:
+            conn = self._connections.get(conn_id)
+            if conn is not None:
+                conn["flow"][action] = conn["flow"].get(action, 0) + 1
+
+    def close(self, conn_id: int) -> None:
+        with self._lock:
+            conn = self._connections.pop(conn_id, None)
+            if conn is None:
+                return
+            self.closed += 1
+            for name, queue in conn["queues"].items():
+                self.total_dropped[name] = self.total_dropped.get(name, 0) + queue.dropped
+
+    def stats(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            connections = [
+                {
+                    "id": conn_id,
+                    "age_seconds": round(now - conn["opened_at"], 1),
+                    "queues": {name: q.stats() for name, q in conn["queues"].items()},
+                    "flow_signals": dict(conn["flow"]),
+                    **{name: meter.stats() for name, meter in conn["meters"].items()},
+                }
+                for conn_id, conn in self._connections.items()
+            ]
+            closed, total_dropped = self.closed, dict(self.total_dropped)
+        for conn in connections:
+            for name, q in conn["queues"].items():
+                total_dropped[name] = total_dropped.get(name, 0) + q["dropped"]
+        return {
+            "active": len(connections),
+            "closed": closed,
+            "dropped_total": total_dropped,
+            "connections": connections,
+        }
+
+
+_registry: Optional[ConnectionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_ws_registry() -> ConnectionRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ConnectionRegistry()
+    return _registry
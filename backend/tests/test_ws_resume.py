@@ -0,0 +1,51 @@
+"""
+/ws/translate resume: a reconnect presenting the resume_token gets the downlink codec
+announced (the new socket starts out assuming PCM) before the session message.
+Runs against the local Gemini stand-in: python -m pytest backend/tests
+"""
+import os
+
+os.environ.update({"GEMINI_FAKE": "true", "GEMINI_FAKE_LATENCY_MS": "1", "GEMINI_FAKE_ERROR_RATE": "0"})
+os.environ.setdefault("GEMINI_API_KEY", "fake")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+CONTEXT = {"destination": "Paris", "target_language": "French", "slang_level": "Moderate"}
+
+
+def _start(client: TestClient, **extra) -> str:
+    with client.websocket_connect("/ws/translate") as ws:
+        ws.send_json({**CONTEXT, **extra})
+        while True:
+            message = ws.receive_json()
+            if message.get("type") == "session":
+                return message["resume_token"]
+
+
+def test_resume_announces_requested_codec_before_session():
+    with TestClient(app) as client:
+        token = _start(client, downlink_codec="mulaw")
+        with client.websocket_connect("/ws/translate") as ws:
+            ws.send_json({"resume_token": token, "downlink_codec": "pcm"})
+            codec = ws.receive_json()
+            session = ws.receive_json()
+            ws.send_json({"type": "end"})
+    assert codec["type"] == "codec"
+    assert codec["downlink"] == "pcm"
+    assert session["type"] == "session"
+    assert session["resumed"] is True
+    assert session["resume_token"] == token
+
+
+def test_resume_without_codec_announces_current_one():
+    with TestClient(app) as client:
+        token = _start(client, downlink_codec="mulaw")
+        with client.websocket_connect("/ws/translate") as ws:
+            ws.send_json({"resume_token": token})
+            codec = ws.receive_json()
+            session = ws.receive_json()
+            ws.send_json({"type": "end"})
+    assert codec == {"type": "codec", "downlink": "mulaw", "sample_rate": codec["sample_rate"]}
+    assert session["resumed"] is True
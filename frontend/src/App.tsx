@@ -3,7 +3,7 @@ import type { OnboardingAnswers, SuggestedResponse } from './api/client'
 import {
   submitOnboarding,
   markArrived,
-  processTurn,
+  processTurnStream,
   confirmUserSaid,
   getDashboard,
   getValueSummary,
@@ -125,7 +125,10 @@ export default function App() {
       processingRef.current = true
       setError(null)
       try {
-        const res = await processTurn(sessionId, text.trim())
+        const res = await processTurnStream(sessionId, text.trim(), (field, value) => {
+          // Show the translation as soon as it streams in; the suggestion follows with `done`
+          if (field === 'english_translation') setOtherSaidEnglish(value)
+        })
         setOtherSaidEnglish(res.other_person_said_english)
         setSuggested(res.suggested_response)
         setWaitingForUserToSpeak(true)
@@ -63,6 +63,56 @@ export async function processTurn(
   return res.json();
 }
 
+export type StreamedField =
+  | 'english_translation'
+  | 'suggested_english'
+  | 'suggested_local'
+  | 'suggested_phonetic';
+
+/**
+ * Streaming variant of processTurn (POST /api/conversation/process/stream, Server-Sent Events).
+ * Calls onField as soon as each field is ready; resolves with the same payload as processTurn.
+ */
+export async function processTurnStream(
+  sessionId: string,
+  otherPersonSaidLocal: string,
+  onField: (field: StreamedField, value: string) => void
+): Promise<ProcessTurnResponse> {
+  const res = await fetch(`${API_BASE}/conversation/process/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({
+      session_id: sessionId,
+      other_person_said_local: otherPersonSaidLocal,
+    }),
+  });
+  if (!res.ok || !res.body) throw new Error(await res.text());
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep: number;
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of raw.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      const payload = JSON.parse(data || '{}');
+      if (event === 'field') onField(payload.field, String(payload.value ?? ''));
+      else if (event === 'done') return payload as ProcessTurnResponse;
+      else if (event === 'error') throw new Error(payload.detail || 'Processing failed.');
+    }
+  }
+  throw new Error('Stream ended before the suggestion was complete.');
+}
+
 export async function confirmUserSaid(
   sessionId: string,
   userSaid: string,
@@ -3,13 +3,30 @@
  * Connects to ws://localhost:8000/ws/translate (or configurable).
  * - Captures microphone via AudioContext, converts Float32 -> Int16 PCM, streams over WebSocket.
  * - Handles incoming: JSON for UI (phonetic_spelling, local_spelling, english_translation), binary for TTS audio.
+ * - Honours server flow messages ({type: 'flow', action: 'slow_down' | 'resume'}) by coalescing mic chunks.
+ * - Asks for μ-law downlink audio (downlink_codec) and decodes it once the server confirms with {type: 'codec'}.
+ * - Keeps the resume_token from {type: 'session'}; if the socket drops, reconnects with it to reattach to the
+ *   same Live session and receive the translations missed meanwhile. disconnect() sends {type: 'end'}.
  */
 import { useCallback, useEffect, useRef, useState } from 'react';
 
 const WS_URL = 'ws://localhost:8000/ws/translate';
 const SAMPLE_RATE = 16000;
+// Mic chunks kept locally while the socket is behind (oldest dropped beyond this)
+const MAX_QUEUED_CHUNKS = 16;
+// While the server asks us to slow down, send one coalesced message per interval
+const SLOW_DOWN_INTERVAL_MS = 250;
+// Wait before reconnecting a dropped socket with its resume token (server keeps it ~30 s)
+const RECONNECT_DELAY_MS = 1000;
+
+export type DownlinkCodec = 'pcm' | 'mulaw';
 
 export type PolyglotContext = {
+  // REST session from /api/onboarding: lets the server hand over its pre-warmed Live connection
+  session_id?: string;
+  downlink_codec?: DownlinkCodec;
+  // Set on automatic reconnects to reattach to the parked server-side stream
+  resume_token?: string;
   destination?: string;
   target_region?: string;
   target_language?: string;
@@ -27,8 +44,41 @@ export type TranslationUpdate = {
   error?: string;
 };
 
+type FlowMessage = {
+  type: 'flow';
+  action: 'slow_down' | 'resume';
+  queue?: string;
+  depth?: number;
+};
+
+type SessionMessage = {
+  type: 'session';
+  resumed: boolean;
+  resume_token: string;
+  missed?: number;
+};
+
+type CodecMessage = {
+  type: 'codec';
+  downlink: DownlinkCodec;
+  sample_rate: number;
+};
+
+// G.711 μ-law byte -> float sample in [-1, 1]
+const MULAW_TABLE = (() => {
+  const table = new Float32Array(256);
+  for (let i = 0; i < 256; i++) {
+    const u = ~i & 0xff;
+    const exponent = (u >> 4) & 0x07;
+    const magnitude = ((((u & 0x0f) << 3) + 0x84) << exponent) - 0x84;
+    table[i] = ((u & 0x80) ? -magnitude : magnitude) / 0x8000;
+  }
+  return table;
+})();
+
 export type UsePolyglotConnectionOptions = {
   wsUrl?: string;
+  downlinkCodec?: DownlinkCodec;
   onTranslation?: (update: TranslationUpdate) => void;
   onAudioChunk?: (pcmBytes: ArrayBuffer) => void;
   onStatus?: (status: 'disconnected' | 'connecting' | 'connected' | 'error') => void;
@@ -37,6 +87,7 @@ export type UsePolyglotConnectionOptions = {
 export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}) {
   const {
     wsUrl = WS_URL,
+    downlinkCodec = 'mulaw',
     onTranslation,
     onAudioChunk,
     onStatus,
@@ -50,6 +101,12 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
   const processorRef = useRef<ScriptProcessorNode | null>(null);
   const sendQueueRef = useRef<Int16Array[]>([]);
   const isSendingRef = useRef(false);
+  const slowDownRef = useRef(false);
+  const codecRef = useRef<{ codec: DownlinkCodec; sampleRate: number }>({ codec: 'pcm', sampleRate: 24000 });
+  const resumeTokenRef = useRef<string | null>(null);
+  const closingRef = useRef(false);
+  const reconnectTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const connectRef = useRef<((context: PolyglotContext) => void) | null>(null);
 
   const notifyStatus = useCallback((s: typeof status) => {
     setStatus(s);
@@ -71,24 +128,44 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
   }, []);
 
   const connect = useCallback((context: PolyglotContext) => {
+    if (reconnectTimerRef.current) {
+      clearTimeout(reconnectTimerRef.current);
+      reconnectTimerRef.current = null;
+    }
     if (wsRef.current?.readyState === WebSocket.OPEN) {
+      closingRef.current = true;
       wsRef.current.close();
     }
+    closingRef.current = false;
+    if (!context.resume_token) resumeTokenRef.current = null;
     notifyStatus('connecting');
     const ws = new WebSocket(wsUrl);
     wsRef.current = ws;
 
+    codecRef.current = { codec: 'pcm', sampleRate: 24000 };
     ws.onopen = () => {
       notifyStatus('connected');
-      ws.send(JSON.stringify(context));
+      ws.send(JSON.stringify({ downlink_codec: downlinkCodec, ...context }));
     };
 
-    const playPCM = (buffer: ArrayBuffer, sampleRate = 24000) => {
+    const decode = (buffer: ArrayBuffer): Float32Array => {
+      if (codecRef.current.codec === 'mulaw') {
+        const bytes = new Uint8Array(buffer);
+        const float32 = new Float32Array(bytes.length);
+        for (let i = 0; i < bytes.length; i++) float32[i] = MULAW_TABLE[bytes[i]];
+        return float32;
+      }
       const int16 = new Int16Array(buffer);
       const float32 = new Float32Array(int16.length);
       for (let i = 0; i < int16.length; i++) {
         float32[i] = int16[i] / (int16[i] < 0 ? 0x8000 : 0x7fff);
       }
+      return float32;
+    };
+
+    const playPCM = (buffer: ArrayBuffer) => {
+      const sampleRate = codecRef.current.sampleRate;
+      const float32 = decode(buffer);
       const ctx = new (window.AudioContext || (window as unknown as { webkitAudioContext: typeof AudioContext }).webkitAudioContext)();
       const audioBuffer = ctx.createBuffer(1, float32.length, sampleRate);
       audioBuffer.getChannelData(0).set(float32);
@@ -101,8 +178,20 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
     ws.onmessage = (event: MessageEvent) => {
       if (typeof event.data === 'string') {
         try {
-          const update: TranslationUpdate = JSON.parse(event.data);
-          notifyTranslation(update);
+          const message = JSON.parse(event.data) as TranslationUpdate | FlowMessage | CodecMessage | SessionMessage;
+          if ('type' in message && message.type === 'flow') {
+            slowDownRef.current = message.action === 'slow_down';
+            return;
+          }
+          if ('type' in message && message.type === 'session') {
+            resumeTokenRef.current = message.resume_token;
+            return;
+          }
+          if ('type' in message && message.type === 'codec') {
+            codecRef.current = { codec: message.downlink, sampleRate: message.sample_rate };
+            return;
+          }
+          notifyTranslation(message as TranslationUpdate);
         } catch {
           // ignore non-JSON
         }
@@ -119,13 +208,36 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
 
     ws.onerror = () => notifyStatus('error');
     ws.onclose = () => {
+      if (wsRef.current !== ws) return;
       wsRef.current = null;
+      const token = resumeTokenRef.current;
+      if (!closingRef.current && token) {
+        // Dropped, not closed by us: reattach to the same Live session
+        notifyStatus('connecting');
+        reconnectTimerRef.current = setTimeout(() => {
+          reconnectTimerRef.current = null;
+          connectRef.current?.({ ...context, resume_token: token });
+        }, RECONNECT_DELAY_MS);
+        return;
+      }
       if (status === 'connected') notifyStatus('disconnected');
     };
-  }, [wsUrl, notifyStatus, notifyTranslation, onAudioChunk, status]);
+  }, [wsUrl, downlinkCodec, notifyStatus, notifyTranslation, onAudioChunk, status]);
+
+  connectRef.current = connect;
 
   const disconnect = useCallback(() => {
+    closingRef.current = true;
+    resumeTokenRef.current = null;
+    if (reconnectTimerRef.current) {
+      clearTimeout(reconnectTimerRef.current);
+      reconnectTimerRef.current = null;
+    }
     if (wsRef.current) {
+      if (wsRef.current.readyState === WebSocket.OPEN) {
+        // Tell the server not to park the Live session for a reconnect
+        wsRef.current.send(JSON.stringify({ type: 'end' }));
+      }
       wsRef.current.close();
       wsRef.current = null;
     }
@@ -166,6 +278,7 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
       const pcm = float32ToInt16PCM(new Float32Array(input));
       const int16 = new Int16Array(pcm);
       sendQueueRef.current.push(int16);
+      if (sendQueueRef.current.length > MAX_QUEUED_CHUNKS) sendQueueRef.current.shift();
       if (!isSendingRef.current) flushSendQueue();
     };
 
@@ -180,6 +293,20 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
       return;
     }
     isSendingRef.current = true;
+    if (slowDownRef.current) {
+      // Server is behind: send everything queued as one message, then wait
+      const queued = sendQueueRef.current;
+      sendQueueRef.current = [];
+      const merged = new Int16Array(queued.reduce((n, c) => n + c.length, 0));
+      let offset = 0;
+      for (const c of queued) {
+        merged.set(c, offset);
+        offset += c.length;
+      }
+      ws.send(merged.buffer);
+      setTimeout(flushSendQueue, SLOW_DOWN_INTERVAL_MS);
+      return;
+    }
     const chunk = sendQueueRef.current.shift();
     if (chunk) {
       ws.send(chunk.buffer);
@@ -202,6 +329,7 @@ export function usePolyglotConnection(options: UsePolyglotConnectionOptions = {}
     }
     sendQueueRef.current = [];
     isSendingRef.current = false;
+    slowDownRef.current = false;
   }, []);
 
   useEffect(() => {